@@ -0,0 +1,107 @@
+"""Compare the task board's message and API call counts with and without packing.
+
+Usage:
+    python benchmarks/board_packing.py [--sizes 30 300 3000] [--changes 50]
+
+"Legacy" lays the board out the old way, three tasks per embed and one
+embed per message; "packed" fills embeds up to Discord's limits with up to
+ten per message. Both count the header message too. "Build" is the API
+calls of a fresh board (one purge plus a send per message), "change" the
+average calls to sync the board after moving one random task to another
+status, found with the same fingerprint diff as BoardSync (page keys follow
+the message order, so items match messages by position).
+"""
+import argparse
+import os
+import random
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.packing import MAX_FIELD_VALUE, Field, Section, join_truncated, pack, truncate
+
+# Values of bot.constant.TaskStatus, spelled out so the benchmark doesn't import the bot
+STATUSES = ["Not Started", "In Progress", "Under Review", "Blocked", "Completed"]
+SEPARATOR = Field("\u200b", "\u200b")
+# Three tasks of at most four fields plus two separators, and never a fourth task
+LEGACY = {'max_embeds': 1, 'max_fields': 14}
+
+def generate_tasks(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    users = [rng.randrange(10 ** 17, 10 ** 18) for _ in range(200)]
+    return [
+        {
+            'id': task_id,
+            'title': f"Task {task_id} {rng.choice(['fix', 'write', 'review', 'plan'])}",
+            'description': "Lorem ipsum dolor sit amet " * rng.randrange(1, 18),
+            'status': rng.choice(STATUSES),
+            'assigned_users': rng.sample(users, rng.randrange(0, 4)),
+            'thread': rng.random() < 0.1
+        }
+        for task_id in range(1, count + 1)
+    ]
+
+def task_fields(task: dict):
+    """The same fields as TaskBoardEmbeds.task_fields, with a fixed due date"""
+    prefix, suffix = "**Task description** :\n```", "```\n"
+    description = truncate(task['description'], MAX_FIELD_VALUE - len(prefix) - len(suffix))
+    fields = [
+        Field.make(f"**__#{task['id']} • {task['title']}__**", f"{prefix}{description}{suffix}"),
+        Field.make(
+            "**Assigned To**",
+            join_truncated((f"<@{user}>" for user in task['assigned_users']), MAX_FIELD_VALUE) or "Unassigned",
+            inline=True
+        ),
+        Field.make("**Due Date**", "📅 Due 2025-01-01", inline=True)
+    ]
+    if task['thread']:
+        fields.append(Field.make("💬 Discussion", "[Go to thread](https://discord.com/channels/1/2)", inline=True))
+    return fields
+
+def render(tasks, **limits):
+    """Board messages as comparable content, header first"""
+    sections = []
+    for status in STATUSES:
+        section = [task for task in tasks if task['status'] == status]
+        if section:
+            sections.append(Section(
+                f"{status} ({len(section)})", status, [task_fields(task) for task in section], SEPARATOR
+            ))
+    messages = [repr(message) for message in pack(sections, **limits)]
+    return ["header"] + messages
+
+def sync_calls(old, new) -> int:
+    """API calls BoardSync.sync makes to turn board ``old`` into ``new``, keyed by position"""
+    edits = sum(1 for before, after in zip(old, new) if before != after)
+    return edits + abs(len(new) - len(old))
+
+def run(count: int, changes: int):
+    tasks = generate_tasks(count)
+    results = {}
+    for name, limits in (("legacy", LEGACY), ("packed", {})):
+        # Both layouts see the same changes
+        rng = random.Random(count)
+        board = render(tasks, **limits)
+        total = 0
+        for _ in range(changes):
+            moved = [dict(task) for task in tasks]
+            task = rng.choice(moved)
+            task['status'] = rng.choice([status for status in STATUSES if status != task['status']])
+            total += sync_calls(board, render(moved, **limits))
+        results[name] = (len(board), 1 + len(board), total / changes)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[30, 300, 3000])
+    parser.add_argument("--changes", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'tasks':>6} {'layout':>7} {'messages':>9} {'build':>7} {'change':>8}")
+    for count in args.sizes:
+        for name, (messages, build, change) in run(count, args.changes).items():
+            print(f"{count:>6} {name:>7} {messages:>9} {build:>7} {change:>8.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Compare the memory of the slotted models with the previous dict-based ones.
+
+Usage:
+    python benchmarks/model_memory.py [--count 100000] [--users 3] [--rsvps 10]
+
+Builds ``count`` tasks and meetings with each representation and reports
+the bytes allocated per object, measured with tracemalloc. Titles,
+descriptions and datetimes are shared between both runs so only the
+model layer itself is compared.
+"""
+import argparse
+import os
+import random
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.models import Meeting, Task
+
+@dataclass
+class LegacyTask:
+    id: int
+    title: str
+    description: str
+    status: str
+    created_at: datetime
+    due_date: Optional[datetime] = None
+    assigned_users: List[int] = None
+    thread_id: Optional[int] = None
+    thread_creator_id: Optional[int] = None
+
+@dataclass
+class LegacyMeeting:
+    id: int
+    title: str
+    description: str
+    start_time: datetime
+    duration: int
+    created_by: int
+    participants: List[int]
+    channel_id: Optional[int] = None
+    calendar_event_id: Optional[str] = None
+    reminder_sent: bool = False
+    rsvp_status: Dict[int, str] = None
+    attendance_checked: bool = False
+
+def user_id(rng: random.Random) -> int:
+    return rng.randrange(10 ** 17, 10 ** 18)
+
+def measure(build, count: int) -> float:
+    """Bytes allocated per object built by ``build(i)``"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [build(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=100_000)
+    parser.add_argument('--users', type=int, default=3, help="assignees per task")
+    parser.add_argument('--rsvps', type=int, default=10, help="participants and RSVPs per meeting")
+    args = parser.parse_args()
+
+    now = datetime.now()
+    responses = ['yes', 'maybe', 'no']
+
+    def task(cls):
+        def build(i):
+            rng = random.Random(i)
+            return cls(
+                id=i, title="Task", description="Description", status="In Progress",
+                created_at=now, due_date=now,
+                assigned_users=[user_id(rng) for _ in range(args.users)],
+                thread_id=user_id(rng)
+            )
+        return build
+
+    def meeting(cls):
+        def build(i):
+            rng = random.Random(i)
+            participants = [user_id(rng) for _ in range(args.rsvps)]
+            return cls(
+                id=i, title="Meeting", description="Description", start_time=now,
+                duration=30, created_by=user_id(rng), participants=participants,
+                channel_id=user_id(rng),
+                rsvp_status={uid: rng.choice(responses) for uid in participants}
+            )
+        return build
+
+    print(f"{'model':>8} {'legacy B/obj':>13} {'slotted B/obj':>14} {'saved':>7}")
+    for name, legacy, compact in (
+        ("Task", task(LegacyTask), task(Task)),
+        ("Meeting", meeting(LegacyMeeting), meeting(Meeting))
+    ):
+        legacy_size = measure(legacy, args.count)
+        compact_size = measure(compact, args.count)
+        print(
+            f"{name:>8} {legacy_size:>13.0f} {compact_size:>14.0f} "
+            f"{1 - compact_size / legacy_size:>7.0%}"
+        )
+
+if __name__ == '__main__':
+    main()
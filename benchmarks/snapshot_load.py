@@ -0,0 +1,127 @@
+"""Compare cold-start load time and memory of JSON and binary task snapshots.
+
+Usage:
+    python benchmarks/snapshot_load.py [--sizes 10000 100000 1000000]
+
+Every load runs in a fresh interpreter so peak RSS only covers that load.
+"Load" is the time to open the TaskStore (parse plus index build), "all
+records" the extra time to touch every task once afterwards.
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.models import Task
+from core.snapshot import encode_snapshot
+from core.writer import atomic_write_bytes, atomic_write_json
+
+FILE_NAME = "tasks_data.json"
+# Values of bot.constant.TaskStatus, spelled out so the benchmark doesn't import the bot
+STATUSES = ["Not Started", "In Progress", "Under Review", "Blocked", "Completed"]
+
+def generate_tasks(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    users = [rng.randrange(10 ** 17, 10 ** 18) for _ in range(200)]
+    start = datetime(2024, 1, 1)
+    for task_id in range(1, count + 1):
+        created_at = start + timedelta(seconds=rng.randrange(0, 3 * 365 * 86400))
+        yield Task(
+            id=task_id,
+            title=f"Task {task_id} {rng.choice(['fix', 'write', 'review', 'plan'])}",
+            description="Lorem ipsum dolor sit amet " * rng.randrange(1, 6),
+            status=rng.choice(STATUSES),
+            created_at=created_at,
+            due_date=created_at + timedelta(days=rng.randrange(1, 60)) if rng.random() < 0.6 else None,
+            assigned_users=rng.sample(users, rng.randrange(0, 4)),
+            thread_id=rng.randrange(10 ** 17, 10 ** 18) if rng.random() < 0.1 else None
+        )
+
+def prepare(directory: str, count: int) -> dict:
+    """Write the same tasks as a JSON and a binary snapshot.
+
+    Returns ``{format: (store path, snapshot file)}``, one folder per format
+    so each store only finds its own snapshot.
+    """
+    tasks = {task.id: task for task in generate_tasks(count)}
+    paths = {}
+    for snapshot_format in ("json", "binary"):
+        folder = os.path.join(directory, snapshot_format)
+        os.makedirs(folder)
+        store_path = os.path.join(folder, FILE_NAME)
+        if snapshot_format == "json":
+            file_path = store_path
+            atomic_write_json(file_path, {
+                'tasks': {str(task_id): task.to_dict() for task_id, task in tasks.items()},
+                'task_counter': count,
+                'task_channel_id': None,
+                'task_board_messages': []
+            })
+        else:
+            file_path = f"{os.path.splitext(store_path)[0]}.snap"
+            atomic_write_bytes(file_path, encode_snapshot(Task, tasks, count, None, []))
+        paths[snapshot_format] = (store_path, file_path)
+    return paths
+
+def measure(path: str, snapshot_format: str) -> None:
+    """Runs in the child process: load once and print the measurements as JSON"""
+    from core.persistence import TaskStore
+
+    started = time.perf_counter()
+    store = TaskStore(path, "json", snapshot_format=snapshot_format)
+    loaded = time.perf_counter()
+    for task_id in store.records:
+        store.records[task_id].created_at
+    touched = time.perf_counter()
+
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    print(json.dumps({
+        'load': loaded - started,
+        'touch': touched - loaded,
+        'rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    }))
+    store.close()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--measure', nargs=2, metavar=('PATH', 'FORMAT'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(*args.measure)
+        return
+
+    print(f"{'tasks':>9} {'format':>7} {'file MB':>8} {'load s':>8} {'all records s':>14} {'peak RSS MB':>12}")
+    for count in args.sizes:
+        directory = tempfile.mkdtemp(prefix="snapshot-bench-")
+        try:
+            paths = prepare(directory, count)
+            for snapshot_format, (store_path, file_path) in paths.items():
+                output = subprocess.run(
+                    [sys.executable, __file__, '--measure', store_path, snapshot_format],
+                    check=True, capture_output=True, text=True, cwd=ROOT
+                ).stdout
+                result = json.loads(output.strip().splitlines()[-1])
+                print(
+                    f"{count:>9} {snapshot_format:>7} "
+                    f"{os.path.getsize(file_path) / 2 ** 20:>8.1f} "
+                    f"{result['load']:>8.2f} {result['touch']:>14.2f} "
+                    f"{result['rss'] / 2 ** 20:>12.0f}"
+                )
+        finally:
+            shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    main()
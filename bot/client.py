@@ -1,13 +1,29 @@
-from typing import Optional
+import asyncio
+import os
+from datetime import timedelta
+from typing import List, Optional
 import discord
 from discord.ext import commands
 from .commands import TaskCommands
 from .tutorial import TutorialManager
 from core.persistence import TaskStore, MeetingStore
+from core.sqlite_store import SqliteTaskStore, SqliteMeetingStore
+from core.shards import ShardedStore
+from core.events import EventBus
+from core.exceptions import StorageError
 from features.task_manager import TaskManager
 from features.board_manager import BoardManager
 from features.meeting_manager import MeetingManager
-from config import TASKS_FILE, MEETINGS_FILE
+from features.refresh_scheduler import RefreshScheduler
+from features.notifications import NotificationDispatcher
+from features.backups import BackupManager
+from features.search import SearchManager
+from config import (
+    TASKS_FILE, MEETINGS_FILE, STORAGE_MODE, JOURNAL_COMPACT_THRESHOLD, DATABASE_FILE,
+    STORE_FLUSH_DELAY, BOARD_REFRESH_DELAY, NOTIFICATION_CONCURRENCY, GUILD_DATA_DIR,
+    SHARD_IDLE_SECONDS, SNAPSHOT_FORMAT, ARCHIVE_AFTER_DAYS, ARCHIVE_INTERVAL_SECONDS,
+    BACKUP_DIR, BACKUP_INTERVAL_SECONDS, BACKUP_FULL_EVERY, BACKUP_RETENTION
+)
 
 class TaskBot(commands.Bot):
     def __init__(self):
@@ -22,24 +38,54 @@ class TaskBot(commands.Bot):
         )
         
         # Initialize components
-        self.task_store: Optional[TaskStore] = None
-        self.meeting_store: Optional[MeetingStore] = None
+        self.events: Optional[EventBus] = None
+        self.event_dispatcher: Optional[asyncio.Task] = None
+        self.task_stores: Optional[ShardedStore] = None
+        self.meeting_stores: Optional[ShardedStore] = None
+        self.shard_eviction: List[asyncio.Task] = []
+        self.archiver: Optional[asyncio.Task] = None
+        self.backup_runner: Optional[asyncio.Task] = None
+        self.backups: Optional[BackupManager] = None
+        self.search: Optional[SearchManager] = None
         self.task_manager: Optional[TaskManager] = None
         self.meeting_manager: Optional[MeetingManager] = None
         self.board_manager: Optional[BoardManager] = None
+        self.refresh_scheduler: Optional[RefreshScheduler] = None
+        self.notifications: Optional[NotificationDispatcher] = None
         self.tutorial_manager: Optional[TutorialManager] = None
         
     async def setup_hook(self) -> None:
         """Initialize bot components after login"""
-        # Initialize stores
-        self.task_store = TaskStore(TASKS_FILE)
-        self.meeting_store = MeetingStore(MEETINGS_FILE)
+        # Stores publish their changes here, managers subscribe to them
+        self.events = EventBus()
+        self.event_dispatcher = asyncio.create_task(self.events.run())
+        
+        # Initialize per-guild stores, loaded on first use
+        self.task_stores = ShardedStore(self.open_task_store, SHARD_IDLE_SECONDS)
+        self.meeting_stores = ShardedStore(self.open_meeting_store, SHARD_IDLE_SECONDS)
+        self.shard_eviction = [
+            asyncio.create_task(self.task_stores.run_eviction()),
+            asyncio.create_task(self.meeting_stores.run_eviction())
+        ]
         
         # Initialize managers
-        self.task_manager = TaskManager(self, self.task_store)
-        self.meeting_manager = MeetingManager(self, self.meeting_store)
+        self.notifications = NotificationDispatcher(self, NOTIFICATION_CONCURRENCY)
+        self.task_manager = TaskManager(self, self.task_stores)
+        self.meeting_manager = MeetingManager(self, self.meeting_stores)
         self.board_manager = BoardManager(self.task_manager)
+        self.search = SearchManager(self)
+        self.refresh_scheduler = RefreshScheduler(
+            {
+                RefreshScheduler.TASKS: self.task_manager.update_board,
+                RefreshScheduler.MEETINGS: self.meeting_manager.update_board,
+                RefreshScheduler.MEETING_MESSAGES: self.meeting_manager.refresh_meetings
+            },
+            delay=BOARD_REFRESH_DELAY
+        )
         self.tutorial_manager = TutorialManager(self)
+        self.archiver = asyncio.create_task(self.run_archiver())
+        self.backups = BackupManager(self, BACKUP_DIR, BACKUP_FULL_EVERY, BACKUP_RETENTION)
+        self.backup_runner = asyncio.create_task(self.run_backups())
         
         # Register commands
         await self.add_cog(TaskCommands(self))
@@ -49,6 +95,158 @@ class TaskBot(commands.Bot):
         await self.tree.sync()
         print("Slash commands synced!")
         
+    def guild_data_dir(self, guild_id: int) -> str:
+        """Directory holding the data files of a guild"""
+        path = os.path.join(GUILD_DATA_DIR, str(guild_id))
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def open_task_store(self, guild_id: int) -> TaskStore:
+        """Open the task store of a guild for the configured backend"""
+        path = self.guild_data_dir(guild_id)
+        if STORAGE_MODE == "sqlite":
+            store = SqliteTaskStore(
+                os.path.join(path, os.path.basename(DATABASE_FILE)), flush_delay=STORE_FLUSH_DELAY
+            )
+        else:
+            store = TaskStore(
+                os.path.join(path, os.path.basename(TASKS_FILE)),
+                STORAGE_MODE, JOURNAL_COMPACT_THRESHOLD, STORE_FLUSH_DELAY, SNAPSHOT_FORMAT
+            )
+        store.attach_events(self.events, guild_id)
+        return store
+
+    def open_meeting_store(self, guild_id: int) -> MeetingStore:
+        """Open the meeting store of a guild for the configured backend"""
+        path = self.guild_data_dir(guild_id)
+        if STORAGE_MODE == "sqlite":
+            store = SqliteMeetingStore(
+                os.path.join(path, os.path.basename(DATABASE_FILE)), flush_delay=STORE_FLUSH_DELAY
+            )
+        else:
+            store = MeetingStore(
+                os.path.join(path, os.path.basename(MEETINGS_FILE)),
+                STORAGE_MODE, JOURNAL_COMPACT_THRESHOLD, STORE_FLUSH_DELAY, SNAPSHOT_FORMAT
+            )
+        store.attach_events(self.events, guild_id)
+        return store
+
+    def find_legacy_owner(self, channel_id: Optional[int]) -> Optional[discord.Guild]:
+        """Find the guild that owned a board channel before storage was split per guild"""
+        if channel_id:
+            for guild in self.guilds:
+                if guild.get_channel(channel_id):
+                    return guild
+        if len(self.guilds) == 1:
+            return self.guilds[0]
+        return None
+
+    async def migrate_legacy_data(self) -> None:
+        """Move the data files shared by every guild into the guild that owns them"""
+        if STORAGE_MODE == "sqlite":
+            legacy_files = [
+                TASKS_FILE, MEETINGS_FILE,
+                DATABASE_FILE, f"{DATABASE_FILE}-wal", f"{DATABASE_FILE}-shm"
+            ]
+        else:
+            legacy_files = [
+                file
+                for path in (TASKS_FILE, MEETINGS_FILE)
+                for file in (
+                    path, f"{path}.log", f"{os.path.splitext(path)[0]}.snap"
+                )
+            ]
+        if not any(os.path.exists(path) for path in legacy_files):
+            return
+        
+        if STORAGE_MODE == "sqlite":
+            legacy = [
+                (self.task_stores, SqliteTaskStore(DATABASE_FILE, TASKS_FILE, STORE_FLUSH_DELAY)),
+                (self.meeting_stores, SqliteMeetingStore(DATABASE_FILE, MEETINGS_FILE, STORE_FLUSH_DELAY))
+            ]
+        else:
+            legacy = [
+                (self.task_stores, TaskStore(
+                    TASKS_FILE, STORAGE_MODE, JOURNAL_COMPACT_THRESHOLD, STORE_FLUSH_DELAY,
+                    SNAPSHOT_FORMAT
+                )),
+                (self.meeting_stores, MeetingStore(
+                    MEETINGS_FILE, STORAGE_MODE, JOURNAL_COMPACT_THRESHOLD, STORE_FLUSH_DELAY,
+                    SNAPSHOT_FORMAT
+                ))
+            ]
+        
+        try:
+            # Stores without any data don't need an owner
+            populated = [(shards, store) for shards, store in legacy if store.records or store.channel_id]
+            owners = [self.find_legacy_owner(store.channel_id) for _, store in populated]
+            if None in owners:
+                print("Could not tell which guild owns the legacy data files, leaving them in place")
+                return
+            
+            for (shards, store), guild in zip(populated, owners):
+                shard = shards.store_for(guild.id)
+                shard.import_data(store.to_dict())
+                await shard.flush()
+                print(f"Moved legacy {store.records_key} data to {guild.name}")
+        finally:
+            for _, store in legacy:
+                await store.flush()
+                store.close()
+        
+        for path in legacy_files:
+            if os.path.exists(path):
+                os.replace(path, f"{path}.migrated")
+
+    async def archive_old_records(self) -> None:
+        """Move old completed tasks and ended meetings of the loaded guilds to their archives"""
+        max_age = timedelta(days=ARCHIVE_AFTER_DAYS)
+        loaded = set(self.task_stores.loaded_ids()) | set(self.meeting_stores.loaded_ids())
+        for guild in self.guilds:
+            if guild.id not in loaded:
+                continue
+            try:
+                tasks = await self.task_manager.archive_completed(guild, max_age)
+                meetings = self.meeting_manager.archive_ended(guild.id, max_age)
+                if tasks or meetings:
+                    print(f"Archived {len(tasks)} tasks and {len(meetings)} meetings in {guild.name}")
+            except Exception as e:
+                print(f"Error archiving records in {guild.name}: {e}")
+
+    async def run_archiver(self) -> None:
+        """Archive old records once the bot is ready, then every ARCHIVE_INTERVAL_SECONDS"""
+        await self.wait_until_ready()
+        while True:
+            await self.archive_old_records()
+            await asyncio.sleep(ARCHIVE_INTERVAL_SECONDS)
+
+    async def run_backups(self) -> None:
+        """Back up every guild once the bot is ready, then every BACKUP_INTERVAL_SECONDS"""
+        await self.wait_until_ready()
+        while True:
+            await self.backups.backup_all()
+            await asyncio.sleep(BACKUP_INTERVAL_SECONDS)
+
+    async def close(self) -> None:
+        """Write pending store changes before disconnecting"""
+        if self.archiver:
+            self.archiver.cancel()
+        if self.backup_runner:
+            self.backup_runner.cancel()
+        for task in self.shard_eviction:
+            task.cancel()
+        for stores in (self.task_stores, self.meeting_stores):
+            if stores:
+                await stores.close()
+        if self.meeting_manager:
+            try:
+                self.meeting_manager.schedule_index.close()
+            except StorageError as e:
+                print(f"Error saving the meeting schedule: {e}")
+        if self.event_dispatcher:
+            self.event_dispatcher.cancel()
+        await super().close()
+        
     async def on_ready(self):
         """Handle bot ready event"""
         print(f"{self.user} has connected to Discord!")
@@ -58,16 +256,29 @@ class TaskBot(commands.Bot):
         )
         await self.change_presence(activity=activity)
         
+        await self.migrate_legacy_data()
+        self.meeting_manager.reschedule_all()
+        
         # Restore boards
         for guild in self.guilds:
-            try:
-                if self.task_store.task_channel_id:
-                    await self.task_manager.update_board(guild)
-                if self.meeting_store.meeting_channel_id:
-                    print(f"Restoring boards in {guild.name}")
-                    await self.meeting_manager.update_board(guild)
-            except Exception as e:
-                print(f"Error restoring boards in {guild.name}: {e}")
+            self.task_manager.thread_cache.seed_guild(guild)
+            if self.task_manager.store_for(guild.id).task_channel_id:
+                self.task_manager.schedule_board_update(guild)
+            if self.meeting_manager.store_for(guild.id).meeting_channel_id:
+                print(f"Restoring boards in {guild.name}")
+                self.meeting_manager.schedule_board_update(guild)
+
+    async def on_thread_create(self, thread: discord.Thread):
+        """Track new threads in the thread cache"""
+        self.task_manager.thread_cache.mark_alive(thread.id)
+
+    async def on_thread_update(self, before: discord.Thread, after: discord.Thread):
+        """Archived or renamed threads still exist"""
+        self.task_manager.thread_cache.mark_alive(after.id)
+
+    async def on_raw_thread_delete(self, payload: discord.RawThreadDeleteEvent):
+        """Track deleted threads, including ones missing from the gateway cache"""
+        self.task_manager.thread_cache.mark_deleted(payload.thread_id)
 
     async def on_guild_join(self, guild: discord.Guild):
         """Handle when bot joins a new server"""
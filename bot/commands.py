@@ -1,19 +1,38 @@
-import io
-import json
-from typing import Optional
-from core.models import Meeting, Task
+import tempfile
+from typing import List, Optional
+from core.models import Meeting, Task, TaskFilter, target_mention
 import discord
 from discord import app_commands
 from discord.ext import commands
 from bot.constant import TaskStatus, STATUS_EMOJIS
-from datetime import datetime
-from core.exceptions import TaskError, InvalidTaskDataError, TaskNotFoundError
+from datetime import datetime, timedelta
+from core.exceptions import TaskError, InvalidTaskDataError, TaskNotFoundError, StorageError
+from core.transfer import import_entries, read_legacy_json, read_ndjson, write_export
 from ui.embeds import TaskBoardEmbeds
-from ui.views import TaskStatusView
+from ui.views import BulkConfirmView, TaskListView, TaskStatusView
+from utils.mentions import parse_mentions
+from utils.packing import MAX_FIELD_VALUE, join_truncated
+from utils.validator import validate_date
 
 class TaskCommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+
+    async def task_id_autocomplete(
+        self,
+        interaction: discord.Interaction,
+        current: str
+    ) -> List[app_commands.Choice[int]]:
+        """Suggest task IDs by number or title, the user's own and recent tasks first"""
+        if interaction.guild is None:
+            return []
+        return [
+            app_commands.Choice(name=name, value=task_id)
+            for task_id, name in self.bot.search.complete(
+                interaction.guild.id, self.bot.search.TASK, current,
+                interaction.user.id, [role.id for role in interaction.user.roles]
+            )
+        ]
         
     @app_commands.command(
         name="setup",
@@ -46,7 +65,7 @@ class TaskCommands(commands.Cog):
                 'meeting-dashboard',
                 overwrites=overwrites
             )
-            self.bot.meeting_store.set_channel_id(meeting_channel.id)
+            self.bot.meeting_manager.store_for(interaction.guild.id).set_channel_id(meeting_channel.id)
             
             # Send success message
             embed = discord.Embed(
@@ -67,10 +86,6 @@ class TaskCommands(commands.Cog):
             
             await interaction.response.send_message(embed=embed, ephemeral=True)
             
-            # Update both boards
-            await self.bot.task_manager.update_board(interaction.guild)
-            await self.bot.meeting_manager.update_board(interaction.guild)
-            
         except discord.errors.Forbidden:
             await interaction.response.send_message(
                 "❌ Missing permissions to create the channels.",
@@ -84,34 +99,38 @@ class TaskCommands(commands.Cog):
 
     @app_commands.command(
         name="export_data",
-        description="Export all tasks and meetings data as a JSON file (Admin only)"
+        description="Export all tasks and meetings data as an NDJSON file (Admin only)"
+    )
+    @app_commands.describe(
+        compress="Gzip the export file (default: yes)",
+        since="Only export changes after this sequence number, from a previous export"
     )
     @app_commands.checks.has_permissions(administrator=True)
-    async def export_data(self, interaction: discord.Interaction):
+    async def export_data(
+        self,
+        interaction: discord.Interaction,
+        compress: bool = True,
+        since: Optional[int] = None
+    ):
+        await interaction.response.defer(ephemeral=True, thinking=True)
         try:
-            # Create combined data dictionary
-            export_data = {
-                'tasks': {
-                    str(k): v.to_dict() 
-                    for k, v in self.bot.task_store.tasks.items()
-                },
-                'task_counter': self.bot.task_store.task_counter,
-                'task_channel_id': self.bot.task_store.task_channel_id,
-                'meetings': {
-                    str(k): v.to_dict() 
-                    for k, v in self.bot.meeting_store.meetings.items()
-                },
-                'meeting_counter': self.bot.meeting_store.meeting_counter,
-                'meeting_channel_id': self.bot.meeting_store.meeting_channel_id
-            }
-            
-            # Convert to JSON string with pretty formatting
-            json_data = json.dumps(export_data, indent=4)
+            # Stream this guild's records to a temp file, one line per record
+            spool = tempfile.TemporaryFile()
+            result = await write_export(
+                spool,
+                self.bot.task_manager.store_for(interaction.guild.id),
+                self.bot.meeting_manager.store_for(interaction.guild.id),
+                compress=compress,
+                since=since
+            )
+            spool.seek(0)
             
             # Create a Discord file object
+            extension = "ndjson.gz" if compress else "ndjson"
+            prefix = "nibblix_data" if since is None else "nibblix_delta"
             file = discord.File(
-                fp=io.StringIO(json_data),
-                filename=f"nibblix_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+                fp=spool,
+                filename=f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
             )
             
             # Create response embed
@@ -120,79 +139,63 @@ class TaskCommands(commands.Cog):
                 description="Your database export is ready!",
                 color=discord.Color.green()
             )
+            contents = f"✅ {result.tasks} tasks\n✅ {result.meetings} meetings\n"
+            if since is not None:
+                contents += f"✅ {result.removed} deletions\n"
             embed.add_field(
-                name="Contents",
-                value="✅ Tasks data\n✅ Meetings data\n✅ Channel configurations",
+                name="Contents" if since is None else f"Changes since {since}",
+                value=contents + "✅ Channel configurations",
+                inline=False
+            )
+            embed.add_field(
+                name="Sequence",
+                value=f"`{result.seq}`, pass `since:{result.seq}` next time to export only newer changes",
                 inline=False
             )
             
             # Send the file with the embed
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 embed=embed,
                 file=file,
                 ephemeral=True
             )
             
+        except StorageError as e:
+            await interaction.followup.send(f"❌ {str(e)}", ephemeral=True)
         except Exception as e:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 f"❌ Failed to export data: {str(e)}",
                 ephemeral=True
             )
 
     @app_commands.command(
         name="import_data",
-        description="Import tasks and meetings data from a JSON file (Admin only)"
+        description="Import tasks and meetings data from an export file (Admin only)"
     )
     @app_commands.checks.has_permissions(administrator=True)
     async def import_data(self, interaction: discord.Interaction, file: discord.Attachment):
+        if not file.filename.endswith(('.ndjson', '.ndjson.gz', '.json')):
+            await interaction.response.send_message(
+                "❌ Please upload a file exported with /export_data (.ndjson, .ndjson.gz or .json).",
+                ephemeral=True
+            )
+            return
+        
+        await interaction.response.defer(ephemeral=True, thinking=True)
         try:
-            if not file.filename.endswith('.json'):
-                await interaction.response.send_message(
-                    "❌ Please upload a valid JSON file.",
-                    ephemeral=True
-                )
-                return
+            # Keep the attachment in a temp file while it is parsed line by line
+            with tempfile.TemporaryFile() as spool:
+                await file.save(spool)
+                spool.seek(0)
+                entries = read_legacy_json(spool) if file.filename.endswith('.json') else read_ndjson(spool)
                 
-            # Download and parse the JSON file
-            json_content = await file.read()
-            if not file.filename.endswith('.json'):
-                await interaction.response.send_message(
-                    "❌ Please upload a valid JSON file.",
-                    ephemeral=True
-                )
-                return
+                # Validate everything into shadow stores, then swap them in
+                task_store = self.bot.task_manager.store_for(interaction.guild.id)
+                meeting_store = self.bot.meeting_manager.store_for(interaction.guild.id)
+                result = await import_entries(entries, task_store, meeting_store)
             
-            # Download and parse the JSON file
-            json_content = await file.read()
-            import_data = json.loads(json_content.decode('utf-8'))
-            
-            # Validate data structure
-            required_keys = ['tasks', 'task_counter', 'task_channel_id', 
-                           'meetings', 'meeting_counter', 'meeting_channel_id']
-            if not all(key in import_data for key in required_keys):
-                await interaction.response.send_message(
-                    "❌ Invalid database format. File is missing required data.",
-                    ephemeral=True
-                )
-                return
-            
-            # Import tasks data
-            self.bot.task_store.tasks = {
-                int(k): Task.from_dict(v) 
-                for k, v in import_data['tasks'].items()
-            }
-            self.bot.task_store.task_counter = import_data['task_counter']
-            self.bot.task_store.task_channel_id = import_data['task_channel_id']
-            self.bot.task_store._save()
-            
-            # Import meetings data
-            self.bot.meeting_store.meetings = {
-                int(k): Meeting.from_dict(v) 
-                for k, v in import_data['meetings'].items()
-            }
-            self.bot.meeting_store.meeting_counter = import_data['meeting_counter']
-            self.bot.meeting_store.meeting_channel_id = import_data['meeting_channel_id']
-            self.bot.meeting_store._save()
+            await task_store.flush()
+            await meeting_store.flush()
             
             # Create response embed
             embed = discord.Embed(
@@ -202,27 +205,64 @@ class TaskCommands(commands.Cog):
             )
             embed.add_field(
                 name="Imported Data",
-                value=f"✅ {len(import_data['tasks'])} tasks\n✅ {len(import_data['meetings'])} meetings",
+                value=(
+                    f"✅ {result.tasks} tasks\n✅ {result.meetings} meetings\n"
+                    f"✅ {result.archived} archived records"
+                ),
                 inline=False
             )
             
-            await interaction.response.send_message(embed=embed, ephemeral=True)
-            
-            # Update both boards
-            await self.bot.task_manager.update_board(interaction.guild)
-            await self.bot.meeting_manager.update_board(interaction.guild)
+            await interaction.followup.send(embed=embed, ephemeral=True)
             
-        except json.JSONDecodeError:
-            await interaction.response.send_message(
-                "❌ Invalid JSON file format.",
+        except InvalidTaskDataError as e:
+            await interaction.followup.send(
+                f"❌ Invalid import file, nothing was changed: {str(e)}",
                 ephemeral=True
             )
         except Exception as e:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 f"❌ Failed to import data: {str(e)}",
                 ephemeral=True
             )
 
+    @app_commands.command(
+        name="restore_backup",
+        description="Restore tasks and meetings from the newest scheduled backup (Admin only)"
+    )
+    @app_commands.checks.has_permissions(administrator=True)
+    async def restore_backup(self, interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        try:
+            # Replay the newest full backup and its incremental ones
+            result = await self.bot.backups.restore(interaction.guild.id)
+            
+            embed = discord.Embed(
+                title="♻️ Backup Restored",
+                description="The newest backup has been restored!",
+                color=discord.Color.green()
+            )
+            embed.add_field(
+                name="Restored Data",
+                value=(
+                    f"✅ {result.tasks} tasks\n✅ {result.meetings} meetings\n"
+                    f"✅ {result.archived} archived records"
+                ),
+                inline=False
+            )
+            
+            await interaction.followup.send(embed=embed, ephemeral=True)
+            
+        except (InvalidTaskDataError, StorageError) as e:
+            await interaction.followup.send(
+                f"❌ Could not restore the backup, nothing was changed: {str(e)}",
+                ephemeral=True
+            )
+        except Exception as e:
+            await interaction.followup.send(
+                f"❌ Failed to restore backup: {str(e)}",
+                ephemeral=True
+            )
+
     @app_commands.command(
         name="reset_data",
         description="Reset all tasks and meetings data (Admin only)"
@@ -230,15 +270,13 @@ class TaskCommands(commands.Cog):
     @app_commands.checks.has_permissions(administrator=True)
     async def reset_data(self, interaction: discord.Interaction):
         try:
-            # Clear tasks data
-            self.bot.task_store.tasks = {}
-            self.bot.task_store.task_counter = 0
-            self.bot.task_store._save()
-            
-            # Clear meetings data
-            self.bot.meeting_store.meetings = {}
-            self.bot.meeting_store.meeting_counter = 0
-            self.bot.meeting_store._save()
+            # Clear this guild's tasks and meetings data
+            task_store = self.bot.task_manager.store_for(interaction.guild.id)
+            meeting_store = self.bot.meeting_manager.store_for(interaction.guild.id)
+            task_store.reset()
+            meeting_store.reset()
+            await task_store.flush()
+            await meeting_store.flush()
             
             # Create response embed
             embed = discord.Embed(
@@ -256,10 +294,6 @@ class TaskCommands(commands.Cog):
             
             await interaction.response.send_message(embed=embed, ephemeral=True)
             
-            # Update both boards to show empty state
-            await self.bot.task_manager.update_board(interaction.guild)
-            await self.bot.meeting_manager.update_board(interaction.guild)
-            
         except Exception as e:
             await interaction.response.send_message(
                 f"❌ An error occurred while resetting data: {str(e)}",
@@ -298,6 +332,7 @@ class TaskCommands(commands.Cog):
     ):
         try:
             task = await self.bot.task_manager.create_task(
+                guild=interaction.guild,
                 title=title,
                 description=description,
                 due_date=due_date
@@ -314,7 +349,6 @@ class TaskCommands(commands.Cog):
                 embed.add_field(name="Due Date", value=task.due_date.strftime("%Y-%m-%d"), inline=False)
             
             await interaction.response.send_message(embed=embed, ephemeral=True)
-            await self.bot.task_manager.update_board(interaction.guild)
             
         except (TaskError, ValueError) as e:
             await interaction.response.send_message(f"❌ {str(e)}", ephemeral=True)
@@ -330,40 +364,30 @@ class TaskCommands(commands.Cog):
     )
     @app_commands.describe(
         task_id="The ID of the task to assign",
-        users="The users to assign (mention them)"
+        users="The users or roles to assign (mention them)"
     )
+    @app_commands.autocomplete(task_id=task_id_autocomplete)
     async def assign_task(
         self,
         interaction: discord.Interaction,
         task_id: int,
         users: str
     ):
+        # Resolving mentions may query the gateway, so answer the interaction first
+        await interaction.response.defer(ephemeral=True, thinking=True)
         try:
-            # Parse user mentions
-            assigned_users = []
-            mentions = users.split()
-            
-            for mention in mentions:
-                stripped_mention = mention.strip('<@!>')
-                
-                if mention in ['@everyone', '@here']:
-                    assigned_users = [member.id for member in interaction.guild.members if not member.bot]
-                    break
-                    
-                if stripped_mention.isdigit():
-                    user_id = int(stripped_mention)
-                    member = interaction.guild.get_member(user_id)
-                    if member and not member.bot:
-                        assigned_users.append(user_id)
+            # @everyone and roles are stored as single entries
+            mentions = await parse_mentions(interaction.guild, users)
+            assigned_users = mentions.targets
 
             if not assigned_users:
-                await interaction.response.send_message(
-                    "❌ No valid users mentioned. Please mention users with @username or use @everyone.",
+                await interaction.followup.send(
+                    "❌ No valid users mentioned. Please mention users or roles, or use @everyone.",
                     ephemeral=True
                 )
                 return
 
-            task = await self.bot.task_manager.assign_users(task_id, assigned_users)
+            task = await self.bot.task_manager.assign_users(interaction.guild, task_id, assigned_users)
             
             embed = discord.Embed(
                 title="👥 Task Assigned",
@@ -371,21 +395,26 @@ class TaskCommands(commands.Cog):
                 color=discord.Color.blue()
             )
             
-            if '@everyone' in mentions or '@here' in mentions:
-                embed.add_field(name="Assigned Users", value="@everyone")
-            else:
+            embed.add_field(
+                name="Assigned Users",
+                value=join_truncated(
+                    (target_mention(target, interaction.guild.id) for target in assigned_users),
+                    MAX_FIELD_VALUE
+                )
+            )
+            if mentions.skipped:
                 embed.add_field(
-                    name="Assigned Users",
-                    value=", ".join(f"<@{user_id}>" for user_id in assigned_users)
+                    name="⚠️ Not Found",
+                    value=join_truncated(mentions.skipped, MAX_FIELD_VALUE),
+                    inline=False
                 )
 
-            await interaction.response.send_message(embed=embed, ephemeral=True)
-            await self.bot.task_manager.update_board(interaction.guild)
+            await interaction.followup.send(embed=embed, ephemeral=True)
             
         except TaskError as e:
-            await interaction.response.send_message(f"❌ {str(e)}", ephemeral=True)
+            await interaction.followup.send(f"❌ {str(e)}", ephemeral=True)
         except Exception as e:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 "❌ An error occurred while assigning users.",
                 ephemeral=True
             )
@@ -395,20 +424,21 @@ class TaskCommands(commands.Cog):
         description="Create a discussion thread for a task"
     )
     @app_commands.describe(task_id="The ID of the task to create a thread for")
+    @app_commands.autocomplete(task_id=task_id_autocomplete)
     async def create_thread(self, interaction: discord.Interaction, task_id: int):
         try:
-            task = await self.bot.task_manager.get_task(task_id)
+            task = await self.bot.task_manager.get_task(interaction.guild, task_id)
             
-            if task.thread_id:
-                thread = await interaction.guild.fetch_channel(task.thread_id)
-                if thread:
-                    await interaction.response.send_message(
-                        f"❌ This task already has a thread: {thread.mention}",
-                        ephemeral=True
-                    )
-                    return
+            if await self.bot.task_manager.verify_thread_exists(interaction.guild, task):
+                await interaction.response.send_message(
+                    f"❌ This task already has a thread: <#{task.thread_id}>",
+                    ephemeral=True
+                )
+                return
             
-            task_channel = interaction.guild.get_channel(self.bot.task_store.task_channel_id)
+            task_channel = interaction.guild.get_channel(
+                self.bot.task_manager.store_for(interaction.guild.id).task_channel_id
+            )
             if not task_channel:
                 await interaction.response.send_message(
                     "❌ Task board channel not found.",
@@ -429,6 +459,7 @@ class TaskCommands(commands.Cog):
             )
             
             await self.bot.task_manager.update_task_thread(
+                guild=interaction.guild,
                 task_id=task_id,
                 thread_id=thread.id,
                 thread_creator_id=interaction.user.id
@@ -441,7 +472,7 @@ class TaskCommands(commands.Cog):
             )
             embed.add_field(
                 name="Assigned Users",
-                value=", ".join([f"<@{user_id}>" for user_id in task.assigned_users]),
+                value=", ".join(target_mention(target, interaction.guild.id) for target in task.assigned_users),
                 inline=False
             )
             await thread.send(embed=embed)
@@ -450,7 +481,6 @@ class TaskCommands(commands.Cog):
                 f"✅ Thread created successfully: {thread.mention}",
                 ephemeral=True
             )
-            await self.bot.task_manager.update_board(interaction.guild)
             
         except TaskError as e:
             await interaction.response.send_message(f"❌ {str(e)}", ephemeral=True)
@@ -465,9 +495,10 @@ class TaskCommands(commands.Cog):
         description="Delete the discussion thread for a task"
     )
     @app_commands.describe(task_id="The ID of the task whose thread to delete")
+    @app_commands.autocomplete(task_id=task_id_autocomplete)
     async def delete_thread(self, interaction: discord.Interaction, task_id: int):
         try:
-            task = await self.bot.task_manager.get_task(task_id)
+            task = await self.bot.task_manager.get_task(interaction.guild, task_id)
             
             if not task.thread_id:
                 await interaction.response.send_message(
@@ -488,6 +519,7 @@ class TaskCommands(commands.Cog):
                 await thread.delete()
             
             await self.bot.task_manager.update_task_thread(
+                guild=interaction.guild,
                 task_id=task_id,
                 thread_id=None,
                 thread_creator_id=None
@@ -497,7 +529,6 @@ class TaskCommands(commands.Cog):
                 "✅ Thread deleted successfully",
                 ephemeral=True
             )
-            await self.bot.task_manager.update_board(interaction.guild)
             
         except TaskError as e:
             await interaction.response.send_message(f"❌ {str(e)}", ephemeral=True)
@@ -512,10 +543,16 @@ class TaskCommands(commands.Cog):
         description="Get detailed information about a specific task"
     )
     @app_commands.describe(task_id="The ID of the task to get info about")
+    @app_commands.autocomplete(task_id=task_id_autocomplete)
     async def get_task_info(self, interaction: discord.Interaction, task_id: int):
         try:
-            task = await self.bot.task_manager.get_task(task_id)
-            embed = TaskBoardEmbeds.create_task_info(task)
+            task = await self.bot.task_manager.get_task(interaction.guild, task_id)
+            embed = TaskBoardEmbeds.create_task_info(task, interaction.guild.id)
+            
+            if self.bot.task_manager.store_for(interaction.guild.id).is_archived(task_id):
+                # Tasks completed before completion dates were recorded have none
+                completed = f", completed on {task.completed_at.strftime('%Y-%m-%d')}" if task.completed_at else ""
+                embed.set_footer(text=f"📦 Archived{completed}")
             
             if task.thread_id:
                 thread = interaction.guild.get_thread(task.thread_id)
@@ -542,55 +579,80 @@ class TaskCommands(commands.Cog):
             )
 
     @app_commands.command(
-        name="list",
-        description="List all tasks assigned to you"
+        name="search",
+        description="Search tasks and meetings by title or description"
     )
-    async def task_list(self, interaction: discord.Interaction):
+    @app_commands.describe(
+        query="Words to look for; the last one may be unfinished",
+        kind="Only search tasks or only meetings"
+    )
+    @app_commands.choices(kind=[
+        app_commands.Choice(name="Tasks", value="task"),
+        app_commands.Choice(name="Meetings", value="meeting")
+    ])
+    async def search(
+        self,
+        interaction: discord.Interaction,
+        query: str,
+        kind: Optional[app_commands.Choice[str]] = None
+    ):
         try:
-            tasks = self.bot.task_store.get_all_tasks().values()
-            user_tasks = [task for task in tasks if interaction.user.id in task.assigned_users]
-            
-            if not user_tasks:
+            hits = self.bot.search.search(
+                interaction.guild.id, query, [kind.value] if kind else None, limit=15
+            )
+            if not hits:
                 await interaction.response.send_message(
-                    "📝 You have no tasks assigned to you.",
+                    f"🔍 Nothing matches `{query[:100]}`.",
                     ephemeral=True
                 )
                 return
-                
-            tasks_by_status = {status: [] for status in TaskStatus}
-            for task in user_tasks:
-                status = TaskStatus(task.status)
-                tasks_by_status[status].append(task)
-                
-            header_embed = discord.Embed(
-                title="📋 Your Task List",
-                description="Tasks assigned to you",
-                color=discord.Color.blue()
-            )
             
-            all_embeds = [header_embed]
+            task_store = self.bot.task_manager.store_for(interaction.guild.id)
+            meeting_store = self.bot.meeting_manager.store_for(interaction.guild.id)
+            lines = []
+            for hit in hits:
+                if hit.kind == "task":
+                    status = TaskStatus(task_store.get_task(hit.id).status)
+                    lines.append(f"{STATUS_EMOJIS[status]} Task `#{hit.id}` • {hit.title[:80]}")
+                else:
+                    start = meeting_store.get_meeting(hit.id).start_time
+                    lines.append(f"📅 Meeting `#{hit.id}` • {hit.title[:80]} ({start.strftime('%Y-%m-%d %H:%M')})")
             
-            for status, tasks in tasks_by_status.items():
-                if tasks:
-                    status_embeds = TaskBoardEmbeds.create_status_section(
-                        status,
-                        tasks,
-                        interaction.guild
-                    )
-                    for embed in status_embeds:
-                        embed.title = f"{STATUS_EMOJIS[status]} Your {status.value} Tasks ({len(tasks)})"
-                        all_embeds.append(embed)
+            embed = discord.Embed(
+                title=f"🔍 Results for \"{query[:100]}\"",
+                description="\n".join(lines),
+                color=discord.Color.blue()
+            )
+            embed.set_footer(text="Use /info with a task ID for details")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
             
+        except Exception as e:
             await interaction.response.send_message(
-                embed=all_embeds[0],
+                f"❌ An error occurred while searching: {str(e)}",
                 ephemeral=True
             )
+
+    @app_commands.command(
+        name="list",
+        description="List all tasks assigned to you"
+    )
+    async def task_list(self, interaction: discord.Interaction):
+        try:
+            # Tasks assigned to one of the member's roles or @everyone count too
+            user_tasks = self.bot.task_manager.store_for(interaction.guild.id).get_tasks_by_assignee(
+                interaction.user.id, [role.id for role in interaction.user.roles]
+            )
             
-            for embed in all_embeds[1:]:
-                await interaction.followup.send(
-                    embed=embed,
+            if not user_tasks:
+                await interaction.response.send_message(
+                    "📝 You have no tasks assigned to you.",
                     ephemeral=True
                 )
+                return
+                
+            # One message; pages are rendered from the view as the user flips through them
+            view = TaskListView(user_tasks, interaction.guild)
+            await interaction.response.send_message(embed=view.render(), view=view, ephemeral=True)
                 
         except Exception as e:
             await interaction.response.send_message(
@@ -603,9 +665,10 @@ class TaskCommands(commands.Cog):
         description="Update task status"
     )
     @app_commands.describe(task_id="The ID of the task to update")
+    @app_commands.autocomplete(task_id=task_id_autocomplete)
     async def update_task(self, interaction: discord.Interaction, task_id: int):
         try:
-            task = await self.bot.task_manager.get_task(task_id)
+            task = await self.bot.task_manager.get_task(interaction.guild, task_id)
             
             embed = discord.Embed(
                 title="🔄 Update Task Status",
@@ -632,9 +695,10 @@ class TaskCommands(commands.Cog):
         description="Delete a task"
     )
     @app_commands.describe(task_id="The ID of the task to delete")
+    @app_commands.autocomplete(task_id=task_id_autocomplete)
     async def delete_task(self, interaction: discord.Interaction, task_id: int):
         try:
-            task = await self.bot.task_manager.delete_task(task_id)
+            task = await self.bot.task_manager.delete_task(interaction.guild, task_id)
             
             embed = discord.Embed(
                 title="🗑️ Task Deleted",
@@ -644,7 +708,6 @@ class TaskCommands(commands.Cog):
             embed.add_field(name="Title", value=task.title)
             
             await interaction.response.send_message(embed=embed, ephemeral=True)
-            await self.bot.task_manager.update_board(interaction.guild)
             
         except TaskError as e:
             await interaction.response.send_message(f"❌ {str(e)}", ephemeral=True)
@@ -654,6 +717,170 @@ class TaskCommands(commands.Cog):
                 ephemeral=True
             )
 
+    @app_commands.command(
+        name="bulk",
+        description="Change the status of or delete every task matching a filter (Admin only)"
+    )
+    @app_commands.describe(
+        action="What to do with the matching tasks",
+        new_status="The status to set (for the 'Set status' action)",
+        status="Only tasks with this status",
+        assignee="Only tasks assigned to this member",
+        due_from="Only tasks due on or after this date (DD-MM-YYYY)",
+        due_to="Only tasks due on or before this date (DD-MM-YYYY)"
+    )
+    @app_commands.choices(
+        action=[
+            app_commands.Choice(name="Set status", value="status"),
+            app_commands.Choice(name="Delete", value="delete")
+        ],
+        new_status=[app_commands.Choice(name=status.value, value=status.value) for status in TaskStatus],
+        status=[app_commands.Choice(name=status.value, value=status.value) for status in TaskStatus]
+    )
+    @app_commands.checks.has_permissions(administrator=True)
+    async def bulk(
+        self,
+        interaction: discord.Interaction,
+        action: app_commands.Choice[str],
+        new_status: Optional[app_commands.Choice[str]] = None,
+        status: Optional[app_commands.Choice[str]] = None,
+        assignee: Optional[discord.Member] = None,
+        due_from: Optional[str] = None,
+        due_to: Optional[str] = None
+    ):
+        try:
+            if action.value == "status" and new_status is None:
+                await interaction.response.send_message(
+                    "❌ Pick the `new_status` to set.",
+                    ephemeral=True
+                )
+                return
+            
+            task_filter = TaskFilter(
+                status=status.value if status else None,
+                assignee=assignee.id if assignee else None,
+                assignee_roles=tuple(role.id for role in assignee.roles) if assignee else (),
+                due_from=validate_date(due_from) if due_from else None,
+                # Due dates are days, so the last day is included
+                due_to=validate_date(due_to) + timedelta(days=1) if due_to else None
+            )
+            if task_filter.is_empty:
+                await interaction.response.send_message(
+                    "❌ Filter by status, assignee or due date; /bulk never applies to every task at once.",
+                    ephemeral=True
+                )
+                return
+            
+            # Dry run: show what would change and let the admin confirm
+            tasks = self.bot.task_manager.find_tasks(interaction.guild, task_filter)
+            if not tasks:
+                await interaction.response.send_message(
+                    "📝 No tasks match this filter, nothing to do.",
+                    ephemeral=True
+                )
+                return
+            
+            target = TaskStatus(new_status.value) if action.value == "status" else None
+            if target is None:
+                summary = f"**{len(tasks)}** task(s) would be deleted, along with their threads."
+            else:
+                summary = f"**{len(tasks)}** task(s) would be moved to {STATUS_EMOJIS[target]} {target.value}."
+            embed = discord.Embed(
+                title="🧮 Bulk Preview",
+                description=summary,
+                color=discord.Color.orange()
+            )
+            
+            preview = "\n".join(f"#{task.id} • {task.title[:60]}" for task in tasks[:10])
+            if len(tasks) > 10:
+                preview += f"\n…and {len(tasks) - 10} more"
+            embed.add_field(name="Matching Tasks", value=preview, inline=False)
+            
+            view = BulkConfirmView(self.bot.task_manager, interaction.user.id, task_filter, target)
+            await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+            
+        except TaskError as e:
+            await interaction.response.send_message(f"❌ {str(e)}", ephemeral=True)
+        except Exception as e:
+            await interaction.response.send_message(
+                "❌ An error occurred while preparing the bulk operation.",
+                ephemeral=True
+            )
+
+    @app_commands.command(
+        name="stats",
+        description="Show board refresh and storage statistics (Admin only)"
+    )
+    @app_commands.checks.has_permissions(administrator=True)
+    async def stats(self, interaction: discord.Interaction):
+        refresh = self.bot.refresh_scheduler.metrics
+        embed = discord.Embed(
+            title="📈 Bot Statistics",
+            color=discord.Color.blue()
+        )
+        embed.add_field(
+            name="🔄 Board Refreshes",
+            value=(
+                f"Requested: {refresh['requested']}\n"
+                f"Coalesced: {refresh['coalesced']}\n"
+                f"Executed: {refresh['executed']}\n"
+                f"Failed: {refresh['failed']}\n"
+                f"Pending: {self.bot.refresh_scheduler.pending}"
+            ),
+            inline=True
+        )
+        
+        events = self.bot.meeting_manager.scheduler.metrics
+        embed.add_field(
+            name="⏰ Meeting Events",
+            value=(
+                f"Dispatched: {events['dispatched']}\n"
+                f"Expired: {events['expired']}\n"
+                f"Failed: {events['failed']}\n"
+                f"Queued: {self.bot.meeting_manager.scheduler.pending}"
+            ),
+            inline=True
+        )
+        
+        changes = self.bot.events.metrics
+        embed.add_field(
+            name="📣 Store Events",
+            value=(
+                f"Published: {changes['published']}\n"
+                f"Delivered: {changes['delivered']}\n"
+                f"Failed: {changes['failed']}\n"
+                f"Pending: {self.bot.events.pending}"
+            ),
+            inline=True
+        )
+        
+        shards = (self.bot.task_stores, self.bot.meeting_stores)
+        embed.add_field(
+            name="🗄️ Guild Stores",
+            value=(
+                f"Task stores loaded: {self.bot.task_stores.loaded}\n"
+                f"Meeting stores loaded: {self.bot.meeting_stores.loaded}\n"
+                f"Loads: {sum(store.metrics['loads'] for store in shards)}\n"
+                f"Evictions: {sum(store.metrics['evictions'] for store in shards)}"
+            ),
+            inline=True
+        )
+        
+        deliveries = self.bot.notifications.totals
+        embed.add_field(
+            name="✉️ DM Notifications",
+            value=(
+                f"Sent: {deliveries['sent']}\n"
+                f"DMs closed: {deliveries['forbidden']}\n"
+                f"Unknown users: {deliveries['not_found']}\n"
+                f"Failed: {deliveries['failed']}\n"
+                f"Running batches: {self.bot.notifications.active_batches}"
+            ),
+            inline=True
+        )
+        
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
     @app_commands.command(
         name="help",
         description="Show help message with available commands"
@@ -668,13 +895,16 @@ class TaskCommands(commands.Cog):
         commands_info = {
             "/setup": "Create a dedicated channel for task tracking (Admin only)",
             "/create": "Create a new task with title, description, and optional due date",
-            "/assign": "Assign users to a task using their @mentions",
+            "/assign": "Assign users, roles or @everyone to a task using their @mentions",
             "/update": "Update task status using buttons",
             "/thread": "Create a discussion thread for a task",
             "/delete_thread": "Delete a task's discussion thread (thread creator only)",
             "/delete": "Delete a task",
+            "/bulk": "Change the status of or delete every task matching a filter, after a preview (Admin only)",
             "/info": "Get detailed information about a task",
             "/list": "List all tasks assigned to you",
+            "/search": "Find tasks and meetings by the words in their title or description",
+            "/stats": "Show board refresh and storage statistics (Admin only)",
             "/help": "Show this help message"
         }
         
@@ -737,7 +967,7 @@ class TaskCommands(commands.Cog):
         description="Meeting description",
         start_time="Start time (format: DD-MM-YYYY HH:MM)",
         duration="Duration in minutes",
-        participants="Meeting participants (mention them)",
+        participants="Meeting participants, users or roles (mention them)",
         voice_channel="Voice channel for the meeting (optional)"
     )
     async def create_meeting(
@@ -754,23 +984,19 @@ class TaskCommands(commands.Cog):
             # Parse start time
             start_dt = datetime.strptime(start_time, "%d-%m-%Y %H:%M")
             start_dt = self.bot.meeting_manager.belgian_tz.localize(start_dt)
-            
-            # Parse participants
-            participant_ids = []
-            mentions = participants.split()
-            
-            for mention in mentions:
-                stripped_mention = mention.strip('<@!>')
-                
-                if mention in ['@everyone', '@here']:
-                    participant_ids = [m.id for m in interaction.guild.members if not m.bot]
-                    break
-                    
-                if stripped_mention.isdigit():
-                    user_id = int(stripped_mention)
-                    member = interaction.guild.get_member(user_id)
-                    if member and not member.bot:
-                        participant_ids.append(user_id)
+        except ValueError as e:
+            await interaction.response.send_message(
+                f"❌ Invalid date/time format. Please use DD-MM-YYYY HH:MM",
+                ephemeral=True
+            )
+            return
+
+        # Resolving mentions may query the gateway, so answer the interaction first
+        await interaction.response.defer(thinking=True)
+        try:
+            # Parse participants, @everyone and roles are stored as single entries
+            mentions = await parse_mentions(interaction.guild, participants)
+            participant_ids = mentions.targets
             
             # Create meeting
             meeting = Meeting(
@@ -785,8 +1011,8 @@ class TaskCommands(commands.Cog):
                 rsvp_status={}  # Initialize empty RSVP status
             )
             
-            # Save meeting
-            self.bot.meeting_store.add_meeting(meeting)
+            # Save meeting and schedule its reminders
+            self.bot.meeting_manager.add_meeting(interaction.guild.id, meeting)
             
             # Create response embed
             embed = discord.Embed(
@@ -814,7 +1040,10 @@ class TaskCommands(commands.Cog):
             if participant_ids:
                 embed.add_field(
                     name="👥 Participants",
-                    value=", ".join([f"<@{uid}>" for uid in participant_ids]),
+                    value=join_truncated(
+                        (target_mention(target, interaction.guild.id) for target in participant_ids),
+                        MAX_FIELD_VALUE
+                    ),
                     inline=False
                 )
             else:
@@ -823,28 +1052,17 @@ class TaskCommands(commands.Cog):
                     value="@everyone",
                     inline=False
                 )
-            
-            # First send the response to the interaction
-            await interaction.response.send_message(embed=embed)
-            
-            # Then update the board
-            try:
-                await self.bot.meeting_manager.update_board(interaction.guild)
-            except Exception as e:
-                print(f"Error updating board: {e}")
-                # Send a follow-up message about the board update error
-                await interaction.followup.send(
-                    "Meeting was created, but there was an error updating the board. An admin may need to check the permissions.",
-                    ephemeral=True
+            if mentions.skipped:
+                embed.add_field(
+                    name="⚠️ Not Found",
+                    value=join_truncated(mentions.skipped, MAX_FIELD_VALUE),
+                    inline=False
                 )
+            
+            await interaction.followup.send(embed=embed)
                 
-        except ValueError as e:
-            await interaction.response.send_message(
-                f"❌ Invalid date/time format. Please use DD-MM-YYYY HH:MM",
-                ephemeral=True
-            )
         except Exception as e:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 f"❌ An error occurred: {str(e)}",
                 ephemeral=True
             )
\ No newline at end of file
@@ -6,3 +6,48 @@ load_dotenv()
 DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
 TASKS_FILE = "tasks_data.json"
 MEETINGS_FILE = "meetings_data.json"
+
+# "json" rewrites the data files on every change, "journal" appends changes to a
+# log next to them and folds it back into the JSON file in the background,
+# "sqlite" keeps everything in DATABASE_FILE with indexed queries
+STORAGE_MODE = os.getenv("STORAGE_MODE", "json")
+JOURNAL_COMPACT_THRESHOLD = int(os.getenv("JOURNAL_COMPACT_THRESHOLD", "1000"))
+# Maximum number of seconds a change to the JSON/journal stores waits before it is written
+STORE_FLUSH_DELAY = float(os.getenv("STORE_FLUSH_DELAY", "1.0"))
+# "binary" writes the JSON/journal snapshots in a compact format (*.snap) that loads
+# much faster on startup; "json" keeps them as plain JSON files
+SNAPSHOT_FORMAT = os.getenv("SNAPSHOT_FORMAT", "json")
+DATABASE_FILE = os.getenv("DATABASE_FILE", "nibblix_data.db")
+# Every guild keeps its own copy of the data files above in GUILD_DATA_DIR/<guild id>/,
+# loaded on first use and closed again after SHARD_IDLE_SECONDS without access
+GUILD_DATA_DIR = os.getenv("GUILD_DATA_DIR", "guilds")
+SHARD_IDLE_SECONDS = float(os.getenv("SHARD_IDLE_SECONDS", "900"))
+
+# Board refresh requests arriving within this many seconds are merged into one rebuild
+BOARD_REFRESH_DELAY = float(os.getenv("BOARD_REFRESH_DELAY", "1.5"))
+
+# Maximum concurrent REST lookups when checking threads the gateway hasn't reported
+THREAD_CHECK_CONCURRENCY = int(os.getenv("THREAD_CHECK_CONCURRENCY", "5"))
+
+# Meeting reminders and attendance checks more than this many minutes overdue
+# (e.g. after downtime) are skipped instead of sent late
+MEETING_EVENT_GRACE_MINUTES = int(os.getenv("MEETING_EVENT_GRACE_MINUTES", "10"))
+
+# Maximum number of DMs sent at the same time by meeting notifications
+NOTIFICATION_CONCURRENCY = int(os.getenv("NOTIFICATION_CONCURRENCY", "5"))
+
+# Maximum concurrent gateway queries for mentioned members missing from the cache
+MEMBER_QUERY_CONCURRENCY = int(os.getenv("MEMBER_QUERY_CONCURRENCY", "2"))
+
+# Completed tasks and ended meetings older than this many days are moved to a
+# per-guild archive file, checked every ARCHIVE_INTERVAL_SECONDS
+ARCHIVE_AFTER_DAYS = float(os.getenv("ARCHIVE_AFTER_DAYS", "30"))
+ARCHIVE_INTERVAL_SECONDS = float(os.getenv("ARCHIVE_INTERVAL_SECONDS", "3600"))
+
+# Every BACKUP_INTERVAL_SECONDS each server's changes are backed up to
+# BACKUP_DIR/<guild id>/: a full export, then incremental ones until a chain has
+# BACKUP_FULL_EVERY files; the newest BACKUP_RETENTION chains are kept
+BACKUP_DIR = os.getenv("BACKUP_DIR", "backups")
+BACKUP_INTERVAL_SECONDS = float(os.getenv("BACKUP_INTERVAL_SECONDS", "21600"))
+BACKUP_FULL_EVERY = int(os.getenv("BACKUP_FULL_EVERY", "7"))
+BACKUP_RETENTION = int(os.getenv("BACKUP_RETENTION", "4"))
@@ -1,3 +1,5 @@
 from .models import Task
 from .exceptions import TaskError, TaskNotFoundError, InvalidTaskDataError, StorageError
-from .persistence import TaskStore
\ No newline at end of file
+from .persistence import TaskStore
+from .sqlite_store import SqliteTaskStore, SqliteMeetingStore
+from .shards import ShardedStore
\ No newline at end of file
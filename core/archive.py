@@ -0,0 +1,195 @@
+import json
+import mmap
+import os
+import struct
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+from core.exceptions import StorageError
+
+class Archive:
+    """Append-only cold storage for records that left the hot store.
+
+    Records are appended to ``path`` as one compact JSON line each, and
+    ``path + ".idx"`` gets a fixed-width ``(id, offset, length)`` entry per
+    line. Only that index is kept in memory; record bodies are read on
+    demand through a memory map, so looking up one old record never loads
+    the whole history. The newest entry wins when an ID is archived twice.
+
+    Stores move records out with ``stage``, which only keeps them in memory
+    (lookups already see them), and their writer thread makes them durable
+    with ``write_staged`` before it persists the deletions.
+    """
+    _ENTRY = struct.Struct("<qqI")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.index_path = f"{path}.idx"
+        self._offsets: Dict[int, Tuple[int, int]] = {}
+        self._mmap: Optional[mmap.mmap] = None
+        self._file = None
+        self._size = 0
+        # Records staged for the next write_staged, by ID
+        self._staged: Dict[int, dict] = {}
+        self._staged_lock = threading.Lock()
+        try:
+            self._load_index()
+        except OSError as e:
+            raise StorageError(f"Failed to open archive {path}: {str(e)}")
+
+    def _load_index(self) -> None:
+        indexed_end = 0
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'rb') as f:
+                data = f.read()
+            # Ignore a torn trailing entry
+            usable = len(data) - len(data) % self._ENTRY.size
+            for record_id, offset, length in self._ENTRY.iter_unpack(data[:usable]):
+                self._offsets[record_id] = (offset, length)
+                indexed_end = max(indexed_end, offset + length)
+            if usable != len(data):
+                with open(self.index_path, 'r+b') as f:
+                    f.truncate(usable)
+
+        self._size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        if self._size > indexed_end:
+            self._recover_tail(indexed_end)
+
+    def _recover_tail(self, start: int) -> None:
+        """Index lines that were appended but not indexed before a crash"""
+        entries = []
+        offset = start
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    record_id = json.loads(line)['id']
+                except (ValueError, KeyError):
+                    break
+                entries.append((record_id, offset, len(line)))
+                offset += len(line)
+
+        if offset < self._size:
+            # Drop a torn trailing line so later appends start on a clean line
+            with open(self.path, 'r+b') as f:
+                f.truncate(offset)
+            self._size = offset
+        self._write_index(entries)
+
+    def _write_index(self, entries: List[Tuple[int, int, int]]) -> None:
+        if not entries:
+            return
+        with open(self.index_path, 'ab') as f:
+            f.write(b''.join(self._ENTRY.pack(*entry) for entry in entries))
+            f.flush()
+            os.fsync(f.fileno())
+        for record_id, offset, length in entries:
+            self._offsets[record_id] = (offset, length)
+
+    def append(self, records: List[dict]) -> None:
+        """Durably append records (``to_dict`` output) to the archive"""
+        if not records:
+            return
+        try:
+            if self._file is None:
+                self._file = open(self.path, 'ab')
+            entries = []
+            lines = []
+            offset = self._size
+            for record in records:
+                line = json.dumps(record, separators=(',', ':')).encode('utf-8') + b'\n'
+                entries.append((record['id'], offset, len(line)))
+                lines.append(line)
+                offset += len(line)
+            self._file.write(b''.join(lines))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._size = offset
+            # The data is on disk before the index points at it
+            self._write_index(entries)
+        except OSError as e:
+            raise StorageError(f"Failed to append to archive {self.path}: {str(e)}")
+
+    def stage(self, records: List[dict]) -> None:
+        """Archive records (``to_dict`` output) in memory until ``write_staged``"""
+        with self._staged_lock:
+            for record in records:
+                self._staged[record['id']] = record
+
+    def write_staged(self) -> None:
+        """Durably append the staged records, called from the store's writer thread"""
+        # Held throughout, so a clear or replace can't land between the append and the reset
+        with self._staged_lock:
+            if self._staged:
+                self.append(list(self._staged.values()))
+                self._staged = {}
+
+    def get(self, record_id: int) -> Optional[dict]:
+        """Read one archived record, or None if it was never archived"""
+        staged = self._staged.get(record_id)
+        if staged is not None:
+            # A copy, like a fresh read: callers such as from_dict change it in place
+            return dict(staged)
+        location = self._offsets.get(record_id)
+        if location is None:
+            return None
+        offset, length = location
+        if self._mmap is None or offset + length > len(self._mmap):
+            self._remap()
+        return json.loads(self._mmap[offset:offset + length])
+
+    def _remap(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __contains__(self, record_id: object) -> bool:
+        return record_id in self._offsets or record_id in self._staged
+
+    def __len__(self) -> int:
+        return len(self._offsets.keys() | self._staged.keys())
+
+    def ids(self) -> Iterator[int]:
+        return iter(list(self._offsets.keys() | self._staged.keys()))
+
+    def records(self) -> Iterator[dict]:
+        """Read every archived record, one at a time"""
+        for record_id in list(self.ids()):
+            record = self.get(record_id)
+            if record is not None:
+                yield record
+
+    def replace_with(self, staged: 'Archive') -> None:
+        """Take over the files and index of another archive, e.g. a staged import"""
+        staged.close()
+        self.close()
+        with self._staged_lock:
+            self._staged = {}
+        for source, target in ((staged.path, self.path), (staged.index_path, self.index_path)):
+            if os.path.exists(source):
+                os.replace(source, target)
+            elif os.path.exists(target):
+                os.remove(target)
+        self._offsets = staged._offsets
+        self._size = staged._size
+
+    def clear(self) -> None:
+        """Drop every archived record"""
+        self.close()
+        with self._staged_lock:
+            self._staged = {}
+        for path in (self.path, self.index_path):
+            if os.path.exists(path):
+                os.remove(path)
+        self._offsets = {}
+        self._size = 0
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,175 @@
+import asyncio
+import inspect
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Type
+
+@dataclass(frozen=True)
+class StoreEvent:
+    """A change a store made, published once it succeeded"""
+    guild_id: Optional[int]
+
+@dataclass(frozen=True)
+class RecordCreated(StoreEvent):
+    record: Any
+
+@dataclass(frozen=True)
+class RecordUpdated(StoreEvent):
+    record: Any
+    # Names of the fields the update set
+    changed: FrozenSet[str]
+
+@dataclass(frozen=True)
+class RecordDeleted(StoreEvent):
+    record: Any
+    # Moved to the archive rather than deleted
+    archived: bool = False
+
+@dataclass(frozen=True)
+class ChannelChanged(StoreEvent):
+    channel_id: Optional[int]
+
+@dataclass(frozen=True)
+class StoreReplaced(StoreEvent):
+    """Every record may have changed, e.g. after an import or a reset"""
+
+@dataclass(frozen=True)
+class StoreUnloaded(StoreEvent):
+    """The store was closed, e.g. after idling; what was derived from it can go too"""
+
+class TaskEvent:
+    """Marker base of every task store event"""
+
+class MeetingEvent:
+    """Marker base of every meeting store event"""
+
+@dataclass(frozen=True)
+class TaskCreated(RecordCreated, TaskEvent):
+    pass
+
+@dataclass(frozen=True)
+class TaskUpdated(RecordUpdated, TaskEvent):
+    pass
+
+@dataclass(frozen=True)
+class TaskDeleted(RecordDeleted, TaskEvent):
+    pass
+
+@dataclass(frozen=True)
+class TaskChannelChanged(ChannelChanged, TaskEvent):
+    pass
+
+@dataclass(frozen=True)
+class TasksReplaced(StoreReplaced, TaskEvent):
+    pass
+
+@dataclass(frozen=True)
+class TasksUnloaded(StoreUnloaded, TaskEvent):
+    pass
+
+@dataclass(frozen=True)
+class MeetingCreated(RecordCreated, MeetingEvent):
+    pass
+
+@dataclass(frozen=True)
+class MeetingUpdated(RecordUpdated, MeetingEvent):
+    pass
+
+@dataclass(frozen=True)
+class RSVPChanged(MeetingUpdated):
+    user_id: int
+    response: str
+
+@dataclass(frozen=True)
+class MeetingDeleted(RecordDeleted, MeetingEvent):
+    pass
+
+@dataclass(frozen=True)
+class MeetingChannelChanged(ChannelChanged, MeetingEvent):
+    pass
+
+@dataclass(frozen=True)
+class MeetingsReplaced(StoreReplaced, MeetingEvent):
+    pass
+
+@dataclass(frozen=True)
+class MeetingsUnloaded(StoreUnloaded, MeetingEvent):
+    pass
+
+class EventBus:
+    """In-process publish/subscribe for store changes.
+
+    ``publish`` only queues the event, so a store never waits on its
+    subscribers. ``run`` delivers queued events in order to every handler
+    subscribed to the event's class or one of its bases; handlers may be
+    plain functions or coroutines, and a failing handler doesn't keep the
+    others from seeing the event.
+    """
+
+    def __init__(self):
+        self.metrics: Dict[str, int] = {'published': 0, 'delivered': 0, 'failed': 0}
+        self._handlers: Dict[type, List[Callable[[Any], Any]]] = {}
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    def subscribe(self, event_type: Type, handler: Callable[[Any], Any]) -> None:
+        """Call ``handler`` with every event that is an instance of ``event_type``"""
+        self._handlers.setdefault(event_type, []).append(handler)
+
+    def publish(self, event: StoreEvent) -> None:
+        """Queue an event for delivery without waiting for it"""
+        self.metrics['published'] += 1
+        self._queue.put_nowait(event)
+
+    async def run(self) -> None:
+        """Deliver queued events, forever"""
+        while True:
+            event = await self._queue.get()
+            try:
+                await self.deliver(event)
+            finally:
+                self._queue.task_done()
+
+    async def deliver(self, event: StoreEvent) -> None:
+        """Hand one event to its subscribers right away"""
+        for event_type in type(event).__mro__:
+            for handler in self._handlers.get(event_type, ()):
+                try:
+                    result = handler(event)
+                    if inspect.isawaitable(result):
+                        await result
+                    self.metrics['delivered'] += 1
+                except Exception as e:
+                    self.metrics['failed'] += 1
+                    print(f"Error handling {type(event).__name__}: {e}")
+
+    async def drain(self) -> None:
+        """Wait until every event published so far has been delivered"""
+        await self._queue.join()
+
+    @property
+    def pending(self) -> int:
+        """Number of events waiting for delivery"""
+        return self._queue.qsize()
+
+class EventSource:
+    """Mixin letting a store publish its changes to an ``EventBus``.
+
+    Subclasses name the event classes they publish; nothing is published
+    until ``attach_events`` gave the store a bus.
+    """
+    created_event = RecordCreated
+    updated_event = RecordUpdated
+    deleted_event = RecordDeleted
+    channel_event = ChannelChanged
+    replaced_event = StoreReplaced
+    unloaded_event = StoreUnloaded
+    events: Optional[EventBus] = None
+    guild_id: Optional[int] = None
+
+    def attach_events(self, bus: EventBus, guild_id: int) -> None:
+        """Publish this store's changes, tagged with ``guild_id``, to ``bus``"""
+        self.events = bus
+        self.guild_id = guild_id
+
+    def _publish(self, event_type: Type[StoreEvent], *args, **kwargs) -> None:
+        if self.events is not None:
+            self.events.publish(event_type(self.guild_id, *args, **kwargs))
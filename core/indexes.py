@@ -0,0 +1,97 @@
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from core.models import Task, TaskFilter
+
+class TaskIndex:
+    """Incremental secondary indexes over the tasks held by a TaskStore.
+
+    The store calls ``remove`` before it changes a task and ``add`` after,
+    so lookups by status, assignee or due date never scan every task.
+    """
+
+    def __init__(self):
+        self.by_status: Dict[str, Set[int]] = {}
+        self.by_user: Dict[int, Set[int]] = {}
+        # (due_date, task_id) pairs kept sorted for range queries
+        self.by_due: List[Tuple[datetime, int]] = []
+
+    def rebuild(self, tasks: Iterable[Task]) -> None:
+        """Drop every entry and index ``tasks`` from scratch"""
+        self.by_status = {}
+        self.by_user = {}
+        self.by_due = []
+        for task in tasks:
+            self.by_status.setdefault(task.status, set()).add(task.id)
+            for user_id in task.assigned_users:
+                self.by_user.setdefault(user_id, set()).add(task.id)
+            if task.due_date:
+                self.by_due.append((task.due_date, task.id))
+        self.by_due.sort()
+
+    def add(self, task: Task) -> None:
+        self.by_status.setdefault(task.status, set()).add(task.id)
+        for user_id in task.assigned_users:
+            self.by_user.setdefault(user_id, set()).add(task.id)
+        if task.due_date:
+            insort(self.by_due, (task.due_date, task.id))
+
+    def remove(self, task: Task) -> None:
+        self._discard(self.by_status, task.status, task.id)
+        for user_id in task.assigned_users:
+            self._discard(self.by_user, user_id, task.id)
+        if task.due_date:
+            position = bisect_left(self.by_due, (task.due_date, task.id))
+            if position < len(self.by_due) and self.by_due[position] == (task.due_date, task.id):
+                del self.by_due[position]
+
+    @staticmethod
+    def _discard(index: dict, key, task_id: int) -> None:
+        ids = index.get(key)
+        if ids is None:
+            return
+        ids.discard(task_id)
+        if not ids:
+            del index[key]
+
+    def ids_by_status(self, status: str) -> List[int]:
+        """Task IDs with the given status, ordered by ID"""
+        return sorted(self.by_status.get(status, ()))
+
+    def ids_by_user(self, user_id: int) -> List[int]:
+        """Task IDs assigned to a user, ordered by ID"""
+        return sorted(self.by_user.get(user_id, ()))
+
+    def ids_by_users(self, user_ids: Iterable[int]) -> List[int]:
+        """Task IDs assigned to any of the users or role targets, ordered by ID"""
+        return sorted(set().union(*(self.by_user.get(user_id, ()) for user_id in user_ids)))
+
+    def ids_due_between(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[int]:
+        """Task IDs due within [start, end), ordered by due date"""
+        low = 0 if start is None else bisect_left(self.by_due, (start, -1))
+        high = len(self.by_due) if end is None else bisect_left(self.by_due, (end, -1))
+        return [task_id for _, task_id in self.by_due[low:high]]
+
+    def ids_matching(self, task_filter: TaskFilter) -> Optional[Set[int]]:
+        """Task IDs meeting every criterion of a filter, or None if it has none"""
+        candidates = []
+        if task_filter.status is not None:
+            candidates.append(self.by_status.get(task_filter.status, set()))
+        if task_filter.assignee is not None:
+            candidates.append(set().union(
+                *(self.by_user.get(target, ()) for target in task_filter.assignee_targets)
+            ))
+        if task_filter.has_due_range:
+            candidates.append(set(self.ids_due_between(task_filter.due_from, task_filter.due_to)))
+        if not candidates:
+            return None
+        # Intersect starting from the smallest set
+        candidates.sort(key=len)
+        return set(candidates[0]).intersection(*candidates[1:])
+
+    def count_by_status(self, status: str) -> int:
+        return len(self.by_status.get(status, ()))
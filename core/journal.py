@@ -0,0 +1,82 @@
+import json
+import os
+from typing import Any, Callable, Iterator, List, Optional
+from core.exceptions import StorageError
+from core.writer import atomic_write_json
+
+class Journal:
+    """Append-only mutation log that sits next to a JSON snapshot file.
+
+    Every record is one compact JSON line. Records are idempotent (a ``put``
+    always carries the full record) so replaying a log on top of a snapshot
+    that already contains some of its entries converges to the same state.
+    The journal is only touched from the store's writer thread.
+    """
+
+    def __init__(
+        self,
+        snapshot_path: str,
+        compact_threshold: int = 1000,
+        write_snapshot: Callable[[str, Any], None] = atomic_write_json,
+        log_path: Optional[str] = None
+    ):
+        self.snapshot_path = snapshot_path
+        self.write_snapshot = write_snapshot
+        self.log_path = log_path or f"{snapshot_path}.log"
+        self.compact_threshold = compact_threshold
+        self.pending_records: int = 0
+        self._file = None
+
+    def replay(self) -> Iterator[dict]:
+        """Yield the records of the log, oldest first"""
+        if not os.path.exists(self.log_path):
+            return
+        with open(self.log_path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn trailing line from a crash mid-append, nothing after it is valid
+                    break
+                self.pending_records += 1
+                yield record
+
+    def append(self, records: List[dict]) -> None:
+        """Append a batch of mutation records to the log"""
+        if not records:
+            return
+        try:
+            if self._file is None:
+                self._file = open(self.log_path, 'a')
+            self._file.write(''.join(
+                json.dumps(record, separators=(',', ':')) + '\n'
+                for record in records
+            ))
+            self._file.flush()
+            self.pending_records += len(records)
+        except OSError as e:
+            raise StorageError(f"Failed to append to journal: {str(e)}")
+
+    def compact(self, snapshot: Any) -> None:
+        """Fold the log into a new snapshot.
+
+        ``snapshot`` must include every record already appended, so the log
+        can be dropped once the snapshot is safely renamed into place.
+        """
+        try:
+            self.write_snapshot(self.snapshot_path, snapshot)
+            self.close()
+            if os.path.exists(self.log_path):
+                os.remove(self.log_path)
+            self.pending_records = 0
+        except OSError as e:
+            raise StorageError(f"Failed to write snapshot {self.snapshot_path}: {str(e)}")
+
+    def close(self) -> None:
+        """Close the log file"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
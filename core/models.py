@@ -1,8 +1,119 @@
-from dataclasses import dataclass, asdict
-from typing import List, Optional, Dict
+from array import array
+from collections.abc import MutableMapping
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import AbstractSet, Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
 from datetime import datetime
 
-@dataclass
+def id_array(values: Optional[Iterable[int]] = None) -> array:
+    """Pack user IDs into a machine-int array (8 bytes each instead of a boxed int)"""
+    if isinstance(values, array) and values.typecode == 'q':
+        return values
+    return array('q', values or ())
+
+def role_target(role_id: int) -> int:
+    """Assignee or participant entry standing for every member of a role.
+
+    Roles are stored negated next to the user IDs, so symbolic targets
+    cost one entry whatever the role's size; @everyone is the role whose
+    ID is the guild ID.
+    """
+    return -role_id
+
+def member_targets(user_id: int, role_ids: Iterable[int] = ()) -> List[int]:
+    """Every entry that includes a member: their own ID and their roles'"""
+    return [user_id, *(role_target(role_id) for role_id in role_ids)]
+
+def target_mention(target: int, guild_id: Optional[int] = None) -> str:
+    """Discord mention of an assignee or participant entry"""
+    if target >= 0:
+        return f"<@{target}>"
+    if -target == guild_id:
+        return "@everyone"
+    return f"<@&{-target}>"
+
+class RSVPResponse(IntEnum):
+    YES = 1
+    MAYBE = 2
+    NO = 3
+
+    @property
+    def label(self) -> str:
+        return self.name.lower()
+
+    @classmethod
+    def parse(cls, response: Union[str, 'RSVPResponse']) -> 'RSVPResponse':
+        if isinstance(response, cls):
+            return response
+        try:
+            return cls[response.upper()]
+        except (KeyError, AttributeError):
+            raise ValueError(f"Invalid RSVP response: {response}")
+
+class RSVPStatus(MutableMapping):
+    """RSVP responses per user, with the users of every response kept as a set.
+
+    Behaves like the ``{user_id: 'yes' | 'maybe' | 'no'}`` dict it replaces.
+    A dict maps each user to their response code and one set per response
+    holds its users, so lookups, changes, the tally of a response and its
+    members are all O(1) without a pass over every entry. Snapshots pack
+    the entries into arrays, see ``core.snapshot``.
+    """
+    __slots__ = ('_responses', '_members')
+
+    def __init__(self, responses: Optional[Union[dict, 'RSVPStatus']] = None):
+        self._responses: Dict[int, RSVPResponse] = {}
+        # Indexed by RSVPResponse code - 1
+        self._members: Tuple[Set[int], ...] = tuple(set() for _ in RSVPResponse)
+        for user_id, response in (responses or {}).items():
+            self[user_id] = response
+
+    def __getitem__(self, user_id: int) -> str:
+        return self._responses[user_id].label
+
+    def __setitem__(self, user_id: int, response: Union[str, RSVPResponse]) -> None:
+        code = RSVPResponse.parse(response)
+        user_id = int(user_id)
+        previous = self._responses.get(user_id)
+        if previous is code:
+            return
+        if previous is not None:
+            self._members[previous - 1].discard(user_id)
+        self._responses[user_id] = code
+        self._members[code - 1].add(user_id)
+
+    def __delitem__(self, user_id: int) -> None:
+        response = self._responses.pop(user_id)
+        self._members[response - 1].discard(user_id)
+
+    def __contains__(self, user_id: object) -> bool:
+        return user_id in self._responses
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._responses)
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    def __repr__(self) -> str:
+        return f"RSVPStatus({self.to_dict()!r})"
+
+    def items(self) -> Iterator[Tuple[int, str]]:
+        for user_id, response in self._responses.items():
+            yield user_id, response.label
+
+    def members(self, response: Union[str, RSVPResponse]) -> AbstractSet[int]:
+        """User IDs that gave ``response``, a live view not to be modified"""
+        return self._members[RSVPResponse.parse(response) - 1]
+
+    def count(self, response: Union[str, RSVPResponse]) -> int:
+        """Number of users that gave ``response``"""
+        return len(self.members(response))
+
+    def to_dict(self) -> Dict[int, str]:
+        return dict(self.items())
+
+@dataclass(slots=True)
 class Meeting:
     id: int
     title: str
@@ -15,22 +126,54 @@ class Meeting:
     calendar_event_id: Optional[str] = None
     reminder_sent: bool = False
     rsvp_status: Dict[int, str] = None
-    
-    def __post_init__(self):
-        if self.rsvp_status is None:
-            self.rsvp_status = {}
-    
+    attendance_checked: bool = False
+    # Change sequence number of the store's last write to this meeting
+    seq: int = 0
+    # Set of the participants for membership checks, kept in step with them
+    _invited: FrozenSet[int] = field(init=False, repr=False, compare=False)
+
+    def __setattr__(self, name, value):
+        # Keep the compact containers whatever callers assign
+        if name == 'participants':
+            value = id_array(value)
+            object.__setattr__(self, '_invited', frozenset(value))
+        elif name == 'rsvp_status' and not isinstance(value, RSVPStatus):
+            value = RSVPStatus(value)
+        object.__setattr__(self, name, value)
+
+    def is_participant(self, user_id: int, role_ids: Iterable[int] = ()) -> bool:
+        """Whether a member is invited, directly or through one of their roles"""
+        return not self._invited.isdisjoint(member_targets(user_id, role_ids))
+
+    def awaiting_response(self) -> List[int]:
+        """Participants named directly that haven't responded yet"""
+        return [user_id for user_id in self.participants if user_id >= 0 and user_id not in self.rsvp_status]
+
     def to_dict(self) -> dict:
-        data = asdict(self)
-        data['start_time'] = self.start_time.isoformat()
-        return data
-    
+        return {
+            'id': self.id,
+            'title': self.title,
+            'description': self.description,
+            'start_time': self.start_time.isoformat(),
+            'duration': self.duration,
+            'created_by': self.created_by,
+            'participants': self.participants.tolist(),
+            'channel_id': self.channel_id,
+            'calendar_event_id': self.calendar_event_id,
+            'reminder_sent': self.reminder_sent,
+            'rsvp_status': self.rsvp_status.to_dict(),
+            'attendance_checked': self.attendance_checked,
+            'seq': self.seq
+        }
+
     @classmethod
     def from_dict(cls, data: dict) -> 'Meeting':
         data['start_time'] = datetime.fromisoformat(data['start_time'])
+        # JSON object keys are strings, user IDs are ints everywhere else
+        data['rsvp_status'] = {int(k): v for k, v in (data.get('rsvp_status') or {}).items()}
         return cls(**data)
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     id: int
     title: str
@@ -41,22 +184,77 @@ class Task:
     assigned_users: List[int] = None
     thread_id: Optional[int] = None
     thread_creator_id: Optional[int] = None
-    
-    def __post_init__(self):
-        if self.assigned_users is None:
-            self.assigned_users = []
+    completed_at: Optional[datetime] = None
+    # Change sequence number of the store's last write to this task
+    seq: int = 0
+
+    def __setattr__(self, name, value):
+        # Keep the compact container whatever callers assign
+        if name == 'assigned_users':
+            value = id_array(value)
+        object.__setattr__(self, name, value)
 
     def to_dict(self) -> dict:
-        data = asdict(self)
-        data['created_at'] = self.created_at.isoformat()
-        if self.due_date:
-            data['due_date'] = self.due_date.isoformat()
-        return data
-    
+        return {
+            'id': self.id,
+            'title': self.title,
+            'description': self.description,
+            'status': self.status,
+            'created_at': self.created_at.isoformat(),
+            'due_date': self.due_date.isoformat() if self.due_date else None,
+            'assigned_users': self.assigned_users.tolist(),
+            'thread_id': self.thread_id,
+            'thread_creator_id': self.thread_creator_id,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'seq': self.seq
+        }
+
     @classmethod
     def from_dict(cls, data: dict) -> 'Task':
         # Convert ISO format strings back to datetime objects
         data['created_at'] = datetime.fromisoformat(data['created_at'])
         if data.get('due_date'):
             data['due_date'] = datetime.fromisoformat(data['due_date'])
-        return cls(**data)
\ No newline at end of file
+        if data.get('completed_at'):
+            data['completed_at'] = datetime.fromisoformat(data['completed_at'])
+        return cls(**data)
+
+class TaskSummary(NamedTuple):
+    """The fields of a task that search reads, available without building the Task"""
+    id: int
+    title: str
+    description: str
+    assigned_users: List[int]
+    seq: int
+
+class MeetingSummary(NamedTuple):
+    """The fields of a meeting that search reads, available without building the Meeting"""
+    id: int
+    title: str
+    created_by: int
+    participants: List[int]
+    seq: int
+
+@dataclass(frozen=True)
+class TaskFilter:
+    """Criteria selecting the tasks of a bulk operation; unset ones match every task"""
+    status: Optional[str] = None
+    assignee: Optional[int] = None
+    # Roles of the assignee, tasks assigned to one of them (or @everyone) match too
+    assignee_roles: Tuple[int, ...] = ()
+    # Due within [due_from, due_to)
+    due_from: Optional[datetime] = None
+    due_to: Optional[datetime] = None
+
+    @property
+    def has_due_range(self) -> bool:
+        return self.due_from is not None or self.due_to is not None
+
+    @property
+    def assignee_targets(self) -> List[int]:
+        """Assignee entries matching the assignee, see ``member_targets``"""
+        return member_targets(self.assignee, self.assignee_roles) if self.assignee is not None else []
+
+    @property
+    def is_empty(self) -> bool:
+        return self.status is None and self.assignee is None and not self.has_due_range
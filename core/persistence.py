@@ -1,177 +1,743 @@
+import asyncio
 import json
 import os
-from typing import Dict, Optional
-from core.models import Meeting, Task
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from core.models import Meeting, MeetingSummary, Task, TaskFilter, TaskSummary, member_targets
+from core.archive import Archive
+from core.events import (
+    EventSource, MeetingChannelChanged, MeetingCreated, MeetingDeleted, MeetingUpdated,
+    MeetingsReplaced, MeetingsUnloaded, RSVPChanged, TaskChannelChanged, TaskCreated, TaskDeleted,
+    TaskUpdated, TasksReplaced, TasksUnloaded
+)
 from core.exceptions import StorageError, TaskNotFoundError
+from core.indexes import TaskIndex
+from core.journal import Journal
+from core.transfer import BaseStagedImport
+from core.snapshot import CODECS, Snapshot, decode_snapshot, encode_snapshot, freeze_records, record_views
+from core.writer import BackgroundWriter, atomic_write_bytes, atomic_write_json
 
-class MeetingStore:
-    def __init__(self, file_path: str):
+class BaseStore(EventSource):
+    """Shared persistence logic for the task and meeting stores.
+
+    Mutations only update memory and mark the store dirty; a dedicated
+    writer thread persists them within ``flush_delay`` seconds. In ``json``
+    mode it rewrites the whole file, in ``journal`` mode it appends the
+    queued records to a log next to the file and periodically folds them
+    back into it, so the JSON file stays a valid export either way.
+
+    With ``snapshot_format="binary"`` the full snapshots are written in the
+    compact format of ``core.snapshot`` to a ``.snap`` file next to the JSON
+    path instead, and records are only built from it when first accessed.
+
+    Records moved out by ``_archive`` go to an ``.archive`` file next to the
+    JSON path; lookups by ID still find them there, read-only.
+
+    Every write stamps the record with a new change sequence number
+    (``seq``) and deletions and archive moves leave a tombstone, so
+    ``export_records``/``export_removed`` can return only what changed
+    since a given sequence number.
+
+    Once attached to an ``EventBus``, every mutation also publishes a typed
+    change event after it succeeded (see ``core.events``).
+    """
+    record_type = None
+    record_name = "Record"
+    records_key = "records"
+    counter_key = "counter"
+    channel_key = "channel_id"
+    board_key = "board_messages"
+    changes_key = "changes"
+
+    def __init__(
+        self,
+        file_path: str,
+        mode: str = "json",
+        compact_threshold: int = 1000,
+        flush_delay: float = 1.0,
+        snapshot_format: str = "json"
+    ):
+        if mode not in ("json", "journal"):
+            raise StorageError(f"Unknown storage mode: {mode}")
+        if snapshot_format not in ("json", "binary"):
+            raise StorageError(f"Unknown snapshot format: {snapshot_format}")
         self.file_path = file_path
-        self.meetings: Dict[int, Meeting] = {}
-        self.meeting_counter: int = 0
-        self.meeting_channel_id: Optional[int] = None
+        self.binary_path = f"{os.path.splitext(file_path)[0]}.snap"
+        self.snapshot_format = snapshot_format
+        self.snapshot_path = self.binary_path if snapshot_format == "binary" else file_path
+        self.mode = mode
+        self.records: Dict[int, Any] = {}
+        self.counter: int = 0
+        self.channel_id: Optional[int] = None
+        # Ordered board messages as [{'key', 'message_id', 'fingerprint'}]
+        self.board_state: List[dict] = []
+        # Last change sequence number handed out, and the oldest one deltas can start from
+        self.seq = 0
+        self.pruned_seq = 0
+        # Tombstones of deleted or archived records as {id: (seq, archived)}
+        self.removed: Dict[int, Tuple[int, bool]] = {}
+        self.journal = Journal(
+            self.snapshot_path,
+            compact_threshold,
+            self._write_snapshot_file,
+            log_path=f"{file_path}.log"
+        ) if mode == "journal" else None
+        # Guards the in-memory state against the writer thread taking a snapshot
+        self._lock = threading.RLock()
+        self._pending: List[dict] = []
+        self._full_write = False
+        self.archive = Archive(f"{os.path.splitext(file_path)[0]}.archive")
         self._load()
-    
+        self._writer = BackgroundWriter(os.path.basename(file_path), self._write, flush_delay)
+        if self._full_write:
+            self._writer.mark_dirty()
+
     def _load(self) -> None:
-        """Load meetings from storage file"""
+        """Load records from the latest snapshot and replay the journal on top"""
         try:
-            if not os.path.exists(self.file_path):
-                self._save()
+            sources = [path for path in (self.file_path, self.binary_path) if os.path.exists(path)]
+            if sources:
+                # After switching formats the newest snapshot is the one the journal continues
+                source = max(sources, key=os.path.getmtime)
+                if source == self.binary_path:
+                    with open(source, 'rb') as f:
+                        self._apply_snapshot(decode_snapshot(self.record_type, f.read()))
+                else:
+                    with open(source, 'r') as f:
+                        self._apply_data(json.load(f))
+                # Rewrite it in the configured format
+                self._full_write = source != self.snapshot_path
+            elif not self.journal:
+                self._write_snapshot_file(self.snapshot_path, self._snapshot())
                 return
 
-            with open(self.file_path, 'r') as f:
-                data = json.load(f)
-                self.meetings = {
-                    int(k): Meeting.from_dict(v) 
-                    for k, v in data.get('meetings', {}).items()
-                }
-                self.meeting_counter = data.get('meeting_counter', 0)
-                self.meeting_channel_id = data.get('meeting_channel_id')
+            if self.journal:
+                for record in self.journal.replay():
+                    self._apply_record(record)
         except Exception as e:
-            raise StorageError(f"Failed to load meetings: {str(e)}")
+            raise StorageError(f"Failed to load {self.records_key}: {str(e)}")
 
-    def _save(self) -> None:
-        """Save meetings to storage file"""
-        try:
-            data = {
-                'meetings': {
-                    str(k): v.to_dict() 
-                    for k, v in self.meetings.items()
+    def _apply_data(self, data: dict) -> None:
+        self.records = {
+            int(k): self.record_type.from_dict(v)
+            for k, v in data.get(self.records_key, {}).items()
+        }
+        self.counter = data.get(self.counter_key, 0)
+        self.channel_id = data.get(self.channel_key)
+        self.board_state = data.get(self.board_key, [])
+        self._apply_changes(data.get(self.changes_key) or {})
+        self._reindex()
+
+    def _apply_snapshot(self, snapshot: Snapshot) -> None:
+        self.records = snapshot.records
+        self.counter = snapshot.counter
+        self.channel_id = snapshot.channel_id
+        self.board_state = snapshot.board_state
+        self._apply_changes(snapshot.changes)
+        self._reindex()
+
+    def _apply_changes(self, changes: dict) -> None:
+        self.seq = changes.get('seq', 0)
+        self.pruned_seq = changes.get('pruned_seq', 0)
+        self.removed = {
+            int(k): (seq, archived)
+            for k, (seq, archived) in changes.get('removed', {}).items()
+        }
+
+    def _changes(self) -> dict:
+        return {
+            'seq': self.seq,
+            'pruned_seq': self.pruned_seq,
+            'removed': {str(k): list(v) for k, v in self.removed.items()}
+        }
+
+    def _apply_record(self, record: dict) -> None:
+        op = record['op']
+        if op == 'put':
+            if record['id'] in self.records:
+                self._unindex(self.records[record['id']])
+            self.records[record['id']] = self.record_type.from_dict(record['data'])
+            self._index(self.records[record['id']])
+            self.counter = max(self.counter, record['id'])
+            self.removed.pop(record['id'], None)
+            self.seq = max(self.seq, self.records[record['id']].seq)
+        elif op == 'del':
+            if record['id'] in self.records:
+                self._unindex(self.records.pop(record['id']))
+            if 'seq' in record:
+                self.removed[record['id']] = (record['seq'], record.get('archived', False))
+                self.seq = max(self.seq, record['seq'])
+        elif op == 'channel':
+            self.channel_id = record['value']
+            self.board_state = []
+            self.seq = max(self.seq, record.get('seq', 0))
+        elif op == 'board':
+            self.board_state = record['value']
+        elif op == 'prune':
+            self._prune(record['value'])
+
+    def _index(self, record: Any) -> None:
+        """Add a record to the secondary indexes, if the store keeps any"""
+
+    def _unindex(self, record: Any) -> None:
+        """Remove a record from the secondary indexes, if the store keeps any"""
+
+    def _reindex(self) -> None:
+        """Rebuild the secondary indexes from every record, if the store keeps any"""
+
+    def to_dict(self) -> dict:
+        """Serialize the store in the JSON file format"""
+        with self._lock:
+            return {
+                self.records_key: {
+                    str(k): v.to_dict()
+                    for k, v in self.records.items()
                 },
-                'meeting_counter': self.meeting_counter,
-                'meeting_channel_id': self.meeting_channel_id
+                self.counter_key: self.counter,
+                self.channel_key: self.channel_id,
+                self.board_key: self.board_state,
+                self.changes_key: self._changes()
             }
-            with open(self.file_path, 'w') as f:
-                json.dump(data, f, indent=4)
+
+    def _snapshot(self) -> Any:
+        """Serialize the store in the configured snapshot format"""
+        return self._encode(self._freeze())
+
+    def _freeze(self) -> tuple:
+        """Copy the state a snapshot holds, the only part done under the lock"""
+        with self._lock:
+            return (
+                freeze_records(self.record_type, self.records),
+                self.counter,
+                self.channel_id,
+                list(self.board_state),
+                self._changes()
+            )
+
+    def _encode(self, state: tuple) -> Any:
+        """Serialize a ``_freeze`` copy in the configured snapshot format"""
+        rows, counter, channel_id, board_state, changes = state
+        if self.snapshot_format == "binary":
+            return encode_snapshot(self.record_type, rows, counter, channel_id, board_state, changes)
+        build = CODECS[self.record_type].build
+        return {
+            self.records_key: {str(row.id): build(row).to_dict() for row in rows},
+            self.counter_key: counter,
+            self.channel_key: channel_id,
+            self.board_key: board_state,
+            self.changes_key: changes
+        }
+
+    def _write_snapshot_file(self, path: str, snapshot: Any) -> None:
+        if self.snapshot_format == "binary":
+            atomic_write_bytes(path, snapshot)
+        else:
+            atomic_write_json(path, snapshot)
+
+    def _write(self) -> None:
+        """Persist everything marked dirty so far, runs on the writer thread"""
+        with self._lock:
+            records, self._pending = self._pending, []
+            full = (
+                self._full_write
+                or not self.journal
+                or self.journal.pending_records + len(records) >= self.journal.compact_threshold
+            )
+            state = self._freeze() if full else None
+            self._full_write = False
+
+        snapshot = None
+        try:
+            # Encoding a large store takes a while, mutations go on meanwhile
+            if state is not None:
+                snapshot = self._encode(state)
+            # Archived records reach the archive before their deletions are written
+            self.archive.write_staged()
+            if self.journal:
+                self.journal.append(records)
+                if snapshot is not None:
+                    self.journal.compact(snapshot)
+            else:
+                self._write_snapshot_file(self.snapshot_path, snapshot)
         except Exception as e:
-            raise StorageError(f"Failed to save meetings: {str(e)}")
+            with self._lock:
+                self._pending[:0] = records
+                self._full_write = self._full_write or state is not None
+            raise StorageError(f"Failed to save {self.records_key}: {str(e)}")
+
+    def _save(self) -> None:
+        """Schedule a full snapshot of the store"""
+        with self._lock:
+            self._full_write = True
+        self._writer.mark_dirty()
+
+    def _record(self, record: dict) -> None:
+        """Schedule a single mutation to be persisted"""
+        if self.journal:
+            with self._lock:
+                self._pending.append(record)
+        self._writer.mark_dirty()
+
+    async def flush(self) -> None:
+        """Wait until every change made so far has been written to disk"""
+        loop = asyncio.get_running_loop()
+        if not await loop.run_in_executor(None, self._writer.flush):
+            raise StorageError(f"Failed to flush {self.records_key}: {self._writer.last_error}")
+
+    def _next_seq(self) -> int:
+        """Hand out the next change sequence number.
+
+        It is a hybrid clock: strictly increasing within the store, and
+        never behind the wall clock in microseconds, so a single ``since``
+        value taken from both stores of a guild works for either.
+        """
+        self.seq = max(self.seq + 1, time.time_ns() // 1000)
+        return self.seq
+
+    def _put(self, record_id: int) -> None:
+        record = self.records[record_id]
+        record.seq = self._next_seq()
+        self.removed.pop(record_id, None)
+        self._record({'op': 'put', 'id': record_id, 'data': record.to_dict()})
+
+    def _get(self, record_id: int) -> Any:
+        if record_id not in self.records:
+            if record_id in self.archive:
+                raise TaskNotFoundError(f"{self.record_name} {record_id} is archived and can't be changed")
+            raise TaskNotFoundError(f"{self.record_name} {record_id} not found")
+        return self.records[record_id]
+
+    def _get_or_archived(self, record_id: int) -> Any:
+        """Look a record up in memory first, then in the archive"""
+        if record_id in self.records:
+            return self.records[record_id]
+        data = self.archive.get(record_id)
+        if data is None:
+            raise TaskNotFoundError(f"{self.record_name} {record_id} not found")
+        return self.record_type.from_dict(data)
+
+    def is_archived(self, record_id: int) -> bool:
+        """Whether a record only exists in the archive"""
+        return record_id not in self.records and record_id in self.archive
+
+    def _summaries(self) -> List[Any]:
+        # Snapshot rows carry every summary field, records never accessed stay rows
+        with self._lock:
+            return sorted(record_views(self.records), key=lambda record: record.id)
+
+    def _add(self, record: Any) -> None:
+        with self._lock:
+            self.counter += 1
+            record.id = self.counter
+            self.records[record.id] = record
+            self._index(record)
+            self._put(record.id)
+        self._publish(self.created_event, record)
+
+    def _update(self, record_id: int, **kwargs) -> Any:
+        with self._lock:
+            record = self._get(record_id)
+            self._unindex(record)
+            for key, value in kwargs.items():
+                if hasattr(record, key):
+                    setattr(record, key, value)
+            self._index(record)
+
+            self._put(record_id)
+        self._publish(self.updated_event, record, frozenset(kwargs))
+        return record
+
+    def _update_many(self, updates: Dict[int, dict]) -> List[Any]:
+        """Apply several updates at once, all of them or none"""
+        with self._lock:
+            records = [self._get(record_id) for record_id in updates]
+            for record, changes in zip(records, updates.values()):
+                self._unindex(record)
+                for key, value in changes.items():
+                    if hasattr(record, key):
+                        setattr(record, key, value)
+                self._index(record)
+                self._put(record.id)
+        for record, changes in zip(records, updates.values()):
+            self._publish(self.updated_event, record, frozenset(changes))
+        return records
+
+    def _delete(self, record_id: int) -> Any:
+        return self._delete_many([record_id])[0]
+
+    def _delete_many(self, record_ids: List[int]) -> List[Any]:
+        """Delete several records at once, all of them or none"""
+        with self._lock:
+            for record_id in record_ids:
+                self._get(record_id)
+            records = [self.records.pop(record_id) for record_id in record_ids]
+            for record in records:
+                self._unindex(record)
+                seq = self._next_seq()
+                self.removed[record.id] = (seq, False)
+                self._record({'op': 'del', 'id': record.id, 'seq': seq})
+        for record in records:
+            self._publish(self.deleted_event, record)
+        return records
+
+    def _archive(self, record_ids: List[int]) -> List[Any]:
+        """Move records to the archive file and drop them from memory.
+
+        The archive only stages them; the writer thread appends them durably
+        before it writes the deletions, so a crash in between leaves a record
+        in both places rather than none, and archiving it again is harmless.
+        """
+        with self._lock:
+            records = [self.records[record_id] for record_id in record_ids if record_id in self.records]
+            for record in records:
+                record.seq = self._next_seq()
+            self.archive.stage([record.to_dict() for record in records])
+            for record in records:
+                self._unindex(self.records.pop(record.id))
+                self.removed[record.id] = (record.seq, True)
+                self._record({'op': 'del', 'id': record.id, 'seq': record.seq, 'archived': True})
+        for record in records:
+            self._publish(self.deleted_event, record, archived=True)
+        return records
+
+    def set_channel_id(self, channel_id: int) -> None:
+        """Set the board channel ID"""
+        with self._lock:
+            self.channel_id = channel_id
+            self.board_state = []
+            self._record({'op': 'channel', 'value': channel_id, 'seq': self._next_seq()})
+        self._publish(self.channel_event, channel_id)
+
+    def set_board_state(self, board_state: List[dict]) -> None:
+        """Remember which messages currently make up the board"""
+        with self._lock:
+            self.board_state = board_state
+            self._record({'op': 'board', 'value': board_state})
+
+    def import_data(self, data: dict) -> None:
+        """Replace the whole store with data in the JSON file format"""
+        with self._lock:
+            self._apply_data(data)
+            self._save()
+        self._publish(self.replaced_event)
+
+    def export_meta(self) -> dict:
+        """Counter and board settings, keyed as in the JSON file format"""
+        with self._lock:
+            return {
+                self.counter_key: self.counter,
+                self.channel_key: self.channel_id,
+                self.board_key: self.board_state,
+                self.changes_key: {'seq': self.seq}
+            }
+
+    def check_since(self, since: int) -> None:
+        """Make sure every change after ``since`` is still tracked"""
+        if since < self.pruned_seq:
+            raise StorageError(
+                f"Changes to {self.records_key} before {self.pruned_seq} are no longer tracked, "
+                "make a full export instead"
+            )
+
+    def export_records(self, since: Optional[int] = None) -> Iterator[dict]:
+        """Serialize the records one at a time, skipping ones deleted meanwhile.
+
+        With ``since``, only records written after that sequence number.
+        """
+        if since is None:
+            record_ids = list(self.records)
+        else:
+            self.check_since(since)
+            record_ids = [record.id for record in record_views(self.records) if record.seq > since]
+        for record_id in record_ids:
+            with self._lock:
+                record = self.records.get(record_id)
+                data = record.to_dict() if record is not None else None
+            if data is not None:
+                yield data
+
+    def export_removed(self, since: int) -> List[Tuple[int, int, bool]]:
+        """Tombstones written after ``since`` as ``(id, seq, archived)``, oldest first"""
+        self.check_since(since)
+        with self._lock:
+            return sorted(
+                ((record_id, seq, archived) for record_id, (seq, archived) in self.removed.items() if seq > since),
+                key=lambda tombstone: tombstone[1]
+            )
+
+    def _prune(self, upto: int) -> None:
+        self.removed = {k: v for k, v in self.removed.items() if v[0] > upto}
+        self.pruned_seq = max(self.pruned_seq, upto)
+
+    def prune_removed(self, upto: int) -> None:
+        """Forget tombstones up to ``upto``; deltas can't start before it anymore"""
+        with self._lock:
+            self._prune(upto)
+            self._record({'op': 'prune', 'value': upto})
+
+    def stage_import(self) -> 'StagedImport':
+        """Start an import that replaces the store once it is committed"""
+        return StagedImport(self)
+
+    def reset(self) -> None:
+        """Remove every record and reset the ID counter"""
+        with self._lock:
+            self.records = {}
+            self.counter = 0
+            self._reindex()
+            self.archive.clear()
+            # Nothing before the reset can be expressed as a delta
+            self.removed = {}
+            self.pruned_seq = self._next_seq()
+            self._save()
+        self._publish(self.replaced_event)
+
+    def close(self) -> None:
+        """Write pending changes, stop the writer thread and close the journal"""
+        try:
+            self._writer.close()
+        finally:
+            if self.journal:
+                self.journal.close()
+            self.archive.close()
+            self._publish(self.unloaded_event)
+
+class StagedImport(BaseStagedImport):
+    """Stages imported records in a dict that replaces the store's records at once"""
+
+    def __init__(self, store: BaseStore):
+        super().__init__(store)
+        self.records: Dict[int, Any] = {}
+
+    def _stage(self, record: Any) -> None:
+        self.records[record.id] = record
+
+    def _swap(self) -> None:
+        store = self.store
+        with store._lock:
+            store.records = self.records
+            store.counter = self.counter
+            store.channel_id = self.channel_id
+            store.board_state = self.board_state
+            # Deltas taken before the import don't apply to the new records
+            store.seq = max(store.seq, self.seq)
+            store.pruned_seq = store._next_seq()
+            store.removed = {}
+            store._reindex()
+            store._save()
+        store._publish(store.replaced_event)
+
+    def _unstage(self, record_id: int) -> None:
+        self.records.pop(record_id, None)
+
+    def _discard(self) -> None:
+        self.records = {}
+
+class MeetingStore(BaseStore):
+    record_type = Meeting
+    record_name = "Meeting"
+    records_key = "meetings"
+    counter_key = "meeting_counter"
+    channel_key = "meeting_channel_id"
+    board_key = "meeting_board_messages"
+    changes_key = "meeting_changes"
+    created_event = MeetingCreated
+    updated_event = MeetingUpdated
+    deleted_event = MeetingDeleted
+    channel_event = MeetingChannelChanged
+    replaced_event = MeetingsReplaced
+    unloaded_event = MeetingsUnloaded
+
+    @property
+    def meetings(self) -> Dict[int, Meeting]:
+        return self.records
+
+    @property
+    def meeting_counter(self) -> int:
+        return self.counter
+
+    @property
+    def meeting_channel_id(self) -> Optional[int]:
+        return self.channel_id
 
     def add_meeting(self, meeting: Meeting) -> None:
         """Add a new meeting to storage"""
-        self.meeting_counter += 1
-        meeting.id = self.meeting_counter
-        self.meetings[meeting.id] = meeting
-        self._save()
+        self._add(meeting)
 
     def update_meeting(self, meeting_id: int, **kwargs) -> Meeting:
         """Update an existing meeting"""
-        if meeting_id not in self.meetings:
-            raise TaskNotFoundError(f"Meeting {meeting_id} not found")
-        
-        meeting = self.meetings[meeting_id]
-        for key, value in kwargs.items():
-            if hasattr(meeting, key):
-                setattr(meeting, key, value)
-        
-        self._save()
+        return self._update(meeting_id, **kwargs)
+
+    def set_rsvp(self, meeting_id: int, user_id: int, response: str) -> Meeting:
+        """Record a participant's RSVP response"""
+        with self._lock:
+            meeting = self._get(meeting_id)
+            meeting.rsvp_status[user_id] = response
+            self._put(meeting_id)
+        self._publish(RSVPChanged, meeting, frozenset({'rsvp_status'}), user_id, response)
         return meeting
 
     def delete_meeting(self, meeting_id: int) -> Meeting:
         """Delete a meeting"""
-        if meeting_id not in self.meetings:
-            raise TaskNotFoundError(f"Meeting {meeting_id} not found")
-        
-        meeting = self.meetings.pop(meeting_id)
-        self._save()
-        return meeting
+        return self._delete(meeting_id)
 
     def get_meeting(self, meeting_id: int) -> Meeting:
-        """Get a meeting by ID"""
-        if meeting_id not in self.meetings:
-            raise TaskNotFoundError(f"Meeting {meeting_id} not found")
-        return self.meetings[meeting_id]
+        """Get a meeting by ID, including archived ones"""
+        return self._get_or_archived(meeting_id)
 
     def get_all_meetings(self) -> Dict[int, Meeting]:
         """Get all meetings"""
-        return self.meetings.copy()
+        return self.records.copy()
 
-    def set_channel_id(self, channel_id: int) -> None:
-        """Set the meetings board channel ID"""
-        self.meeting_channel_id = channel_id
-        self._save()
+    def get_meeting_summaries(self) -> List[MeetingSummary]:
+        """Get the search fields of every meeting, ordered by ID, without building lazy ones"""
+        return self._summaries()
 
-class TaskStore:
-    def __init__(self, file_path: str):
-        self.file_path = file_path
-        self.tasks: Dict[int, Task] = {}
-        self.task_counter: int = 0
-        self.task_channel_id: Optional[int] = None
-        self._load()
-    
-    def _load(self) -> None:
-        """Load tasks from storage file"""
-        try:
-            if not os.path.exists(self.file_path):
-                self._save()
-                return
+    def get_meetings_between(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[Meeting]:
+        """Get meetings starting within [start, end), sorted by start time"""
+        meetings = [
+            meeting for meeting in self.records.values()
+            if (start is None or meeting.start_time >= start)
+            and (end is None or meeting.start_time < end)
+        ]
+        return sorted(meetings, key=lambda m: (m.start_time, m.id))
 
-            with open(self.file_path, 'r') as f:
-                data = json.load(f)
-                self.tasks = {
-                    int(k): Task.from_dict(v) 
-                    for k, v in data.get('tasks', {}).items()
-                }
-                self.task_counter = data.get('task_counter', 0)
-                self.task_channel_id = data.get('task_channel_id')
-        except Exception as e:
-            raise StorageError(f"Failed to load tasks: {str(e)}")
+    def archive_meetings(self, before: datetime) -> List[Meeting]:
+        """Archive meetings that ended before the given time"""
+        ended = [
+            meeting.id for meeting in self.get_meetings_between(None, before)
+            if meeting.start_time + timedelta(minutes=meeting.duration) < before
+        ]
+        return self._archive(ended)
 
-    def _save(self) -> None:
-        """Save tasks to storage file"""
-        try:
-            data = {
-                'tasks': {
-                    str(k): v.to_dict() 
-                    for k, v in self.tasks.items()
-                },
-                'task_counter': self.task_counter,
-                'task_channel_id': self.task_channel_id
-            }
-            with open(self.file_path, 'w') as f:
-                json.dump(data, f, indent=4)
-        except Exception as e:
-            raise StorageError(f"Failed to save tasks: {str(e)}")
+class TaskStore(BaseStore):
+    record_type = Task
+    record_name = "Task"
+    records_key = "tasks"
+    counter_key = "task_counter"
+    channel_key = "task_channel_id"
+    board_key = "task_board_messages"
+    changes_key = "task_changes"
+    created_event = TaskCreated
+    updated_event = TaskUpdated
+    deleted_event = TaskDeleted
+    channel_event = TaskChannelChanged
+    replaced_event = TasksReplaced
+    unloaded_event = TasksUnloaded
+
+    def __init__(self, *args, **kwargs):
+        self.index = TaskIndex()
+        super().__init__(*args, **kwargs)
+
+    def _index(self, task: Task) -> None:
+        self.index.add(task)
+
+    def _unindex(self, task: Task) -> None:
+        self.index.remove(task)
+
+    def _reindex(self) -> None:
+        # Snapshot rows carry the indexed fields, so loading builds no Task objects
+        self.index.rebuild(record_views(self.records))
+
+    @property
+    def tasks(self) -> Dict[int, Task]:
+        return self.records
+
+    @property
+    def task_counter(self) -> int:
+        return self.counter
+
+    @property
+    def task_channel_id(self) -> Optional[int]:
+        return self.channel_id
 
     def add_task(self, task: Task) -> None:
         """Add a new task to storage"""
-        self.task_counter += 1
-        task.id = self.task_counter
-        self.tasks[task.id] = task
-        self._save()
+        self._add(task)
 
     def update_task(self, task_id: int, **kwargs) -> Task:
         """Update an existing task"""
-        if task_id not in self.tasks:
-            raise TaskNotFoundError(f"Task {task_id} not found")
-        
-        task = self.tasks[task_id]
-        for key, value in kwargs.items():
-            if hasattr(task, key):
-                setattr(task, key, value)
-        
-        self._save()
-        return task
+        return self._update(task_id, **kwargs)
+
+    def update_tasks(self, updates: Dict[int, dict]) -> List[Task]:
+        """Update several tasks in one persistence write"""
+        return self._update_many(updates)
+
+    def update_many(self, task_filter: TaskFilter, **changes) -> List[Task]:
+        """Apply the same changes to every task matching a filter, in one persistence write"""
+        with self._lock:
+            return self._update_many({task.id: changes for task in self.find_tasks(task_filter)})
 
     def delete_task(self, task_id: int) -> Task:
         """Delete a task"""
-        if task_id not in self.tasks:
-            raise TaskNotFoundError(f"Task {task_id} not found")
-        
-        task = self.tasks.pop(task_id)
-        self._save()
-        return task
+        return self._delete(task_id)
+
+    def delete_many(self, task_filter: TaskFilter) -> List[Task]:
+        """Delete every task matching a filter, in one persistence write"""
+        with self._lock:
+            return self._delete_many([task.id for task in self.find_tasks(task_filter)])
 
     def get_task(self, task_id: int) -> Task:
-        """Get a task by ID"""
-        if task_id not in self.tasks:
-            raise TaskNotFoundError(f"Task {task_id} not found")
-        return self.tasks[task_id]
+        """Get a task by ID, including archived ones"""
+        return self._get_or_archived(task_id)
 
     def get_all_tasks(self) -> Dict[int, Task]:
         """Get all tasks"""
-        return self.tasks.copy()
+        return self.records.copy()
 
-    def set_channel_id(self, channel_id: int) -> None:
-        """Set the task board channel ID"""
-        self.task_channel_id = channel_id
-        self._save()
\ No newline at end of file
+    def get_task_summaries(self) -> List[TaskSummary]:
+        """Get the search fields of every task, ordered by ID, without building lazy ones"""
+        return self._summaries()
+
+    def get_tasks_by_status(self, status: str) -> List[Task]:
+        """Get tasks with the given status, ordered by ID"""
+        return [self.records[task_id] for task_id in self.index.ids_by_status(status)]
+
+    def get_tasks_by_assignee(self, user_id: int, role_ids: Iterable[int] = ()) -> List[Task]:
+        """Get tasks assigned to a user directly or through one of ``role_ids``, ordered by ID"""
+        task_ids = self.index.ids_by_users(member_targets(user_id, role_ids))
+        return [self.records[task_id] for task_id in task_ids]
+
+    def get_tasks_due_between(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[Task]:
+        """Get tasks due within [start, end), sorted by due date"""
+        return [self.records[task_id] for task_id in self.index.ids_due_between(start, end)]
+
+    def find_tasks(self, task_filter: TaskFilter) -> List[Task]:
+        """Get the tasks matching a filter, ordered by ID"""
+        task_ids = self.index.ids_matching(task_filter)
+        return [self.records[task_id] for task_id in sorted(self.records if task_ids is None else task_ids)]
+
+    def get_tasks_with_threads(self) -> List[Task]:
+        """Get tasks that have a discussion thread, ordered by ID"""
+        return [self.records[task.id] for task in record_views(self.records) if task.thread_id]
+
+    def get_overdue_tasks(self, now: Optional[datetime] = None) -> List[Task]:
+        """Get tasks whose due date has passed, oldest first"""
+        return self.get_tasks_due_between(None, now or datetime.now())
+
+    def archive_tasks(self, status: str, before: datetime) -> List[Task]:
+        """Archive tasks in ``status`` that were completed before the given time.
+
+        Tasks finished before completion times were recorded get one now,
+        so they are archived once they have aged like any other.
+        """
+        old = []
+        unstamped = {}
+        for task in self.get_tasks_by_status(status):
+            if task.completed_at is None:
+                unstamped[task.id] = {'completed_at': datetime.now()}
+            elif task.completed_at < before:
+                old.append(task.id)
+        if unstamped:
+            self.update_tasks(unstamped)
+        return self._archive(old)
@@ -0,0 +1,115 @@
+import heapq
+import math
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+_WORD = re.compile(r"\w+")
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into lowercase words with accents removed"""
+    if not text:
+        return []
+    text = unicodedata.normalize('NFKD', text.casefold())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return _WORD.findall(text)
+
+class SearchIndex:
+    """Incremental inverted index with prefix matching and ranked results.
+
+    Every document is a set of weighted text fields. ``postings`` maps each
+    word to the documents containing it with the summed field weights, and
+    a sorted vocabulary lets a query word match every indexed word it is a
+    prefix of with two bisections. Results are scored with the weights
+    times the words' inverse document frequency; whole-word matches count
+    double a prefix match, and every query word must match.
+    """
+    # Query words expand to at most this many indexed words, the most common
+    # and then the shortest ones win
+    MAX_EXPANSIONS = 64
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[Hashable, float]] = {}
+        self.vocabulary: List[str] = []
+        self.labels: Dict[Hashable, str] = {}
+        self._terms: Dict[Hashable, Dict[str, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._terms
+
+    def add(self, key: Hashable, fields: Iterable[Tuple[Optional[str], float]], label: str = "") -> None:
+        """Index a document, replacing any earlier version of it"""
+        self.remove(key)
+        terms: Dict[str, float] = {}
+        for text, weight in fields:
+            for word in tokenize(text):
+                terms[word] = terms.get(word, 0.0) + weight
+        for word, weight in terms.items():
+            documents = self.postings.get(word)
+            if documents is None:
+                documents = self.postings[word] = {}
+                insort(self.vocabulary, word)
+            documents[key] = weight
+        self._terms[key] = terms
+        self.labels[key] = label
+
+    def remove(self, key: Hashable) -> None:
+        """Drop a document, if it is indexed"""
+        terms = self._terms.pop(key, None)
+        if terms is None:
+            return
+        self.labels.pop(key, None)
+        for word in terms:
+            documents = self.postings[word]
+            del documents[key]
+            if not documents:
+                del self.postings[word]
+                del self.vocabulary[bisect_left(self.vocabulary, word)]
+
+    def _expand(self, prefix: str) -> List[str]:
+        start = bisect_left(self.vocabulary, prefix)
+        # Every word with this prefix sorts before prefix + U+FFFF
+        end = bisect_left(self.vocabulary, prefix + "\uffff", start)
+        words = self.vocabulary[start:end]
+        if len(words) > self.MAX_EXPANSIONS:
+            words = sorted(words, key=lambda word: (-len(self.postings[word]), len(word)))[:self.MAX_EXPANSIONS]
+        return words
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        accept: Optional[Callable[[Hashable], bool]] = None
+    ) -> List[Tuple[Hashable, float]]:
+        """Best matching documents as ``(key, score)``, highest score first.
+
+        ``accept`` optionally filters the candidate keys before ranking.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+        total = len(self._terms)
+        scores: Optional[Dict[Hashable, float]] = None
+        for query_word in dict.fromkeys(words):
+            matches: Dict[Hashable, float] = {}
+            for word in self._expand(query_word):
+                documents = self.postings[word]
+                idf = math.log(1 + total / len(documents))
+                factor = idf if word == query_word else idf / 2
+                for key, weight in documents.items():
+                    score = weight * factor
+                    if score > matches.get(key, 0.0):
+                        matches[key] = score
+            if scores is None:
+                scores = matches
+            else:
+                # Every query word has to match
+                scores = {key: score + matches[key] for key, score in scores.items() if key in matches}
+            if not scores:
+                return []
+        candidates = scores.items() if accept is None else ((k, s) for k, s in scores.items() if accept(k))
+        return heapq.nsmallest(limit, candidates, key=lambda hit: (-hit[1], hit[0]))
@@ -0,0 +1,103 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+class ShardedStore:
+    """One store per guild, opened on first access and closed when idle.
+
+    ``factory`` builds the store of a guild from its ID. Looking a guild
+    up is a dict access, and every guild has its own records, indexes,
+    board state and writer, so a large guild never slows down the others.
+    Shards untouched for ``idle_timeout`` seconds are flushed and closed
+    by ``evict_idle`` and reopened transparently on their next access.
+    """
+
+    def __init__(self, factory: Callable[[int], Any], idle_timeout: float = 900.0):
+        self.factory = factory
+        self.idle_timeout = idle_timeout
+        self.metrics: Dict[str, int] = {'loads': 0, 'evictions': 0}
+        self._shards: Dict[int, Any] = {}
+        self._last_used: Dict[int, float] = {}
+
+    def store_for(self, guild_id: int) -> Any:
+        """Return the store of a guild, loading it if needed"""
+        store = self._shards.get(guild_id)
+        if store is None:
+            store = self.factory(guild_id)
+            self._shards[guild_id] = store
+            self.metrics['loads'] += 1
+        self._last_used[guild_id] = time.monotonic()
+        return store
+
+    def peek(self, guild_id: int) -> Optional[Any]:
+        """Return the store of a guild only if it is already loaded"""
+        return self._shards.get(guild_id)
+
+    def loaded_ids(self) -> List[int]:
+        """IDs of the guilds whose shard is currently in memory"""
+        return list(self._shards)
+
+    @property
+    def loaded(self) -> int:
+        """Number of shards currently in memory"""
+        return len(self._shards)
+
+    async def evict_idle(self, now: Optional[float] = None) -> int:
+        """Flush and close every shard idle for longer than ``idle_timeout``"""
+        now = time.monotonic() if now is None else now
+        idle = [
+            guild_id for guild_id, last_used in self._last_used.items()
+            if now - last_used > self.idle_timeout
+        ]
+        evicted = 0
+        for guild_id in idle:
+            if await self._close_shard(guild_id):
+                self.metrics['evictions'] += 1
+                evicted += 1
+        return evicted
+
+    async def run_eviction(self, interval: float = 60.0) -> None:
+        """Evict idle shards every ``interval`` seconds, forever"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.evict_idle()
+            except Exception as e:
+                print(f"Error evicting idle shards: {e}")
+
+    async def _close_shard(self, guild_id: int, force: bool = False) -> bool:
+        """Flush and close a shard, keeping it registered until it is closed.
+
+        While the flush is awaited ``store_for`` keeps returning the same
+        store, so the guild is never reopened from files that are about to
+        be rewritten. A shard used during the flush is kept open unless
+        ``force`` is set.
+        """
+        store = self._shards.get(guild_id)
+        if store is None:
+            return False
+        last_used = self._last_used.get(guild_id)
+        try:
+            await store.flush()
+        except Exception:
+            # Closing writes the pending changes once more
+            if not force:
+                raise
+        if self._shards.get(guild_id) is not store:
+            return False
+        if not force and self._last_used.get(guild_id) != last_used:
+            return False
+        # No await from here on: the shard is unregistered and closed
+        # before any other task can look it up again
+        del self._shards[guild_id]
+        self._last_used.pop(guild_id, None)
+        store.close()
+        return True
+
+    async def close(self) -> None:
+        """Flush and close every loaded shard"""
+        for guild_id in list(self._shards):
+            try:
+                await self._close_shard(guild_id, force=True)
+            except Exception as e:
+                print(f"Error closing the store of guild {guild_id}: {e}")
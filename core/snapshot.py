@@ -0,0 +1,477 @@
+"""Compact binary snapshots for the JSON/journal stores.
+
+Layout (little endian):
+
+    header   magic, version, record kind
+    meta     counter, channel ID, board state and change tracking as a JSON blob
+    strings  count, end offset of every string, UTF-8 blob
+    records  count, one fixed-width struct per record
+    members  count, int64 user IDs of every record back to back
+    rsvp     count, int64 user IDs, uint32 response string indexes (meetings only)
+
+Strings (titles, statuses, RSVP responses...) are stored once in the
+string table and referenced by index. Datetimes are int64 microseconds
+since the epoch plus a UTC offset in seconds, so aware and naive values
+round-trip exactly through ``to_dict``. IDs use 0 for ``None``.
+"""
+import json
+import struct
+import sys
+from array import array
+from collections.abc import MutableMapping
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+from core.models import Meeting, Task
+from core.exceptions import StorageError
+
+MAGIC = b"NBXSNAP\0"
+VERSION = 1
+
+NO_STRING = 0xFFFFFFFF
+NO_TIME = -(2 ** 63)
+# UTC offset marking a naive datetime
+NAIVE = -(2 ** 31)
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+_HEADER = struct.Struct("<8sHB")
+_META = struct.Struct("<qqI")
+_COUNT = struct.Struct("<I")
+
+def encode_datetime(value: Optional[datetime]) -> Tuple[int, int]:
+    """Split a datetime into epoch microseconds and a UTC offset in seconds"""
+    if value is None:
+        return NO_TIME, NAIVE
+    if value.tzinfo is None:
+        return (value - _EPOCH) // _MICROSECOND, NAIVE
+    offset = value.utcoffset()
+    return (value.replace(tzinfo=None) - offset - _EPOCH) // _MICROSECOND, offset // timedelta(seconds=1)
+
+def decode_datetime(micros: int, offset: int) -> Optional[datetime]:
+    """Rebuild a datetime from ``encode_datetime`` output"""
+    if micros == NO_TIME:
+        return None
+    value = _EPOCH + timedelta(microseconds=micros)
+    if offset == NAIVE:
+        return value
+    delta = timedelta(seconds=offset)
+    return (value + delta).replace(tzinfo=timezone(delta))
+
+class TaskRow(NamedTuple):
+    """A decoded task that hasn't been turned into a Task yet.
+
+    It carries the attributes the task indexes read, so a store can be
+    indexed without building a single Task or creation datetime.
+    """
+    id: int
+    title: str
+    description: str
+    status: str
+    created_raw: Tuple[int, int]
+    due_date: Optional[datetime]
+    assigned_users: List[int]
+    thread_id: Optional[int]
+    thread_creator_id: Optional[int]
+    completed_at: Optional[datetime]
+    seq: int
+
+class MeetingRow(NamedTuple):
+    """A decoded meeting that hasn't been turned into a Meeting yet"""
+    id: int
+    title: str
+    description: str
+    start_raw: Tuple[int, int]
+    duration: int
+    created_by: int
+    participants: List[int]
+    channel_id: Optional[int]
+    calendar_event_id: Optional[str]
+    reminder_sent: bool
+    rsvp_status: Dict[int, str]
+    attendance_checked: bool
+    seq: int
+
+class LazyRecords(MutableMapping):
+    """Record mapping that builds model objects from snapshot rows on first access"""
+
+    def __init__(self, rows: Dict[int, tuple], build: Callable[[tuple], Any]):
+        self._items: Dict[int, Any] = rows
+        self._build = build
+
+    def __getitem__(self, record_id: int) -> Any:
+        value = self._items[record_id]
+        if isinstance(value, tuple):
+            value = self._items[record_id] = self._build(value)
+        return value
+
+    def __setitem__(self, record_id: int, record: Any) -> None:
+        self._items[record_id] = record
+
+    def __delitem__(self, record_id: int) -> None:
+        del self._items[record_id]
+
+    def __contains__(self, record_id: object) -> bool:
+        return record_id in self._items
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def copy(self) -> Dict[int, Any]:
+        return dict(self.items())
+
+    def views(self) -> Iterable[Any]:
+        """Every record as-is: a row if it was never accessed, else the object"""
+        return self._items.values()
+
+    @property
+    def built(self) -> int:
+        """Number of records already turned into model objects"""
+        return sum(1 for value in self._items.values() if not isinstance(value, tuple))
+
+def record_views(records: Dict[int, Any]) -> Iterable[Any]:
+    """Iterate records without building lazy ones"""
+    return records.views() if isinstance(records, LazyRecords) else records.values()
+
+class _StringTable:
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+
+    def add(self, value: Optional[str]) -> int:
+        if value is None:
+            return NO_STRING
+        position = self.index.get(value)
+        if position is None:
+            position = self.index[value] = len(self.index)
+        return position
+
+    def encode(self) -> bytes:
+        blobs = [value.encode('utf-8') for value in self.index]
+        ends = array('I')
+        total = 0
+        for blob in blobs:
+            total += len(blob)
+            ends.append(total)
+        return _COUNT.pack(len(blobs)) + _to_bytes(ends) + b''.join(blobs)
+
+def _to_bytes(values: array) -> bytes:
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+def _from_bytes(typecode: str, data: memoryview) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values
+
+class _Codec:
+    kind = 0
+    fixed: struct.Struct = None
+
+    def pack(self, record: Any, strings: _StringTable, members: array, rsvp_users: array, rsvp_values: array) -> bytes:
+        raise NotImplementedError
+
+    def unpack(self, fields: tuple, strings: List[str], members: array, member_pos: int, rsvp: tuple, rsvp_pos: int):
+        raise NotImplementedError
+
+    def freeze(self, record: Any) -> tuple:
+        raise NotImplementedError
+
+    def build(self, row: tuple) -> Any:
+        raise NotImplementedError
+
+class _TaskCodec(_Codec):
+    kind = 1
+    # id, title, description, status, created_at, created offset,
+    # due_date, due offset, completed_at, completed offset, thread_id,
+    # thread_creator_id, assignee count, seq
+    fixed = struct.Struct("<qIIIqiqiqiqqIq")
+
+    def pack(self, task, strings, members, rsvp_users, rsvp_values):
+        if isinstance(task, TaskRow):
+            created = task.created_raw
+        else:
+            created = encode_datetime(task.created_at)
+        members.extend(task.assigned_users)
+        return self.fixed.pack(
+            task.id,
+            strings.add(task.title),
+            strings.add(task.description),
+            strings.add(task.status),
+            *created,
+            *encode_datetime(task.due_date),
+            *encode_datetime(task.completed_at),
+            task.thread_id or 0,
+            task.thread_creator_id or 0,
+            len(task.assigned_users),
+            task.seq
+        )
+
+    def unpack(self, fields, strings, members, member_pos, rsvp, rsvp_pos):
+        (record_id, title, description, status, created, created_offset,
+         due, due_offset, completed, completed_offset, thread_id, creator_id, count, seq) = fields
+        row = TaskRow(
+            record_id,
+            strings[title],
+            strings[description],
+            strings[status],
+            (created, created_offset),
+            decode_datetime(due, due_offset),
+            members[member_pos:member_pos + count].tolist(),
+            thread_id or None,
+            creator_id or None,
+            decode_datetime(completed, completed_offset),
+            seq
+        )
+        return row, member_pos + count, rsvp_pos
+
+    def freeze(self, task) -> TaskRow:
+        if isinstance(task, TaskRow):
+            return task
+        return TaskRow(
+            task.id,
+            task.title,
+            task.description,
+            task.status,
+            encode_datetime(task.created_at),
+            task.due_date,
+            task.assigned_users.tolist(),
+            task.thread_id,
+            task.thread_creator_id,
+            task.completed_at,
+            task.seq
+        )
+
+    def build(self, row: TaskRow) -> Task:
+        return Task(
+            id=row.id,
+            title=row.title,
+            description=row.description,
+            status=row.status,
+            created_at=decode_datetime(*row.created_raw),
+            due_date=row.due_date,
+            assigned_users=row.assigned_users,
+            thread_id=row.thread_id,
+            thread_creator_id=row.thread_creator_id,
+            completed_at=row.completed_at,
+            seq=row.seq
+        )
+
+class _MeetingCodec(_Codec):
+    kind = 2
+    # id, title, description, start_time, start offset, duration, created_by,
+    # channel_id, calendar_event_id, reminder_sent, attendance_checked,
+    # participant count, RSVP count, seq
+    fixed = struct.Struct("<qIIqiiqqIBBIIq")
+
+    def pack(self, meeting, strings, members, rsvp_users, rsvp_values):
+        if isinstance(meeting, MeetingRow):
+            start = meeting.start_raw
+        else:
+            start = encode_datetime(meeting.start_time)
+        members.extend(meeting.participants)
+        for user_id, response in meeting.rsvp_status.items():
+            rsvp_users.append(int(user_id))
+            rsvp_values.append(strings.add(response))
+        return self.fixed.pack(
+            meeting.id,
+            strings.add(meeting.title),
+            strings.add(meeting.description),
+            *start,
+            meeting.duration,
+            meeting.created_by,
+            meeting.channel_id or 0,
+            strings.add(meeting.calendar_event_id),
+            meeting.reminder_sent,
+            meeting.attendance_checked,
+            len(meeting.participants),
+            len(meeting.rsvp_status),
+            meeting.seq
+        )
+
+    def unpack(self, fields, strings, members, member_pos, rsvp, rsvp_pos):
+        (record_id, title, description, start, start_offset, duration, created_by,
+         channel_id, calendar_event_id, reminder_sent, attendance_checked,
+         participant_count, rsvp_count, seq) = fields
+        rsvp_users, rsvp_values = rsvp
+        row = MeetingRow(
+            record_id,
+            strings[title],
+            strings[description],
+            (start, start_offset),
+            duration,
+            created_by,
+            members[member_pos:member_pos + participant_count].tolist(),
+            channel_id or None,
+            None if calendar_event_id == NO_STRING else strings[calendar_event_id],
+            bool(reminder_sent),
+            {
+                rsvp_users[i]: strings[rsvp_values[i]]
+                for i in range(rsvp_pos, rsvp_pos + rsvp_count)
+            },
+            bool(attendance_checked),
+            seq
+        )
+        return row, member_pos + participant_count, rsvp_pos + rsvp_count
+
+    def freeze(self, meeting) -> MeetingRow:
+        if isinstance(meeting, MeetingRow):
+            return meeting
+        return MeetingRow(
+            meeting.id,
+            meeting.title,
+            meeting.description,
+            encode_datetime(meeting.start_time),
+            meeting.duration,
+            meeting.created_by,
+            meeting.participants.tolist(),
+            meeting.channel_id,
+            meeting.calendar_event_id,
+            meeting.reminder_sent,
+            meeting.rsvp_status.to_dict(),
+            meeting.attendance_checked,
+            meeting.seq
+        )
+
+    def build(self, row: MeetingRow) -> Meeting:
+        return Meeting(
+            id=row.id,
+            title=row.title,
+            description=row.description,
+            start_time=decode_datetime(*row.start_raw),
+            duration=row.duration,
+            created_by=row.created_by,
+            participants=row.participants,
+            channel_id=row.channel_id,
+            calendar_event_id=row.calendar_event_id,
+            reminder_sent=row.reminder_sent,
+            rsvp_status=row.rsvp_status,
+            attendance_checked=row.attendance_checked,
+            seq=row.seq
+        )
+
+CODECS: Dict[type, _Codec] = {
+    Task: _TaskCodec(),
+    Meeting: _MeetingCodec()
+}
+
+def freeze_records(record_type: type, records: Dict[int, Any]) -> List[tuple]:
+    """Rows holding a copy of every record, cheap enough to take under a store's lock.
+
+    Rows of records that were never built are immutable and kept as they
+    are. Encoding the rows later can't see a record changed halfway.
+    """
+    freeze = CODECS[record_type].freeze
+    return [freeze(record) for record in record_views(records)]
+
+def encode_snapshot(
+    record_type: type,
+    records: Union[Dict[int, Any], Iterable[tuple]],
+    counter: int,
+    channel_id: Optional[int],
+    board_state: List[dict],
+    changes: Optional[dict] = None
+) -> bytes:
+    """Serialize a store's state, from its records or from ``freeze_records`` rows"""
+    codec = CODECS[record_type]
+    strings = _StringTable()
+    members = array('q')
+    rsvp_users = array('q')
+    rsvp_values = array('I')
+    fixed = [
+        codec.pack(record, strings, members, rsvp_users, rsvp_values)
+        for record in (record_views(records) if isinstance(records, (dict, LazyRecords)) else records)
+    ]
+    board = json.dumps(
+        {'board': board_state, 'changes': changes or {}}, separators=(',', ':')
+    ).encode('utf-8')
+
+    return b''.join([
+        _HEADER.pack(MAGIC, VERSION, codec.kind),
+        _META.pack(counter, channel_id or 0, len(board)),
+        board,
+        strings.encode(),
+        _COUNT.pack(len(fixed)),
+        *fixed,
+        _COUNT.pack(len(members)),
+        _to_bytes(members),
+        _COUNT.pack(len(rsvp_users)),
+        _to_bytes(rsvp_users),
+        _to_bytes(rsvp_values)
+    ])
+
+class Snapshot(NamedTuple):
+    records: LazyRecords
+    counter: int
+    channel_id: Optional[int]
+    board_state: List[dict]
+    changes: dict
+
+def decode_snapshot(record_type: type, data: bytes) -> Snapshot:
+    """Parse a snapshot into rows; model objects are only built when accessed"""
+    codec = CODECS[record_type]
+    view = memoryview(data)
+    try:
+        magic, version, kind = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise StorageError("Not a snapshot file")
+        if version != VERSION:
+            raise StorageError(f"Unsupported snapshot version {version}")
+        if kind != codec.kind:
+            raise StorageError("Snapshot holds a different record type")
+        offset = _HEADER.size
+
+        counter, channel_id, board_size = _META.unpack_from(view, offset)
+        offset += _META.size
+        blob = json.loads(bytes(view[offset:offset + board_size]))
+        board_state, changes = blob['board'], blob['changes']
+        offset += board_size
+
+        (string_count,) = _COUNT.unpack_from(view, offset)
+        offset += _COUNT.size
+        ends = _from_bytes('I', view[offset:offset + 4 * string_count])
+        offset += 4 * string_count
+        blob = bytes(view[offset:offset + (ends[-1] if string_count else 0)])
+        offset += len(blob)
+        strings = []
+        start = 0
+        for end in ends:
+            strings.append(blob[start:end].decode('utf-8'))
+            start = end
+
+        (record_count,) = _COUNT.unpack_from(view, offset)
+        offset += _COUNT.size
+        fixed_end = offset + codec.fixed.size * record_count
+        fixed = view[offset:fixed_end]
+        offset = fixed_end
+
+        (member_count,) = _COUNT.unpack_from(view, offset)
+        offset += _COUNT.size
+        members = _from_bytes('q', view[offset:offset + 8 * member_count])
+        offset += 8 * member_count
+
+        (rsvp_count,) = _COUNT.unpack_from(view, offset)
+        offset += _COUNT.size
+        rsvp_users = _from_bytes('q', view[offset:offset + 8 * rsvp_count])
+        offset += 8 * rsvp_count
+        rsvp_values = _from_bytes('I', view[offset:offset + 4 * rsvp_count])
+        offset += 4 * rsvp_count
+        if offset != len(view):
+            raise struct.error(f"expected {offset} bytes, found {len(view)}")
+    except (struct.error, ValueError) as e:
+        raise StorageError(f"Truncated snapshot: {str(e)}")
+
+    rows = {}
+    member_pos = rsvp_pos = 0
+    rsvp = (rsvp_users, rsvp_values)
+    for fields in codec.fixed.iter_unpack(fixed):
+        row, member_pos, rsvp_pos = codec.unpack(fields, strings, members, member_pos, rsvp, rsvp_pos)
+        rows[row.id] = row
+
+    return Snapshot(LazyRecords(rows, codec.build), counter, channel_id or None, board_state, changes)
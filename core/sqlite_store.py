@@ -0,0 +1,846 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from core.models import Meeting, MeetingSummary, Task, TaskFilter, TaskSummary, member_targets
+from core.archive import Archive
+from core.writer import BackgroundWriter
+from core.transfer import BaseStagedImport
+from core.events import (
+    EventSource, MeetingChannelChanged, MeetingCreated, MeetingDeleted, MeetingUpdated,
+    MeetingsReplaced, MeetingsUnloaded, RSVPChanged, TaskChannelChanged, TaskCreated, TaskDeleted,
+    TaskUpdated, TasksReplaced, TasksUnloaded
+)
+from core.exceptions import StorageError, TaskNotFoundError
+
+def _timestamp(value: Optional[datetime]) -> Optional[float]:
+    """Convert a datetime to an epoch timestamp usable in range queries"""
+    return value.timestamp() if value else None
+
+class SqliteDatabase:
+    """One connection to a database file, shared by every store kept in it.
+
+    SQLite lets one connection write to a file at a time, so the stores of
+    a file share the connection and its open transaction. ``transaction``
+    wraps each mutation in a savepoint of it, and a writer thread commits
+    it within ``flush_delay`` seconds, after appending the records the
+    stores staged in their archives. The connection sees its own
+    uncommitted changes, so reads don't wait for the commit.
+    """
+    _open: Dict[str, 'SqliteDatabase'] = {}
+    _open_lock = threading.Lock()
+
+    def __init__(self, path: str, flush_delay: float = 1.0):
+        self.path = path
+        # Commits happen on the writer thread; they and every transaction hold ``lock``
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.lock = threading.RLock()
+        self.archives: List[Archive] = []
+        self.users = 0
+        self.writer = BackgroundWriter(os.path.basename(path), self._commit, flush_delay)
+
+    @classmethod
+    def open(cls, path: str, flush_delay: float = 1.0) -> 'SqliteDatabase':
+        """Return the open database of a file, connecting to it if needed"""
+        key = os.path.abspath(path)
+        with cls._open_lock:
+            db = cls._open.get(key)
+            if db is None:
+                db = cls._open[key] = cls(path, flush_delay)
+            db.users += 1
+            return db
+
+    def release(self, archive: Optional[Archive] = None) -> None:
+        """Stop using the database, committing and closing it after its last user"""
+        if archive is not None:
+            archive.write_staged()
+            if archive in self.archives:
+                self.archives.remove(archive)
+        with self._open_lock:
+            self.users -= 1
+            if self.users > 0:
+                return
+            self._open.pop(os.path.abspath(self.path), None)
+        try:
+            self.writer.close()
+        finally:
+            self.conn.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Run statements as one unit, committed later by the writer thread.
+
+        A savepoint inside the open transaction, so a failure rolls back
+        only its own statements and not the ones waiting for the commit.
+        """
+        with self.lock:
+            if not self.conn.in_transaction:
+                self.conn.execute("BEGIN")
+            self.conn.execute("SAVEPOINT change")
+            try:
+                yield
+            except BaseException:
+                self.conn.execute("ROLLBACK TO change")
+                self.conn.execute("RELEASE change")
+                raise
+            self.conn.execute("RELEASE change")
+        self.writer.mark_dirty()
+
+    def _commit(self) -> None:
+        """Append staged archive records, then commit, runs on the writer thread"""
+        # Archived records reach their archive before their deletions commit
+        for archive in list(self.archives):
+            archive.write_staged()
+        with self.lock:
+            try:
+                self.conn.commit()
+            except sqlite3.Error as e:
+                raise StorageError(f"Failed to commit {self.path}: {str(e)}")
+
+class SqliteBaseStore(EventSource):
+    """Shared SQLite logic for the task and meeting stores.
+
+    Each record is kept as its ``to_dict`` JSON blob next to a few indexed
+    columns, and its member IDs (assignees or participants) live in a side
+    table so per-user lookups hit an index instead of scanning every record.
+    Archived records move to an ``<database>_<table>.archive`` file.
+
+    Like the JSON stores, every write stamps the record with a change
+    sequence number (``seq`` column) and deletions leave a row in
+    ``<table>_removed``, so changes since a sequence number can be exported.
+    Mutations publish the same change events as the JSON stores.
+
+    Mutations run in a transaction of the file's ``SqliteDatabase`` that
+    its writer thread commits within ``flush_delay`` seconds, so the event
+    loop never waits on the disk; ``flush`` waits for the commit.
+    """
+    record_type = None
+    record_name = "Record"
+    table = "records"
+    members_table = "record_members"
+    members_attr = "members"
+    # NamedTuple of the fields ``_summaries`` reads: id, JSON fields, seq
+    summary_type = None
+    records_key = "records"
+    counter_key = "counter"
+    channel_key = "channel_id"
+    board_key = "board_messages"
+    changes_key = "changes"
+
+    def __init__(self, db_path: str, legacy_file: Optional[str] = None, flush_delay: float = 1.0):
+        self.db_path = db_path
+        self.archive = Archive(f"{os.path.splitext(db_path)[0]}_{self.table}.archive")
+        try:
+            self.db = SqliteDatabase.open(db_path, flush_delay)
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to open database {db_path}: {str(e)}")
+        self.conn = self.db.conn
+        try:
+            with self._transaction():
+                self._create_schema()
+                self._migrate_schema()
+        except sqlite3.Error as e:
+            self.db.release()
+            raise StorageError(f"Failed to open database {db_path}: {str(e)}")
+        self.db.archives.append(self.archive)
+
+        # First start on SQLite: pull in the existing JSON data file
+        if legacy_file and os.path.exists(legacy_file) and self._is_empty():
+            with open(legacy_file, 'r') as f:
+                self.import_data(json.load(f))
+
+    def _create_schema(self) -> None:
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        self.conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.members_table} ("
+            "record_id INTEGER NOT NULL, user_id INTEGER NOT NULL, "
+            "PRIMARY KEY (record_id, user_id))"
+        )
+        self.conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{self.members_table}_user "
+            f"ON {self.members_table} (user_id)"
+        )
+
+    def _migrate_schema(self) -> None:
+        """Add the change tracking of databases created before it existed"""
+        columns = {row[1] for row in self.conn.execute(f"PRAGMA table_info({self.table})")}
+        if 'seq' not in columns:
+            self.conn.execute(f"ALTER TABLE {self.table} ADD COLUMN seq INTEGER NOT NULL DEFAULT 0")
+        self.conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.table}_seq ON {self.table} (seq)")
+        self.conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table}_removed ("
+            "id INTEGER PRIMARY KEY, seq INTEGER NOT NULL, archived INTEGER NOT NULL)"
+        )
+
+    @property
+    def _lock(self) -> threading.RLock:
+        return self.db.lock
+
+    def _transaction(self):
+        return self.db.transaction()
+
+    def _is_empty(self) -> bool:
+        row = self.conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+        return row[0] == 0 and self.counter == 0
+
+    # Metadata
+
+    def _get_meta(self, key: str, default: Any = None) -> Any:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def _set_meta(self, key: str, value: Any) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            (key, json.dumps(value))
+        )
+
+    @property
+    def counter(self) -> int:
+        return self._get_meta(self.counter_key, 0)
+
+    @property
+    def channel_id(self) -> Optional[int]:
+        return self._get_meta(self.channel_key)
+
+    @property
+    def seq(self) -> int:
+        return self._get_meta(self.changes_key, {}).get('seq', 0)
+
+    @property
+    def pruned_seq(self) -> int:
+        return self._get_meta(self.changes_key, {}).get('pruned_seq', 0)
+
+    def _set_changes(self, seq: int, pruned_seq: int) -> None:
+        self._set_meta(self.changes_key, {'seq': seq, 'pruned_seq': pruned_seq})
+
+    def _next_seq(self) -> int:
+        """Hand out the next change sequence number, see ``BaseStore._next_seq``"""
+        changes = self._get_meta(self.changes_key, {})
+        seq = max(changes.get('seq', 0) + 1, time.time_ns() // 1000)
+        self._set_changes(seq, changes.get('pruned_seq', 0))
+        return seq
+
+    def _tombstone(self, record_id: int, seq: int, archived: bool) -> None:
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO {self.table}_removed (id, seq, archived) VALUES (?, ?, ?)",
+            (record_id, seq, int(archived))
+        )
+
+    def set_channel_id(self, channel_id: int) -> None:
+        """Set the board channel ID"""
+        try:
+            with self._transaction():
+                self._next_seq()
+                self._set_meta(self.channel_key, channel_id)
+                self._set_meta(self.board_key, [])
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to save channel: {str(e)}")
+        self._publish(self.channel_event, channel_id)
+
+    @property
+    def board_state(self) -> List[dict]:
+        return self._get_meta(self.board_key, [])
+
+    def set_board_state(self, board_state: List[dict]) -> None:
+        """Remember which messages currently make up the board"""
+        try:
+            with self._transaction():
+                self._set_meta(self.board_key, board_state)
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to save board state: {str(e)}")
+
+    # Records
+
+    def _index_columns(self, record: Any) -> Dict[str, Any]:
+        """Return the indexed columns stored next to the record blob"""
+        return {}
+
+    def _write(self, record: Any) -> None:
+        columns = {**self._index_columns(record), 'seq': record.seq}
+        names = ", ".join(["id", "data", *columns])
+        placeholders = ", ".join("?" for _ in range(len(columns) + 2))
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO {self.table} ({names}) VALUES ({placeholders})",
+            (record.id, json.dumps(record.to_dict()), *columns.values())
+        )
+        self.conn.execute(f"DELETE FROM {self.members_table} WHERE record_id = ?", (record.id,))
+        self.conn.execute(f"DELETE FROM {self.table}_removed WHERE id = ?", (record.id,))
+        self.conn.executemany(
+            f"INSERT OR IGNORE INTO {self.members_table} (record_id, user_id) VALUES (?, ?)",
+            [(record.id, user_id) for user_id in getattr(record, self.members_attr)]
+        )
+
+    def _decode(self, rows) -> List[Any]:
+        return [self.record_type.from_dict(json.loads(row[0])) for row in rows]
+
+    def _query(self, where: str = "", params: tuple = (), order: str = "id") -> List[Any]:
+        rows = self.conn.execute(
+            f"SELECT data FROM {self.table} {where} ORDER BY {order}",
+            params
+        )
+        return self._decode(rows)
+
+    def _get(self, record_id: int) -> Any:
+        row = self.conn.execute(
+            f"SELECT data FROM {self.table} WHERE id = ?", (record_id,)
+        ).fetchone()
+        if row is None:
+            if record_id in self.archive:
+                raise TaskNotFoundError(f"{self.record_name} {record_id} is archived and can't be changed")
+            raise TaskNotFoundError(f"{self.record_name} {record_id} not found")
+        return self._decode([row])[0]
+
+    def _get_or_archived(self, record_id: int) -> Any:
+        """Look a record up in the database first, then in the archive"""
+        try:
+            return self._get(record_id)
+        except TaskNotFoundError:
+            data = self.archive.get(record_id)
+            if data is None:
+                raise
+            return self.record_type.from_dict(data)
+
+    def is_archived(self, record_id: int) -> bool:
+        """Whether a record only exists in the archive"""
+        if record_id not in self.archive:
+            return False
+        row = self.conn.execute(f"SELECT 1 FROM {self.table} WHERE id = ?", (record_id,)).fetchone()
+        return row is None
+
+    def _add(self, record: Any) -> None:
+        try:
+            with self._transaction():
+                counter = self.counter + 1
+                self._set_meta(self.counter_key, counter)
+                record.id = counter
+                record.seq = self._next_seq()
+                self._write(record)
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to save {self.record_name.lower()}: {str(e)}")
+        self._publish(self.created_event, record)
+
+    def _rewrite(self, record: Any) -> None:
+        try:
+            with self._transaction():
+                record.seq = self._next_seq()
+                self._write(record)
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to save {self.record_name.lower()}: {str(e)}")
+
+    def _update(self, record_id: int, **kwargs) -> Any:
+        record = self._get(record_id)
+        for key, value in kwargs.items():
+            if hasattr(record, key):
+                setattr(record, key, value)
+        self._rewrite(record)
+        self._publish(self.updated_event, record, frozenset(kwargs))
+        return record
+
+    def _update_many(self, updates: Dict[int, dict]) -> List[Any]:
+        records = [self._get(record_id) for record_id in updates]
+        for record, changes in zip(records, updates.values()):
+            for key, value in changes.items():
+                if hasattr(record, key):
+                    setattr(record, key, value)
+        try:
+            with self._transaction():
+                for record in records:
+                    record.seq = self._next_seq()
+                    self._write(record)
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to save {self.records_key}: {str(e)}")
+        for record, changes in zip(records, updates.values()):
+            self._publish(self.updated_event, record, frozenset(changes))
+        return records
+
+    def _delete(self, record_id: int) -> Any:
+        return self._delete_many([record_id])[0]
+
+    def _delete_many(self, record_ids: List[int]) -> List[Any]:
+        """Delete several records in one transaction"""
+        records = [self._get(record_id) for record_id in record_ids]
+        try:
+            with self._transaction():
+                for record in records:
+                    self.conn.execute(f"DELETE FROM {self.table} WHERE id = ?", (record.id,))
+                    self.conn.execute(f"DELETE FROM {self.members_table} WHERE record_id = ?", (record.id,))
+                    self._tombstone(record.id, self._next_seq(), False)
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to delete {self.records_key}: {str(e)}")
+        for record in records:
+            self._publish(self.deleted_event, record)
+        return records
+
+    def _archive(self, records: List[Any]) -> List[Any]:
+        """Move records to the archive file and delete their rows"""
+        try:
+            with self._transaction():
+                for record in records:
+                    record.seq = self._next_seq()
+                    self.conn.execute(f"DELETE FROM {self.table} WHERE id = ?", (record.id,))
+                    self.conn.execute(f"DELETE FROM {self.members_table} WHERE record_id = ?", (record.id,))
+                    self._tombstone(record.id, record.seq, True)
+                # Appended by the writer thread before the deletions commit
+                self.archive.stage([record.to_dict() for record in records])
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to archive {self.records_key}: {str(e)}")
+        for record in records:
+            self._publish(self.deleted_event, record, archived=True)
+        return records
+
+    @property
+    def records(self) -> Dict[int, Any]:
+        return {record.id: record for record in self._query()}
+
+    def _summaries(self) -> List[Any]:
+        """Read the ``summary_type`` fields of every record straight from the JSON blobs"""
+        fields = self.summary_type._fields
+        columns = ", ".join(f"json_extract(data, '$.{name}')" for name in fields[1:-1])
+        members = fields.index(self.members_attr)
+        rows = self.conn.execute(f"SELECT id, {columns}, seq FROM {self.table} ORDER BY id")
+        # Arrays come back as JSON text
+        return [
+            self.summary_type(*row[:members], json.loads(row[members]), *row[members + 1:])
+            for row in rows
+        ]
+
+    # Import / export
+
+    def to_dict(self) -> dict:
+        """Serialize the store in the JSON file format"""
+        rows = self.conn.execute(f"SELECT id, data FROM {self.table} ORDER BY id")
+        return {
+            self.records_key: {str(row[0]): json.loads(row[1]) for row in rows},
+            self.counter_key: self.counter,
+            self.channel_key: self.channel_id,
+            self.board_key: self.board_state,
+            self.changes_key: {
+                'seq': self.seq,
+                'pruned_seq': self.pruned_seq,
+                'removed': {
+                    str(row[0]): [row[1], bool(row[2])]
+                    for row in self.conn.execute(f"SELECT id, seq, archived FROM {self.table}_removed")
+                }
+            }
+        }
+
+    def import_data(self, data: dict) -> None:
+        """Replace the whole store with data in the JSON file format"""
+        records = [
+            self.record_type.from_dict(v)
+            for v in data.get(self.records_key, {}).values()
+        ]
+        try:
+            with self._transaction():
+                self._clear()
+                for record in records:
+                    self._write(record)
+                self._set_meta(self.counter_key, data.get(self.counter_key, 0))
+                self._set_meta(self.channel_key, data.get(self.channel_key))
+                self._set_meta(self.board_key, data.get(self.board_key, []))
+                changes = data.get(self.changes_key) or {}
+                self._set_changes(changes.get('seq', 0), changes.get('pruned_seq', 0))
+                for record_id, (seq, archived) in changes.get('removed', {}).items():
+                    self._tombstone(int(record_id), seq, archived)
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to import {self.records_key}: {str(e)}")
+        self._publish(self.replaced_event)
+
+    def export_meta(self) -> dict:
+        """Counter and board settings, keyed as in the JSON file format"""
+        return {
+            self.counter_key: self.counter,
+            self.channel_key: self.channel_id,
+            self.board_key: self.board_state,
+            self.changes_key: {'seq': self.seq}
+        }
+
+    def check_since(self, since: int) -> None:
+        """Make sure every change after ``since`` is still tracked"""
+        pruned_seq = self.pruned_seq
+        if since < pruned_seq:
+            raise StorageError(
+                f"Changes to {self.records_key} before {pruned_seq} are no longer tracked, "
+                "make a full export instead"
+            )
+
+    def export_records(self, since: Optional[int] = None, batch_size: int = 500) -> Iterator[dict]:
+        """Serialize the records one at a time, reading them in ID order in batches.
+
+        With ``since``, only records written after that sequence number.
+        """
+        if since is not None:
+            self.check_since(since)
+        last_id = 0
+        while True:
+            rows = self.conn.execute(
+                f"SELECT id, data FROM {self.table} WHERE id > ? AND seq > ? ORDER BY id LIMIT ?",
+                (last_id, -1 if since is None else since, batch_size)
+            ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield json.loads(row[1])
+            last_id = rows[-1][0]
+
+    def export_removed(self, since: int) -> List[Tuple[int, int, bool]]:
+        """Tombstones written after ``since`` as ``(id, seq, archived)``, oldest first"""
+        self.check_since(since)
+        rows = self.conn.execute(
+            f"SELECT id, seq, archived FROM {self.table}_removed WHERE seq > ? ORDER BY seq",
+            (since,)
+        )
+        return [(row[0], row[1], bool(row[2])) for row in rows]
+
+    def prune_removed(self, upto: int) -> None:
+        """Forget tombstones up to ``upto``; deltas can't start before it anymore"""
+        try:
+            with self._transaction():
+                self.conn.execute(f"DELETE FROM {self.table}_removed WHERE seq <= ?", (upto,))
+                self._set_changes(self.seq, max(self.pruned_seq, upto))
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to prune {self.records_key}: {str(e)}")
+
+    def stage_import(self) -> 'SqliteStagedImport':
+        """Start an import that replaces the store once it is committed"""
+        return SqliteStagedImport(self)
+
+    def reset(self) -> None:
+        """Remove every record and reset the ID counter"""
+        try:
+            with self._transaction():
+                self._clear()
+                self._set_meta(self.counter_key, 0)
+                # Nothing before the reset can be expressed as a delta
+                seq = self._next_seq()
+                self._set_changes(seq, seq)
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to reset {self.records_key}: {str(e)}")
+        self.archive.clear()
+        self._publish(self.replaced_event)
+
+    def _clear(self) -> None:
+        self.conn.execute(f"DELETE FROM {self.table}")
+        self.conn.execute(f"DELETE FROM {self.members_table}")
+        self.conn.execute(f"DELETE FROM {self.table}_removed")
+
+    async def flush(self) -> None:
+        """Wait until every change made so far has been committed"""
+        loop = asyncio.get_running_loop()
+        if not await loop.run_in_executor(None, self.db.writer.flush):
+            raise StorageError(f"Failed to flush {self.records_key}: {self.db.writer.last_error}")
+
+    def close(self) -> None:
+        """Commit pending changes and release the database connection"""
+        try:
+            self.db.release(self.archive)
+        finally:
+            self.archive.close()
+            self._publish(self.unloaded_event)
+
+class SqliteStagedImport(BaseStagedImport):
+    """Stages imported records in a temporary table, copied over in one transaction"""
+
+    def __init__(self, store: SqliteBaseStore):
+        super().__init__(store)
+        self.table = f"staged_{store.table}"
+        with store._lock:
+            store.conn.execute(f"DROP TABLE IF EXISTS temp.{self.table}")
+            store.conn.execute(
+                f"CREATE TEMP TABLE {self.table} (id INTEGER PRIMARY KEY, data TEXT NOT NULL)"
+            )
+
+    def _stage(self, record: Any) -> None:
+        with self.store._lock:
+            self.store.conn.execute(
+                f"INSERT OR REPLACE INTO temp.{self.table} (id, data) VALUES (?, ?)",
+                (record.id, json.dumps(record.to_dict()))
+            )
+
+    def _unstage(self, record_id: int) -> None:
+        with self.store._lock:
+            self.store.conn.execute(f"DELETE FROM temp.{self.table} WHERE id = ?", (record_id,))
+
+    def _swap(self) -> None:
+        store = self.store
+        try:
+            with store._transaction():
+                store._clear()
+                rows = store.conn.execute(f"SELECT data FROM temp.{self.table} ORDER BY id")
+                for row in rows:
+                    store._write(store.record_type.from_dict(json.loads(row[0])))
+                store._set_meta(store.counter_key, self.counter)
+                store._set_meta(store.channel_key, self.channel_id)
+                store._set_meta(store.board_key, self.board_state)
+                # Deltas taken before the import don't apply to the new records
+                store._set_changes(max(store.seq, self.seq), 0)
+                seq = store._next_seq()
+                store._set_changes(seq, seq)
+                store.conn.execute(f"DROP TABLE temp.{self.table}")
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to import {store.records_key}: {str(e)}")
+        store._publish(store.replaced_event)
+
+    def _discard(self) -> None:
+        # Rolling back would also drop the store's changes waiting for their commit
+        with self.store._lock:
+            self.store.conn.execute(f"DROP TABLE IF EXISTS temp.{self.table}")
+
+class SqliteMeetingStore(SqliteBaseStore):
+    record_type = Meeting
+    record_name = "Meeting"
+    table = "meetings"
+    members_table = "meeting_participants"
+    members_attr = "participants"
+    summary_type = MeetingSummary
+    records_key = "meetings"
+    counter_key = "meeting_counter"
+    channel_key = "meeting_channel_id"
+    board_key = "meeting_board_messages"
+    changes_key = "meeting_changes"
+    created_event = MeetingCreated
+    updated_event = MeetingUpdated
+    deleted_event = MeetingDeleted
+    channel_event = MeetingChannelChanged
+    replaced_event = MeetingsReplaced
+    unloaded_event = MeetingsUnloaded
+
+    def _create_schema(self) -> None:
+        super()._create_schema()
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS meetings ("
+            "id INTEGER PRIMARY KEY, data TEXT NOT NULL, start_ts REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_meetings_start ON meetings (start_ts)")
+
+    def _index_columns(self, meeting: Meeting) -> Dict[str, Any]:
+        return {'start_ts': _timestamp(meeting.start_time)}
+
+    @property
+    def meetings(self) -> Dict[int, Meeting]:
+        return self.records
+
+    @property
+    def meeting_counter(self) -> int:
+        return self.counter
+
+    @property
+    def meeting_channel_id(self) -> Optional[int]:
+        return self.channel_id
+
+    def add_meeting(self, meeting: Meeting) -> None:
+        """Add a new meeting to storage"""
+        self._add(meeting)
+
+    def update_meeting(self, meeting_id: int, **kwargs) -> Meeting:
+        """Update an existing meeting"""
+        return self._update(meeting_id, **kwargs)
+
+    def set_rsvp(self, meeting_id: int, user_id: int, response: str) -> Meeting:
+        """Record a participant's RSVP response"""
+        meeting = self._get(meeting_id)
+        meeting.rsvp_status[user_id] = response
+        self._rewrite(meeting)
+        self._publish(RSVPChanged, meeting, frozenset({'rsvp_status'}), user_id, response)
+        return meeting
+
+    def delete_meeting(self, meeting_id: int) -> Meeting:
+        """Delete a meeting"""
+        return self._delete(meeting_id)
+
+    def get_meeting(self, meeting_id: int) -> Meeting:
+        """Get a meeting by ID, including archived ones"""
+        return self._get_or_archived(meeting_id)
+
+    def get_all_meetings(self) -> Dict[int, Meeting]:
+        """Get all meetings"""
+        return self.records
+
+    def get_meeting_summaries(self) -> List[MeetingSummary]:
+        """Get the search fields of every meeting, ordered by ID, without building them"""
+        return self._summaries()
+
+    def get_meetings_between(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[Meeting]:
+        """Get meetings starting within [start, end), sorted by start time"""
+        return self._query(
+            "WHERE start_ts >= ? AND start_ts < ?",
+            (
+                _timestamp(start) if start else float('-inf'),
+                _timestamp(end) if end else float('inf')
+            ),
+            order="start_ts, id"
+        )
+
+    def archive_meetings(self, before: datetime) -> List[Meeting]:
+        """Archive meetings that ended before the given time"""
+        return self._archive([
+            meeting for meeting in self.get_meetings_between(None, before)
+            if meeting.start_time + timedelta(minutes=meeting.duration) < before
+        ])
+
+class SqliteTaskStore(SqliteBaseStore):
+    record_type = Task
+    record_name = "Task"
+    table = "tasks"
+    members_table = "task_assignees"
+    members_attr = "assigned_users"
+    summary_type = TaskSummary
+    records_key = "tasks"
+    counter_key = "task_counter"
+    channel_key = "task_channel_id"
+    board_key = "task_board_messages"
+    changes_key = "task_changes"
+    created_event = TaskCreated
+    updated_event = TaskUpdated
+    deleted_event = TaskDeleted
+    channel_event = TaskChannelChanged
+    replaced_event = TasksReplaced
+    unloaded_event = TasksUnloaded
+
+    def _create_schema(self) -> None:
+        super()._create_schema()
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            "id INTEGER PRIMARY KEY, data TEXT NOT NULL, status TEXT NOT NULL, due_ts REAL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_due ON tasks (due_ts)")
+
+    def _index_columns(self, task: Task) -> Dict[str, Any]:
+        return {'status': task.status, 'due_ts': _timestamp(task.due_date)}
+
+    @property
+    def tasks(self) -> Dict[int, Task]:
+        return self.records
+
+    @property
+    def task_counter(self) -> int:
+        return self.counter
+
+    @property
+    def task_channel_id(self) -> Optional[int]:
+        return self.channel_id
+
+    def add_task(self, task: Task) -> None:
+        """Add a new task to storage"""
+        self._add(task)
+
+    def update_task(self, task_id: int, **kwargs) -> Task:
+        """Update an existing task"""
+        return self._update(task_id, **kwargs)
+
+    def update_tasks(self, updates: Dict[int, dict]) -> List[Task]:
+        """Update several tasks in one transaction"""
+        return self._update_many(updates)
+
+    def update_many(self, task_filter: TaskFilter, **changes) -> List[Task]:
+        """Apply the same changes to every task matching a filter, in one transaction"""
+        return self._update_many({task.id: changes for task in self.find_tasks(task_filter)})
+
+    def delete_task(self, task_id: int) -> Task:
+        """Delete a task"""
+        return self._delete(task_id)
+
+    def delete_many(self, task_filter: TaskFilter) -> List[Task]:
+        """Delete every task matching a filter, in one transaction"""
+        return self._delete_many([task.id for task in self.find_tasks(task_filter)])
+
+    def get_task(self, task_id: int) -> Task:
+        """Get a task by ID, including archived ones"""
+        return self._get_or_archived(task_id)
+
+    def get_all_tasks(self) -> Dict[int, Task]:
+        """Get all tasks"""
+        return self.records
+
+    def get_task_summaries(self) -> List[TaskSummary]:
+        """Get the search fields of every task, ordered by ID, without building them"""
+        return self._summaries()
+
+    def get_tasks_by_status(self, status: str) -> List[Task]:
+        """Get tasks with the given status, ordered by ID"""
+        return self._query("WHERE status = ?", (status,))
+
+    def get_tasks_by_assignee(self, user_id: int, role_ids: Iterable[int] = ()) -> List[Task]:
+        """Get tasks assigned to a user directly or through one of ``role_ids``, ordered by ID"""
+        targets = member_targets(user_id, role_ids)
+        return self._query(
+            "WHERE id IN (SELECT record_id FROM task_assignees "
+            f"WHERE user_id IN ({', '.join('?' * len(targets))}))",
+            tuple(targets)
+        )
+
+    def get_tasks_due_between(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[Task]:
+        """Get tasks due within [start, end), sorted by due date"""
+        return self._query(
+            "WHERE due_ts IS NOT NULL AND due_ts >= ? AND due_ts < ?",
+            (
+                _timestamp(start) if start else float('-inf'),
+                _timestamp(end) if end else float('inf')
+            ),
+            order="due_ts, id"
+        )
+
+    def find_tasks(self, task_filter: TaskFilter) -> List[Task]:
+        """Get the tasks matching a filter, ordered by ID"""
+        clauses = []
+        params = []
+        if task_filter.status is not None:
+            clauses.append("status = ?")
+            params.append(task_filter.status)
+        if task_filter.assignee is not None:
+            targets = task_filter.assignee_targets
+            clauses.append(
+                "id IN (SELECT record_id FROM task_assignees "
+                f"WHERE user_id IN ({', '.join('?' * len(targets))}))"
+            )
+            params.extend(targets)
+        if task_filter.has_due_range:
+            clauses.append("due_ts IS NOT NULL AND due_ts >= ? AND due_ts < ?")
+            params.append(_timestamp(task_filter.due_from) if task_filter.due_from else float('-inf'))
+            params.append(_timestamp(task_filter.due_to) if task_filter.due_to else float('inf'))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._query(where, tuple(params))
+
+    def get_tasks_with_threads(self) -> List[Task]:
+        """Get tasks that have a discussion thread, ordered by ID"""
+        return self._query("WHERE json_extract(data, '$.thread_id') IS NOT NULL")
+
+    def get_overdue_tasks(self, now: Optional[datetime] = None) -> List[Task]:
+        """Get tasks whose due date has passed, oldest first"""
+        return self.get_tasks_due_between(None, now or datetime.now())
+
+    def archive_tasks(self, status: str, before: datetime) -> List[Task]:
+        """Archive tasks in ``status`` that were completed before the given time.
+
+        Tasks finished before completion times were recorded get one now,
+        so they are archived once they have aged like any other.
+        """
+        old = []
+        unstamped = {}
+        for task in self.get_tasks_by_status(status):
+            if task.completed_at is None:
+                unstamped[task.id] = {'completed_at': datetime.now()}
+            elif task.completed_at < before:
+                old.append(task)
+        if unstamped:
+            self.update_tasks(unstamped)
+        return self._archive(old)
@@ -0,0 +1,340 @@
+"""Streaming export and import of a guild's tasks and meetings.
+
+Exports are NDJSON, one JSON object per line, optionally gzipped:
+
+    {"type": "header", "format": "nibblix", "version": 1}
+    {"type": "meta", "data": {"task_counter": 12, "task_channel_id": ..., ...}}
+    {"type": "task", "data": {...Task.to_dict()...}}
+    {"type": "meeting", "data": {...Meeting.to_dict()...}, "archived": true}
+
+The header carries the highest change sequence number (``seq``) of the
+export. A delta export (``since`` in the header) only holds the records
+written after that sequence number, plus tombstones for deleted ones:
+
+    {"type": "tombstone", "kind": "task", "id": 7, "seq": 1718000000000000}
+
+A full export followed by deltas whose ``since`` each match the previous
+file's ``seq`` restores to the state of the last one (``restore_chain``).
+
+Records are written and read one line at a time, so neither direction
+ever holds the whole file as a string or a parsed dict. An import is
+staged next to the live stores and only swapped in once every line has
+been validated, so a bad file leaves the stores untouched. Both
+directions hand control back to the event loop every ``EXPORT_CHUNK``
+lines.
+"""
+import asyncio
+import gzip
+import io
+import json
+from typing import Any, IO, Iterable, Iterator, NamedTuple, Optional, Tuple
+from core.archive import Archive
+from core.exceptions import InvalidTaskDataError, StorageError
+
+FORMAT = "nibblix"
+VERSION = 1
+# Records written between two yields to the event loop during an export
+EXPORT_CHUNK = 500
+REQUIRED_META = ['task_counter', 'task_channel_id', 'meeting_counter', 'meeting_channel_id']
+
+def _line(entry: dict) -> bytes:
+    return json.dumps(entry, separators=(',', ':')).encode('utf-8') + b'\n'
+
+class ExportResult(NamedTuple):
+    tasks: int
+    meetings: int
+    removed: int
+    seq: int
+
+def _changed_entries(kind: str, store: Any, since: Optional[int]) -> Iterator[dict]:
+    if since is None:
+        for record in store.export_records():
+            yield {'type': kind, 'data': record}
+        for record in store.archive.records():
+            yield {'type': kind, 'data': record, 'archived': True}
+        return
+
+    for record in store.export_records(since):
+        yield {'type': kind, 'data': record}
+    for record_id, seq, archived in store.export_removed(since):
+        record = store.archive.get(record_id) if archived else None
+        if record is not None:
+            yield {'type': kind, 'data': record, 'archived': True}
+        else:
+            yield {'type': 'tombstone', 'kind': kind, 'id': record_id, 'seq': seq}
+
+async def write_export(
+    fileobj: IO[bytes],
+    task_store: Any,
+    meeting_store: Any,
+    compress: bool = True,
+    since: Optional[int] = None
+) -> ExportResult:
+    """Write both stores of a guild to ``fileobj`` as NDJSON.
+
+    Without ``since`` every record is written, archived ones included;
+    with it only the changes after that sequence number.
+    """
+    # Taken first: anything written while exporting is included again next time
+    seq = max(task_store.seq, meeting_store.seq)
+    if since is not None:
+        task_store.check_since(since)
+        meeting_store.check_since(since)
+
+    out = gzip.GzipFile(fileobj=fileobj, mode='wb') if compress else fileobj
+    counts = {'task': 0, 'meeting': 0, 'tombstone': 0}
+    try:
+        header = {'type': 'header', 'format': FORMAT, 'version': VERSION, 'seq': seq}
+        if since is not None:
+            header['since'] = since
+        out.write(_line(header))
+        written = 0
+        for kind, store in (('task', task_store), ('meeting', meeting_store)):
+            out.write(_line({'type': 'meta', 'data': store.export_meta()}))
+            for entry in _changed_entries(kind, store, since):
+                out.write(_line(entry))
+                counts[entry['type']] += 1
+                written += 1
+                if written % EXPORT_CHUNK == 0:
+                    await asyncio.sleep(0)
+    finally:
+        if compress:
+            # Only finishes the gzip stream, fileobj stays open
+            out.close()
+    return ExportResult(counts['task'], counts['meeting'], counts['tombstone'], seq)
+
+def read_ndjson(fileobj: IO[bytes]) -> Iterator[Tuple[int, dict]]:
+    """Parse an NDJSON export line by line, gzipped or not"""
+    if fileobj.read(2) == b'\x1f\x8b':
+        fileobj.seek(0)
+        fileobj = gzip.GzipFile(fileobj=fileobj, mode='rb')
+    else:
+        fileobj.seek(0)
+    for number, line in enumerate(io.TextIOWrapper(fileobj, encoding='utf-8'), 1):
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise InvalidTaskDataError(f"Line {number}: invalid JSON ({e.msg})")
+        if not isinstance(entry, dict):
+            raise InvalidTaskDataError(f"Line {number}: expected a JSON object")
+        yield number, entry
+
+def read_legacy_json(fileobj: IO[bytes]) -> Iterator[Tuple[int, dict]]:
+    """Read an export in the older single-document JSON format as NDJSON entries"""
+    try:
+        data = json.load(io.TextIOWrapper(fileobj, encoding='utf-8'))
+    except json.JSONDecodeError as e:
+        raise InvalidTaskDataError(f"Invalid JSON file format ({e.msg})")
+    if not isinstance(data, dict):
+        raise InvalidTaskDataError("Invalid database format")
+
+    yield 0, {'type': 'header', 'format': FORMAT, 'version': VERSION}
+    yield 0, {'type': 'meta', 'data': {
+        key: value for key, value in data.items() if key not in ('tasks', 'meetings')
+    }}
+    for kind, key in (('task', 'tasks'), ('meeting', 'meetings')):
+        records = data.get(key) or {}
+        if not isinstance(records, dict):
+            raise InvalidTaskDataError(f"Invalid database format: '{key}' must be an object")
+        for record in records.values():
+            yield 0, {'type': kind, 'data': record}
+
+class BaseStagedImport:
+    """Records of one store being imported, swapped in by ``commit``.
+
+    Subclasses decide where live records are staged (``_stage``,
+    ``_unstage``) and how they replace the store's content (``_swap``).
+    Archived records are staged in an archive next to the live one and
+    swapped in with it.
+    """
+
+    # Staged archives of the imports in progress, one import per store at a time
+    _active = set()
+
+    def __init__(self, store: Any):
+        path = f"{store.archive.path}.import"
+        if path in BaseStagedImport._active:
+            raise StorageError("An import into this server is already running")
+        BaseStagedImport._active.add(path)
+        self.store = store
+        self.count = 0
+        self.archived = 0
+        self.counter = 0
+        self.channel_id = None
+        self.board_state = []
+        self.staged_archive = Archive(path)
+        # Leftovers of an import that was interrupted
+        self.staged_archive.clear()
+        self.seq = 0
+        self._ids = set()
+        self._archive_batch = []
+        self._max_id = 0
+
+    def add(self, data: Any, archived: bool = False, where: str = "", replace: bool = False) -> None:
+        """Validate one record of the import file and stage it.
+
+        With ``replace`` (deltas of a restore) a record staged earlier is
+        overwritten instead of being rejected as a duplicate.
+        """
+        name = self.store.record_name
+        if not isinstance(data, dict):
+            raise InvalidTaskDataError(f"{where}: {name.lower()} data must be an object")
+        try:
+            record = self.store.record_type.from_dict(dict(data))
+        except KeyError as e:
+            raise InvalidTaskDataError(f"{where}: {name.lower()} is missing {str(e)}")
+        except (TypeError, ValueError, AttributeError) as e:
+            raise InvalidTaskDataError(f"{where}: invalid {name.lower()} ({str(e)})")
+        if not isinstance(record.id, int) or record.id < 1:
+            raise InvalidTaskDataError(f"{where}: invalid {name.lower()} ID {record.id!r}")
+        self._max_id = max(self._max_id, record.id)
+        self.seq = max(self.seq, record.seq)
+
+        if archived:
+            self.remove(record.id)
+            self._archive_batch.append(record.to_dict())
+            if len(self._archive_batch) >= EXPORT_CHUNK:
+                self._flush_archive()
+            return
+        if record.id in self._ids and not replace:
+            raise InvalidTaskDataError(f"{where}: duplicate {name.lower()} ID {record.id}")
+        self._ids.add(record.id)
+        self._stage(record)
+
+    def remove(self, record_id: Any, where: str = "") -> None:
+        """Drop a staged record, for tombstones of a restore"""
+        if not isinstance(record_id, int):
+            raise InvalidTaskDataError(f"{where}: invalid {self.store.record_name.lower()} ID {record_id!r}")
+        if record_id in self._ids:
+            self._ids.discard(record_id)
+            self._unstage(record_id)
+
+    def _flush_archive(self) -> None:
+        self.staged_archive.append(self._archive_batch)
+        self._archive_batch = []
+
+    def finish(self, meta: dict) -> None:
+        """Take the counter and board settings from the import's metadata"""
+        counter = meta.get(self.store.counter_key) or 0
+        if not isinstance(counter, int):
+            raise InvalidTaskDataError(f"Invalid {self.store.counter_key}: {counter!r}")
+        # Never hand out an ID that is already taken
+        self.counter = max(counter, self._max_id)
+        self.channel_id = meta.get(self.store.channel_key)
+        self.board_state = meta.get(self.store.board_key) or []
+        self.seq = max(self.seq, (meta.get(self.store.changes_key) or {}).get('seq') or 0)
+        self._flush_archive()
+        self.count = len(self._ids)
+        self.archived = len(self.staged_archive)
+
+    def commit(self) -> None:
+        """Replace the store's records and archive with the staged ones"""
+        try:
+            self._swap()
+            self.store.archive.replace_with(self.staged_archive)
+        finally:
+            BaseStagedImport._active.discard(self.staged_archive.path)
+
+    def abort(self) -> None:
+        """Throw the staged records away"""
+        try:
+            self._discard()
+            self.staged_archive.clear()
+        finally:
+            BaseStagedImport._active.discard(self.staged_archive.path)
+
+    def _stage(self, record: Any) -> None:
+        raise NotImplementedError
+
+    def _unstage(self, record_id: int) -> None:
+        raise NotImplementedError
+
+    def _swap(self) -> None:
+        raise NotImplementedError
+
+    def _discard(self) -> None:
+        raise NotImplementedError
+
+class ImportResult(NamedTuple):
+    tasks: int
+    meetings: int
+    archived: int
+
+async def import_entries(entries: Iterable[Tuple[int, dict]], task_store: Any, meeting_store: Any) -> ImportResult:
+    """Stage every entry of a full export, then swap both stores in.
+
+    Any invalid entry raises ``InvalidTaskDataError`` before either store
+    has been touched.
+    """
+    return await restore_chain([entries], task_store, meeting_store)
+
+async def restore_chain(files: Iterable[Iterable[Tuple[int, dict]]], task_store: Any, meeting_store: Any) -> ImportResult:
+    """Replay a full export and the deltas that follow it, then swap both stores in.
+
+    The first file must be a full export and every later one a delta
+    starting where the previous file ended. Nothing is changed unless the
+    whole chain is valid.
+    """
+    stages = {}
+    try:
+        stages['task'] = task_store.stage_import()
+        stages['meeting'] = meeting_store.stage_import()
+        meta = {}
+        previous_seq = None
+        read = 0
+        for entries in files:
+            header = None
+            for number, entry in entries:
+                read += 1
+                if read % EXPORT_CHUNK == 0:
+                    await asyncio.sleep(0)
+                where = f"Line {number}" if number else "File"
+                kind = entry.get('type')
+                if header is None:
+                    header = _check_header(entry, where, previous_seq)
+                elif kind == 'meta' and isinstance(entry.get('data'), dict):
+                    meta.update(entry['data'])
+                elif kind in stages:
+                    stages[kind].add(
+                        entry.get('data'), bool(entry.get('archived')), where, replace=previous_seq is not None
+                    )
+                elif kind == 'tombstone' and previous_seq is not None and entry.get('kind') in stages:
+                    stages[entry['kind']].remove(entry.get('id'), where)
+                else:
+                    raise InvalidTaskDataError(f"{where}: unexpected entry {kind!r}")
+            if header is None:
+                raise InvalidTaskDataError("The file is empty")
+            previous_seq = header.get('seq') or 0
+
+        if previous_seq is None:
+            raise InvalidTaskDataError("Nothing to import")
+        if not all(key in meta for key in REQUIRED_META):
+            raise InvalidTaskDataError("Invalid database format. File is missing required data.")
+        for stage in stages.values():
+            stage.finish(meta)
+    except Exception:
+        for stage in stages.values():
+            stage.abort()
+        raise
+
+    for stage in stages.values():
+        stage.commit()
+    return ImportResult(
+        stages['task'].count,
+        stages['meeting'].count,
+        stages['task'].archived + stages['meeting'].archived
+    )
+
+def _check_header(entry: dict, where: str, previous_seq: Optional[int]) -> dict:
+    if entry.get('type') != 'header' or entry.get('format') != FORMAT:
+        raise InvalidTaskDataError(f"{where}: not a Nibblix export")
+    if entry.get('version') != VERSION:
+        raise InvalidTaskDataError(f"Unsupported export version {entry.get('version')}")
+    since = entry.get('since')
+    if previous_seq is None and since is not None:
+        raise InvalidTaskDataError("This is an incremental export, restore it on top of its full export")
+    if previous_seq is not None and since != previous_seq:
+        raise InvalidTaskDataError(f"The export since {since} doesn't continue the previous one (seq {previous_seq})")
+    return entry
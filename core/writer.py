@@ -0,0 +1,139 @@
+import json
+import os
+import threading
+import time
+from typing import Callable, Optional
+from core.exceptions import StorageError
+
+def atomic_write_json(path: str, data: dict, indent: Optional[int] = 4) -> None:
+    """Write JSON to a temp file and rename it over ``path``.
+
+    A crash mid-write leaves the previous file untouched instead of a
+    truncated one.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def atomic_write_bytes(path: str, data: bytes) -> None:
+    """Binary counterpart of ``atomic_write_json``"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+class BackgroundWriter:
+    """Dedicated thread that persists a store's dirty state off the event loop.
+
+    Mutations only call ``mark_dirty``. The thread waits at most
+    ``flush_delay`` seconds after the first unsaved change, then calls
+    ``write_fn`` once for everything that piled up in the meantime.
+    """
+
+    def __init__(self, name: str, write_fn: Callable[[], None], flush_delay: float = 1.0):
+        self.write_fn = write_fn
+        self.flush_delay = flush_delay
+        self.writes: int = 0
+        self.last_error: Optional[Exception] = None
+        self._cond = threading.Condition()
+        self._generation: int = 0
+        self._written: int = 0
+        self._failures: int = 0
+        self._dirty_since: Optional[float] = None
+        self._flush_requested = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=f"store-writer:{name}", daemon=True)
+        self._thread.start()
+
+    def mark_dirty(self) -> None:
+        """Schedule a write that will happen within ``flush_delay`` seconds"""
+        with self._cond:
+            self._generation += 1
+            if self._dirty_since is None:
+                self._dirty_since = time.monotonic()
+                self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every change marked so far is on disk.
+
+        Returns False if the timeout expired, a write failed or the writer
+        was closed first.
+        """
+        with self._cond:
+            target = self._generation
+            if self._written >= target:
+                return True
+            failures = self._failures
+            self._flush_requested = True
+            self._cond.notify_all()
+            self._cond.wait_for(
+                lambda: (
+                    self._written >= target
+                    or self._failures > failures
+                    or not self._thread.is_alive()
+                ),
+                timeout
+            )
+            return self._written >= target
+
+    def close(self) -> None:
+        """Write any pending changes and stop the thread.
+
+        A final write that still fails after one retry raises
+        ``StorageError``, the changes it held are not on disk.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        if self._written < self._generation:
+            raise StorageError(f"Failed to write pending changes on close: {self.last_error}")
+
+    def _run(self) -> None:
+        retried = False
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._dirty_since is not None or self._closed)
+                if self._dirty_since is None:
+                    return
+
+                deadline = self._dirty_since + self.flush_delay
+                while not self._flush_requested and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                generation = self._generation
+                self._dirty_since = None
+                self._flush_requested = False
+
+            try:
+                self.write_fn()
+                self.writes += 1
+                self.last_error = None
+            except Exception as e:
+                # Keep the state dirty so the next cycle retries the write
+                print(f"Background store write failed: {e}")
+                self.last_error = e
+                with self._cond:
+                    self._failures += 1
+                    self._cond.notify_all()
+                    if self._dirty_since is None:
+                        self._dirty_since = time.monotonic()
+                    if self._closed:
+                        # Closing: retry once right away, then give up
+                        if retried:
+                            print(f"Background store write failed again on close, changes lost: {e}")
+                            return
+                        retried = True
+                continue
+
+            with self._cond:
+                self._written = generation
+                self._cond.notify_all()
@@ -0,0 +1,159 @@
+import os
+import re
+import tempfile
+from typing import List, NamedTuple, Optional, Set
+from core.events import StoreEvent, StoreUnloaded
+from core.exceptions import StorageError
+from core.transfer import ImportResult, read_ndjson, restore_chain, write_export
+
+class BackupFile(NamedTuple):
+    seq: int
+    since: Optional[int]
+    path: str
+
+class BackupManager:
+    """Rotating full-plus-incremental backups of every guild's data.
+
+    Each guild gets a directory of gzipped NDJSON exports named after the
+    sequence number they end at. A full export starts a chain and every
+    later run adds a delta of the changes since the previous file, until
+    ``full_every`` files make a chain and the next run starts a new one.
+    Only the newest ``retention`` chains are kept. A run only visits the
+    guilds whose shards are loaded or changed since the previous run, plus
+    the ones without any backup yet.
+    """
+    _NAME = re.compile(r"^(\d{20})-(?:full|delta-(\d{20}))\.ndjson\.gz$")
+
+    def __init__(self, bot, backup_dir: str, full_every: int, retention: int):
+        self.bot = bot
+        self.backup_dir = backup_dir
+        self.full_every = max(1, full_every)
+        self.retention = max(1, retention)
+        # Guilds whose stores changed since their last backup, they may be unloaded by now
+        self._changed: Set[int] = set()
+        bot.events.subscribe(StoreEvent, self.on_store_event)
+
+    def on_store_event(self, event: StoreEvent) -> None:
+        if event.guild_id is not None and not isinstance(event, StoreUnloaded):
+            self._changed.add(event.guild_id)
+
+    def guild_dir(self, guild_id: int) -> str:
+        return os.path.join(self.backup_dir, str(guild_id))
+
+    def files(self, guild_id: int) -> List[BackupFile]:
+        """Backup files of a guild, oldest first"""
+        path = self.guild_dir(guild_id)
+        if not os.path.isdir(path):
+            return []
+        files = []
+        for name in sorted(os.listdir(path)):
+            match = self._NAME.match(name)
+            if match:
+                since = int(match.group(2)) if match.group(2) else None
+                files.append(BackupFile(int(match.group(1)), since, os.path.join(path, name)))
+        return files
+
+    def chains(self, guild_id: int) -> List[List[BackupFile]]:
+        """Group the backup files into a full export followed by its deltas"""
+        chains = []
+        for file in self.files(guild_id):
+            if file.since is None:
+                chains.append([file])
+            elif chains and chains[-1][-1].seq == file.since:
+                chains[-1].append(file)
+        return chains
+
+    async def backup_guild(self, guild_id: int) -> Optional[BackupFile]:
+        """Write the next backup file of a guild, or None if nothing changed"""
+        task_store = self.bot.task_manager.store_for(guild_id)
+        meeting_store = self.bot.meeting_manager.store_for(guild_id)
+        chains = self.chains(guild_id)
+        last = chains[-1] if chains else None
+        if last and max(task_store.seq, meeting_store.seq) == last[-1].seq:
+            return None
+
+        since = None
+        if last and len(last) < self.full_every:
+            since = last[-1].seq
+            try:
+                task_store.check_since(since)
+                meeting_store.check_since(since)
+            except StorageError:
+                # Tombstones were pruned or the data was replaced, start over
+                since = None
+
+        directory = self.guild_dir(guild_id)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                result = await write_export(f, task_store, meeting_store, since=since)
+                f.flush()
+                os.fsync(f.fileno())
+            name = f"{result.seq:020d}-full" if since is None else f"{result.seq:020d}-delta-{since:020d}"
+            path = os.path.join(directory, f"{name}.ndjson.gz")
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self.rotate(guild_id)
+        return BackupFile(result.seq, since, path)
+
+    def rotate(self, guild_id: int) -> None:
+        """Delete chains beyond the retention and the tombstones only they needed"""
+        chains = self.chains(guild_id)
+        kept = chains[-self.retention:]
+        for chain in chains[:-self.retention]:
+            for file in chain:
+                os.remove(file.path)
+        # Orphaned deltas whose chain is gone can never be restored
+        kept_paths = {file.path for chain in kept for file in chain}
+        for file in self.files(guild_id):
+            if file.path not in kept_paths:
+                os.remove(file.path)
+
+        if kept:
+            # Deltas only ever start at a seq inside the newest chain
+            upto = kept[-1][0].seq
+            self.bot.task_manager.store_for(guild_id).prune_removed(upto)
+            self.bot.meeting_manager.store_for(guild_id).prune_removed(upto)
+
+    async def backup_all(self) -> None:
+        """Back up every guild that may have changed since the previous run"""
+        candidates = self._changed
+        self._changed = set()
+        candidates.update(self.bot.task_stores.loaded_ids())
+        candidates.update(self.bot.meeting_stores.loaded_ids())
+        for guild in self.bot.guilds:
+            if guild.id not in candidates and self.files(guild.id):
+                continue
+            try:
+                backup = await self.backup_guild(guild.id)
+                if backup:
+                    kind = "full" if backup.since is None else "incremental"
+                    print(f"Wrote {kind} backup {backup.seq} of {guild.name}")
+            except Exception as e:
+                # Retry on the next run even if the shard is unloaded by then
+                self._changed.add(guild.id)
+                print(f"Error backing up {guild.name}: {e}")
+
+    async def restore(self, guild_id: int) -> ImportResult:
+        """Replace a guild's data with its newest backup chain"""
+        chains = self.chains(guild_id)
+        if not chains:
+            raise StorageError("There are no backups of this server yet")
+
+        files = [open(file.path, 'rb') for file in chains[-1]]
+        try:
+            task_store = self.bot.task_manager.store_for(guild_id)
+            meeting_store = self.bot.meeting_manager.store_for(guild_id)
+            result = await restore_chain([read_ndjson(f) for f in files], task_store, meeting_store)
+        finally:
+            for f in files:
+                f.close()
+
+        await task_store.flush()
+        await meeting_store.flush()
+        return result
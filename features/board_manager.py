@@ -9,7 +9,10 @@ class BoardManager:
     
     async def handle_message(self, message: discord.Message) -> None:
         """Handle messages in the task board channel"""
-        if message.channel.id != self.task_manager.storage.task_channel_id:
+        if message.guild is None:
+            return
+            
+        if message.channel.id != self.task_manager.store_for(message.guild.id).task_channel_id:
             return
             
         if message.author == self.task_manager.bot.user:
@@ -0,0 +1,126 @@
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import List, Optional
+import discord
+
+@dataclass
+class BoardItem:
+    """One board message: a stable key, its embeds and an optional view"""
+    key: str
+    embeds: List[discord.Embed]
+    view: Optional[discord.ui.View] = None
+    fingerprint: str = field(init=False)
+
+    def __post_init__(self):
+        payload = {
+            'embeds': [embed.to_dict() for embed in self.embeds],
+            'components': self.view.to_components() if self.view else []
+        }
+        self.fingerprint = hashlib.sha1(
+            json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+        ).hexdigest()
+
+class BoardSync:
+    """Reconcile a board channel with freshly rendered messages.
+
+    The stored state is the ordered list of board messages, each with its
+    key, message ID and content fingerprint. Items are matched to messages
+    by key: a message is edited only when its item's fingerprint changed,
+    messages of keys no longer rendered are deleted and new keys are sent
+    at the end, so an unchanged item costs no API call wherever the others
+    moved. Messages can't be reordered, so once an item would have to go
+    before a message it follows, the remaining items reuse the remaining
+    messages in order instead.
+    """
+
+    def __init__(self, channel: discord.TextChannel):
+        self.channel = channel
+        self.api_calls: int = 0
+
+    async def sync(self, items: List[BoardItem], state: List[dict]) -> List[dict]:
+        """Bring the channel in line with ``items`` and return the new state"""
+        if not state:
+            return await self.rebuild(items)
+
+        # Leading items whose messages are already in the right order keep them
+        positions = {entry['key']: position for position, entry in enumerate(state)}
+        kept = 0
+        last = -1
+        for item in items:
+            position = positions.get(item.key)
+            if position is None or position < last:
+                break
+            kept += 1
+            last = position
+        kept_keys = {item.key for item in items[:kept]}
+
+        # The rest take the messages after the last kept one, in order
+        pairs = [(item, state[positions[item.key]]) for item in items[:kept]]
+        spare = state[last + 1:]
+        pairs += zip(items[kept:], spare)
+
+        new_state = []
+        for item, entry in pairs:
+            if entry['fingerprint'] != item.fingerprint:
+                try:
+                    await self.channel.get_partial_message(entry['message_id']).edit(
+                        embeds=item.embeds,
+                        view=item.view
+                    )
+                    self.api_calls += 1
+                except discord.NotFound:
+                    # Someone removed a board message, ordering can't be kept
+                    return await self.rebuild(items)
+            new_state.append(self._entry(item, entry['message_id']))
+
+        for item in items[kept + len(spare):]:
+            message = await self.channel.send(embeds=item.embeds, view=item.view)
+            self.api_calls += 1
+            new_state.append(self._entry(item, message.id))
+
+        removed = [entry for entry in state[:last + 1] if entry['key'] not in kept_keys]
+        removed += spare[len(items) - kept:]
+        for entry in removed:
+            try:
+                await self.channel.get_partial_message(entry['message_id']).delete()
+                self.api_calls += 1
+            except discord.NotFound:
+                pass
+
+        return new_state
+
+    async def update(self, items: List[BoardItem], state: List[dict]) -> List[dict]:
+        """Edit the messages of just these items, found by key, and return the new state.
+
+        Items without a message on the board are skipped, adding or removing
+        messages is left to ``sync``. Raises ``discord.NotFound`` when a
+        message was removed from the channel.
+        """
+        new_state = list(state)
+        positions = {entry['key']: position for position, entry in enumerate(state)}
+        for item in items:
+            position = positions.get(item.key)
+            if position is None or state[position]['fingerprint'] == item.fingerprint:
+                continue
+            message_id = state[position]['message_id']
+            await self.channel.get_partial_message(message_id).edit(embeds=item.embeds, view=item.view)
+            self.api_calls += 1
+            new_state[position] = self._entry(item, message_id)
+        return new_state
+
+    async def rebuild(self, items: List[BoardItem]) -> List[dict]:
+        """Clear the whole channel and send every item again"""
+        await self.channel.purge(limit=None)
+        self.api_calls += 1
+
+        new_state = []
+        for item in items:
+            message = await self.channel.send(embeds=item.embeds, view=item.view)
+            self.api_calls += 1
+            new_state.append(self._entry(item, message.id))
+        return new_state
+
+    @staticmethod
+    def _entry(item: BoardItem, message_id: int) -> dict:
+        return {'key': item.key, 'message_id': message_id, 'fingerprint': item.fingerprint}
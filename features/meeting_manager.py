@@ -1,37 +1,154 @@
 # === File: features/meeting_manager.py ===
+import asyncio
 from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Set
 import pytz
-from discord.ext import tasks, commands
+from discord.ext import commands
 import discord
 from core.persistence import MeetingStore
-from core.models import Meeting
+from core.shards import ShardedStore
+from core.events import (
+    MeetingCreated, MeetingDeleted, MeetingEvent, MeetingUpdated, MeetingsReplaced, MeetingsUnloaded
+)
+from core.models import Meeting, RSVPResponse, target_mention
+from core.exceptions import TaskNotFoundError
 from ui.meeting_views import RSVPView
+from features.board_sync import BoardItem, BoardSync
+from features.refresh_scheduler import RefreshScheduler
+from features.meeting_scheduler import MeetingScheduler, ScheduleIndex
+from utils.packing import MAX_FIELD_VALUE, join_truncated
+from config import MEETING_EVENT_GRACE_MINUTES, STORE_FLUSH_DELAY
 
 class MeetingManager:
-    def __init__(self, bot: commands.Bot, storage: MeetingStore):
+    # Meeting fields the scheduler's events depend on
+    SCHEDULE_FIELDS = frozenset({'start_time', 'reminder_sent', 'attendance_checked'})
+    # Bookkeeping flags the dashboard doesn't show
+    HIDDEN_FIELDS = frozenset({'reminder_sent', 'attendance_checked'})
+    # Fields deciding whether and where a meeting sits on the dashboard
+    LAYOUT_FIELDS = frozenset({'start_time'})
+
+    def __init__(self, bot: commands.Bot, stores: ShardedStore):
         self.bot = bot
-        self.storage = storage
+        self.stores = stores
         self.belgian_tz = pytz.timezone('Europe/Brussels')
-        self.check_meetings.start()
+        self.scheduler = MeetingScheduler(
+            dispatch=self.handle_meeting_event,
+            expire=self.expire_meeting_event,
+            now=self.get_belgian_time,
+            grace=timedelta(minutes=MEETING_EVENT_GRACE_MINUTES)
+        )
+        self.scheduler_task = asyncio.create_task(self.run_scheduler())
+        # Lets a restart schedule every guild's events without loading its meetings
+        self.schedule_index = ScheduleIndex(bot.guild_data_dir, STORE_FLUSH_DELAY)
+        # guild_id -> IDs of meetings whose dashboard message needs an edit
+        self._stale_meetings: Dict[int, Set[int]] = {}
+        self._board_locks: Dict[int, asyncio.Lock] = {}
+        # Persistent RSVP views by meeting ID, registered with the bot once each.
+        # They answer for the guild of the interaction, so guilds share them
+        self._rsvp_views: Dict[int, RSVPView] = {}
+        bot.events.subscribe(MeetingEvent, self.on_meeting_event)
         
     def get_belgian_time(self) -> datetime:
         """Get current time in Belgian timezone"""
         return datetime.now(self.belgian_tz)
+
+    def store_for(self, guild_id: int) -> MeetingStore:
+        """Get the meeting store of a guild"""
+        return self.stores.store_for(guild_id)
         
-    @tasks.loop(minutes=1)
-    async def check_meetings(self):
-        """Check for upcoming meetings and send notifications"""
-        current_time = self.get_belgian_time()
+    async def run_scheduler(self):
+        """Wait until the bot is ready, then run meeting events as they come due"""
+        await self.bot.wait_until_ready()
+        await self.scheduler.run()
+
+    def reschedule_all(self) -> None:
+        """Rebuild the event heap of every guild from its schedule index"""
+        for guild in self.bot.guilds:
+            entries = self.schedule_index.load(guild.id)
+            if entries is None:
+                # No index yet, build it from the meetings once
+                self.reschedule_guild(guild.id)
+            else:
+                self.scheduler.rebuild(guild.id, entries)
+
+    def reschedule_guild(self, guild_id: int) -> None:
+        """Replace the pending events and schedule index of a guild with its stored meetings"""
+        meetings = list(self.store_for(guild_id).get_all_meetings().values())
+        self.schedule_index.replace(guild_id, meetings)
+        self.scheduler.rebuild(guild_id, meetings)
+
+    def add_meeting(self, guild_id: int, meeting: Meeting) -> Meeting:
+        """Store a new meeting, its events are scheduled by ``on_meeting_event``"""
+        self.store_for(guild_id).add_meeting(meeting)
+        return meeting
+
+    def update_meeting(self, guild_id: int, meeting_id: int, **kwargs) -> Meeting:
+        """Update a meeting"""
+        return self.store_for(guild_id).update_meeting(meeting_id, **kwargs)
+
+    def delete_meeting(self, guild_id: int, meeting_id: int) -> Meeting:
+        """Delete a meeting"""
+        return self.store_for(guild_id).delete_meeting(meeting_id)
+
+    def archive_ended(self, guild_id: int, max_age: timedelta) -> List[Meeting]:
+        """Move meetings that ended more than ``max_age`` ago to the archive, if the shard is loaded"""
+        store = self.stores.peek(guild_id)
+        if store is None:
+            return []
+        return store.archive_meetings(self.get_belgian_time() - max_age)
+
+    def on_meeting_event(self, event: MeetingEvent) -> None:
+        """Keep the scheduler and the dashboard in step with the store"""
+        if isinstance(event, MeetingsUnloaded):
+            # An idle store was closed, its meetings didn't change
+            return
+        if isinstance(event, MeetingCreated):
+            self.schedule_index.put(event.guild_id, event.record)
+            self.scheduler.schedule(event.guild_id, event.record)
+        elif isinstance(event, MeetingUpdated):
+            if event.changed & self.SCHEDULE_FIELDS:
+                self.schedule_index.put(event.guild_id, event.record)
+                self.scheduler.schedule(event.guild_id, event.record)
+            if event.changed <= self.HIDDEN_FIELDS:
+                return
+            if not event.changed & self.LAYOUT_FIELDS:
+                # RSVPs and edits only touch the meeting's own message
+                guild = self.bot.get_guild(event.guild_id)
+                if guild:
+                    self.schedule_meeting_update(guild, event.record.id)
+                return
+        elif isinstance(event, MeetingDeleted):
+            self.schedule_index.remove(event.guild_id, event.record.id)
+            self.scheduler.unschedule(event.guild_id, event.record.id)
+        elif isinstance(event, MeetingsReplaced):
+            self.reschedule_guild(event.guild_id)
         
-        for meeting in self.storage.meetings.values():
-            # Check for 30-minute reminder
-            time_until_start = meeting.start_time - current_time
-            if not meeting.reminder_sent and timedelta(minutes=30) >= time_until_start > timedelta(minutes=29):
-                await self.send_meeting_reminder(meeting)
-                meeting.reminder_sent = True
-                self.storage._save()
-            elif time_until_start <= timedelta(minutes=-10):
-                await self.check_attendance(meeting)
+        guild = self.bot.get_guild(event.guild_id)
+        if guild:
+            self.schedule_board_update(guild)
+
+    async def handle_meeting_event(self, kind: str, guild_id: int, meeting_id: int) -> None:
+        """Run a reminder or attendance check that just came due"""
+        try:
+            meeting = self.store_for(guild_id).get_meeting(meeting_id)
+        except TaskNotFoundError:
+            # The index outlived its meeting, e.g. after a crash
+            self.schedule_index.remove(guild_id, meeting_id)
+            return
+            
+        if kind == MeetingScheduler.REMINDER:
+            await self.send_meeting_reminder(meeting)
+            self.update_meeting(guild_id, meeting_id, reminder_sent=True)
+        else:
+            await self.check_attendance(guild_id, meeting)
+
+    async def expire_meeting_event(self, kind: str, guild_id: int, meeting_id: int) -> None:
+        """Mark an event missed beyond the grace period as handled"""
+        flag = 'reminder_sent' if kind == MeetingScheduler.REMINDER else 'attendance_checked'
+        try:
+            self.update_meeting(guild_id, meeting_id, **{flag: True})
+        except TaskNotFoundError:
+            pass
                 
     async def send_meeting_reminder(self, meeting: Meeting):
         """Send reminder to meeting participants"""
@@ -45,23 +162,44 @@ class MeetingManager:
             color=discord.Color.blue()
         )
         
-        participants = [f"<@{user_id}>" for user_id in meeting.participants]
+        participants = [target_mention(target, channel.guild.id) for target in meeting.participants]
+        participants_value = ", ".join(participants) if participants else "@everyone"
+        if len(participants_value) > 1024:
+            participants_value = f"{len(participants)} participants"
         embed.add_field(
             name="Participants",
-            value=", ".join(participants) if participants else "@everyone",
+            value=participants_value,
             inline=False
         )
         
-        await channel.send(
-            " ".join(participants) if participants else "@everyone",
-            embed=embed
-        )
+        # Split the pings so large meetings stay under the message length limit
+        pings = self.chunk_mentions(participants) if participants else ["@everyone"]
+        await channel.send(pings[0], embed=embed)
+        for content in pings[1:]:
+            await channel.send(content)
+
+    @staticmethod
+    def chunk_mentions(mentions: list, limit: int = 2000) -> list:
+        """Join mentions into as few messages as fit in ``limit`` characters"""
+        chunks = []
+        current = ""
+        for mention in mentions:
+            if current and len(current) + len(mention) + 1 > limit:
+                chunks.append(current)
+                current = mention
+            else:
+                current = f"{current} {mention}" if current else mention
+        if current:
+            chunks.append(current)
+        return chunks
 
     async def setup_meeting_channel(self, guild: discord.Guild) -> discord.TextChannel:
         """Set up the meeting dashboard channel"""
+        storage = self.store_for(guild.id)
+        
         # Delete existing channel if it exists
-        if self.storage.meeting_channel_id:
-            old_channel = guild.get_channel(self.storage.meeting_channel_id)
+        if storage.meeting_channel_id:
+            old_channel = guild.get_channel(storage.meeting_channel_id)
             if old_channel:
                 try:
                     await old_channel.delete()
@@ -86,15 +224,16 @@ class MeetingManager:
         }
         
         channel = await guild.create_text_channel('meeting-dashboard', overwrites=overwrites)
-        self.storage.set_channel_id(channel.id)
+        storage.set_channel_id(channel.id)
         
         return channel
         
-    async def check_attendance(self, meeting: Meeting):
+    async def check_attendance(self, guild_id: int, meeting: Meeting):
         """Check if all participants are present in the voice channel"""
-        # Skip if reminder was already sent
-        if meeting.reminder_sent:
+        # Only check attendance once per meeting
+        if meeting.attendance_checked:
             return
+        self.update_meeting(guild_id, meeting.id, attendance_checked=True)
 
         channel = self.bot.get_channel(meeting.channel_id)
         if not channel or not isinstance(channel, discord.VoiceChannel):
@@ -104,7 +243,7 @@ class MeetingManager:
         present_members = {member.id for member in channel.members}
         
         # Get members who were supposed to attend
-        attend_members = [uid for uid, response in meeting.rsvp_status.items() if response == 'yes']
+        attend_members = meeting.rsvp_status.members(RSVPResponse.YES)
         
         # Check who's missing
         missing_members = set(attend_members) - present_members
@@ -113,246 +252,280 @@ class MeetingManager:
             try:
                 # Create invite link
                 ttl = (meeting.duration - 10) * 60
-                meeting_channel = self.bot.get_channel(meeting.channel_id)
-                if meeting_channel:
-                    channel_invite = await meeting_channel.create_invite(max_age=ttl)
-                    
-                    # Send notifications to missing members
-                    for user_id in missing_members:
-                        user = self.bot.get_user(user_id)
-                        if user:
-                            try:
-                                await user.send(
-                                    f"🚨 You're late to the meeting {meeting.title} • {meeting.description[:20]}! "
-                                    "\nPlease join as soon as possible. 🚨"
-                                    "\nIf you're unable to attend, please let the organizer know."
-                                    f"\nOr join [HERE]({channel_invite}) to confirm your attendance."
-                                    "\nThank you!"
-                                )
-                            except discord.Forbidden:
-                                # Can't DM user, continue with next user
-                                continue
-                    
-                    # Update reminder flag and save
-                    meeting.reminder_sent = True
-                    self.storage._save()
-                    
+                channel_invite = await channel.create_invite(max_age=ttl)
             except (discord.Forbidden, discord.HTTPException) as e:
                 print(f"Error sending attendance notifications: {e}")
-        meeting.reminder_sent = True
-        self.storage._save()
+                return
+                
+            # Notify missing members in the background
+            self.bot.notifications.send_dms(
+                f"meeting:{guild_id}:{meeting.id}:late",
+                missing_members,
+                f"🚨 You're late to the meeting {meeting.title} • {meeting.description[:20]}! "
+                "\nPlease join as soon as possible. 🚨"
+                "\nIf you're unable to attend, please let the organizer know."
+                f"\nOr join [HERE]({channel_invite}) to confirm your attendance."
+                "\nThank you!"
+            )
+
+
+    def schedule_board_update(self, guild: discord.Guild) -> None:
+        """Queue a coalesced meeting dashboard refresh without waiting for it"""
+        self.bot.refresh_scheduler.request(guild, RefreshScheduler.MEETINGS)
 
+    def schedule_meeting_update(self, guild: discord.Guild, meeting_id: int) -> None:
+        """Queue a coalesced edit of one meeting's dashboard message"""
+        self._stale_meetings.setdefault(guild.id, set()).add(meeting_id)
+        self.bot.refresh_scheduler.request(guild, RefreshScheduler.MEETING_MESSAGES)
 
     async def update_board(self, guild: discord.Guild) -> None:
         """Update the meetings board display"""
-        if not self.storage.meeting_channel_id:
+        storage = self.store_for(guild.id)
+        if not storage.meeting_channel_id:
             return
             
-        channel = guild.get_channel(self.storage.meeting_channel_id)
+        channel = guild.get_channel(storage.meeting_channel_id)
         if not channel:
             return
             
-        # Clear existing messages
-        try:
-            await channel.purge(limit=100)
-        except discord.errors.Forbidden:
-            print("Missing permissions to purge messages")
-            return
-            
         # Create header
         header_embed = discord.Embed(
             title="📅 Meetings Dashboard",
             description="Upcoming meetings and schedules",
             color=discord.Color.blue()
         )
-        await channel.send(embed=header_embed)
+        items = [BoardItem('header', [header_embed])]
         
-        # Group meetings by date
+        # Get upcoming meetings, sorted by start time
         current_time = self.get_belgian_time()
-        upcoming_meetings = {
-            k: v for k, v in self.storage.meetings.items()
-            if v.start_time >= current_time
-        }
+        sorted_meetings = storage.get_meetings_between(current_time)
         
-        if not upcoming_meetings:
+        if not sorted_meetings:
             empty_embed = discord.Embed(
                 description="*No upcoming meetings scheduled*",
                 color=discord.Color.light_grey()
             )
-            await channel.send(embed=empty_embed)
-            return
-            
-        # Sort meetings by start time
-        sorted_meetings = sorted(
-            upcoming_meetings.values(),
-            key=lambda m: m.start_time
-        )
+            items.append(BoardItem('empty', [empty_embed]))
         
-        # Create meeting embeds
+        # One message per meeting, with its RSVP buttons
         for meeting in sorted_meetings:
-            # Calculate time until meeting
-            time_until = meeting.start_time - current_time
-            hours_until = time_until.total_seconds() / 3600
+            items.append(self.render_meeting(guild, meeting, current_time))
+        
+        # Only edit, send or delete the messages that changed
+        async with self._board_lock(guild.id):
+            try:
+                board_state = await BoardSync(channel).sync(items, storage.board_state)
+            except discord.errors.Forbidden:
+                print("Missing permissions to update the meeting dashboard")
+                return
             
-            # Determine embed color based on time until meeting
-            if hours_until <= 1:  # Less than 1 hour
-                color = discord.Color.red()
-            elif hours_until <= 24:  # Less than 24 hours
-                color = discord.Color.orange()
-            else:
-                color = discord.Color.blue()
-                
-            embed = discord.Embed(
-                title=f"📅 {meeting.title}",
-                description=meeting.description,
-                color=color
-            )
+            if board_state != storage.board_state:
+                storage.set_board_state(board_state)
 
-            # Add meeting details
-            embed.add_field(
-                name="🕒 Date & Time",
-                value=meeting.start_time.strftime("%Y-%m-%d %H:%M"),
-                inline=True
-            )
-            embed.add_field(
-                name="⏱️ Duration",
-                value=f"{meeting.duration} minutes",
-                inline=True
-            )
+    async def refresh_meetings(self, guild: discord.Guild) -> None:
+        """Edit just the dashboard messages of the meetings marked stale"""
+        meeting_ids = self._stale_meetings.pop(guild.id, set())
+        storage = self.store_for(guild.id)
+        channel = guild.get_channel(storage.meeting_channel_id) if storage.meeting_channel_id else None
+        if not meeting_ids or not channel:
+            return
+        
+        current_time = self.get_belgian_time()
+        items = []
+        for meeting_id in meeting_ids:
+            try:
+                items.append(self.render_meeting(guild, storage.get_meeting(meeting_id), current_time))
+            except TaskNotFoundError:
+                pass
+        
+        async with self._board_lock(guild.id):
+            # Meetings without a message of their own need the whole dashboard laid out again
+            on_board = {entry['key'] for entry in storage.board_state}
+            if any(item.key not in on_board for item in items):
+                self.schedule_board_update(guild)
+            try:
+                board_state = await BoardSync(channel).update(items, storage.board_state)
+            except discord.NotFound:
+                self.schedule_board_update(guild)
+                return
+            except discord.errors.Forbidden:
+                print("Missing permissions to update the meeting dashboard")
+                return
             
-            # Add voice channel information if available
-            if meeting.channel_id:
-                voice_channel = guild.get_channel(meeting.channel_id)
-                if voice_channel:
+            if board_state != storage.board_state:
+                storage.set_board_state(board_state)
+
+    def _board_lock(self, guild_id: int) -> asyncio.Lock:
+        # Full and per-meeting refreshes of a dashboard take turns
+        lock = self._board_locks.get(guild_id)
+        if lock is None:
+            lock = self._board_locks[guild_id] = asyncio.Lock()
+        return lock
+
+    def render_meeting(self, guild: discord.Guild, meeting: Meeting, current_time: datetime) -> BoardItem:
+        """Render the dashboard message of one meeting"""
+        # Calculate time until meeting
+        time_until = meeting.start_time - current_time
+        hours_until = time_until.total_seconds() / 3600
+
+        # Determine embed color based on time until meeting
+        if hours_until <= 1:  # Less than 1 hour
+            color = discord.Color.red()
+        elif hours_until <= 24:  # Less than 24 hours
+            color = discord.Color.orange()
+        else:
+            color = discord.Color.blue()
+
+        embed = discord.Embed(
+            title=f"📅 {meeting.title}",
+            description=meeting.description,
+            color=color
+        )
+
+        # Add meeting details
+        embed.add_field(
+            name="🕒 Date & Time",
+            value=meeting.start_time.strftime("%Y-%m-%d %H:%M"),
+            inline=True
+        )
+        embed.add_field(
+            name="⏱️ Duration",
+            value=f"{meeting.duration} minutes",
+            inline=True
+        )
+
+        # Add voice channel information if available
+        if meeting.channel_id:
+            voice_channel = guild.get_channel(meeting.channel_id)
+            if voice_channel:
+                embed.add_field(
+                    name="🔊 Voice Channel",
+                    value=voice_channel.mention,
+                    inline=True
+                )
+
+                # Add current participants if meeting is ongoing
+                if -30 < time_until.total_seconds() / 60 < meeting.duration:
+                    current_participants = len([member for member in voice_channel.members if not member.bot])
                     embed.add_field(
-                        name="🔊 Voice Channel",
-                        value=voice_channel.mention,
+                        name="👥 Current Participants",
+                        value=f"{current_participants} member(s) in channel",
                         inline=True
                     )
-                    
-                    # Add current participants if meeting is ongoing
-                    if -30 < time_until.total_seconds() / 60 < meeting.duration:
-                        current_participants = len([member for member in voice_channel.members if not member.bot])
-                        embed.add_field(
-                            name="👥 Current Participants",
-                            value=f"{current_participants} member(s) in channel",
-                            inline=True
-                        )
-            
-            # Add separator for readability
-            embed.add_field(name="​", value="​", inline=False)
-            
-            # Add RSVP summary
-            yes_count, no_count, maybe_count, pending_count = self.get_rsvp_summary(meeting)
-            
-            rsvp_summary = (
-                f"✅ Going: {yes_count}\n"
-                f"❔ Maybe: {maybe_count}\n"
-                f"❌ Not Going: {no_count}\n"
-                f"⏳ Awaiting Response: {pending_count}"
-            )
-            
-            embed.add_field(
-                name="📊 RSVP Status",
-                value=rsvp_summary,
-                inline=False
-            )
-            
-            # Add detailed RSVP lists
-            if meeting.rsvp_status:
-                # Going
-                going_users = [uid for uid, resp in meeting.rsvp_status.items() if resp == 'yes']
-                if going_users:
-                    embed.add_field(
-                        name="✅ Confirmed Attendees",
-                        value=", ".join(f"<@{uid}>" for uid in going_users),
-                        inline=False
-                    )
-                
-                # Maybe
-                maybe_users = [uid for uid, resp in meeting.rsvp_status.items() if resp == 'maybe']
-                if maybe_users:
-                    embed.add_field(
-                        name="❔ Tentative Attendees",
-                        value=", ".join(f"<@{uid}>" for uid in maybe_users),
-                        inline=False
-                    )
-                
-                # Not Going
-                not_going_users = [uid for uid, resp in meeting.rsvp_status.items() if resp == 'no']
-                if not_going_users:
-                    embed.add_field(
-                        name="❌ Not Attending",
-                        value=", ".join(f"<@{uid}>" for uid in not_going_users),
-                        inline=False
-                    )
-            
-            # Add pending responses
-            pending_users = [uid for uid in meeting.participants if uid not in meeting.rsvp_status]
-            if pending_users:
+
+        # Add separator for readability
+        embed.add_field(name="​", value="​", inline=False)
+
+        # Add RSVP summary from the maintained tallies; pending responses are
+        # counted among the participants named directly, roles aren't expanded
+        awaiting = meeting.awaiting_response()
+        rsvp_summary = (
+            f"✅ Going: {meeting.rsvp_status.count(RSVPResponse.YES)}\n"
+            f"❔ Maybe: {meeting.rsvp_status.count(RSVPResponse.MAYBE)}\n"
+            f"❌ Not Going: {meeting.rsvp_status.count(RSVPResponse.NO)}\n"
+            f"⏳ Awaiting Response: {len(awaiting)}"
+        )
+
+        embed.add_field(
+            name="📊 RSVP Status",
+            value=rsvp_summary,
+            inline=False
+        )
+
+        # Add detailed RSVP lists, sorted so unchanged responses render the same
+        # and cut to the field limit with a count of the members left out
+        if meeting.rsvp_status:
+            # Going
+            going_users = meeting.rsvp_status.members(RSVPResponse.YES)
+            if going_users:
                 embed.add_field(
-                    name="⏳ Awaiting Response From",
-                    value=", ".join(f"<@{uid}>" for uid in pending_users),
+                    name="✅ Confirmed Attendees",
+                    value=join_truncated((f"<@{uid}>" for uid in sorted(going_users)), MAX_FIELD_VALUE),
                     inline=False
                 )
-            
-            # Add countdown
-            if hours_until < 1:
-                countdown = f"⏰ Starting in {int(time_until.total_seconds() / 60)} minutes"
-            elif hours_until < 24:
-                countdown = f"⏰ Starting in {int(hours_until)} hours"
-            else:
-                days = int(hours_until / 24)
-                countdown = f"⏰ Starting in {days} day{'s' if days > 1 else ''}"
-                
+
+            # Maybe
+            maybe_users = meeting.rsvp_status.members(RSVPResponse.MAYBE)
+            if maybe_users:
+                embed.add_field(
+                    name="❔ Tentative Attendees",
+                    value=join_truncated((f"<@{uid}>" for uid in sorted(maybe_users)), MAX_FIELD_VALUE),
+                    inline=False
+                )
+
+            # Not Going
+            not_going_users = meeting.rsvp_status.members(RSVPResponse.NO)
+            if not_going_users:
+                embed.add_field(
+                    name="❌ Not Attending",
+                    value=join_truncated((f"<@{uid}>" for uid in sorted(not_going_users)), MAX_FIELD_VALUE),
+                    inline=False
+                )
+
+        # Add pending responses, roles are listed as a whole
+        pending = [target_mention(uid) for uid in awaiting]
+        pending += [target_mention(target, guild.id) for target in meeting.participants if target < 0]
+        if pending:
             embed.add_field(
-                name="Status",
-                value=countdown,
-                inline=True
+                name="⏳ Awaiting Response From",
+                value=join_truncated(pending, MAX_FIELD_VALUE),
+                inline=False
             )
+
+        # Add countdown
+        if hours_until < 1:
+            countdown = f"⏰ Starting in {int(time_until.total_seconds() / 60)} minutes"
+        elif hours_until < 24:
+            countdown = f"⏰ Starting in {int(hours_until)} hours"
+        else:
+            days = int(hours_until / 24)
+            countdown = f"⏰ Starting in {days} day{'s' if days > 1 else ''}"
+
+        embed.add_field(
+            name="Status",
+            value=countdown,
+            inline=True
+        )
+
+        # Add meeting creator
+        creator = guild.get_member(meeting.created_by)
+        if creator:
+            embed.set_footer(
+                text=f"Created by {creator.display_name}",
+                icon_url=creator.display_avatar.url
+            )
+
+        # Only add RSVP buttons if the meeting hasn't started yet
+        view = None
+        if time_until.total_seconds() > 0:
+            view = self.rsvp_view(meeting.id)
+        
+        return BoardItem(f"meeting:{meeting.id}", [embed], view)
+
+    def rsvp_view(self, meeting_id: int) -> RSVPView:
+        """The RSVP buttons of a meeting, registered as a persistent view on first use"""
+        view = self._rsvp_views.get(meeting_id)
+        if view is None:
+            view = self._rsvp_views[meeting_id] = RSVPView(self, meeting_id)
+            self.bot.add_view(view)
+        return view
+
+    async def update_rsvp(
+        self,
+        guild_id: int,
+        meeting_id: int,
+        user_id: int,
+        response: str,
+        role_ids: Iterable[int] = ()
+    ) -> None:
+        """Update a user's RSVP status for a meeting, ``role_ids`` being the user's roles"""
+        storage = self.store_for(guild_id)
+        meeting = storage.get_meeting(meeting_id)
             
-            # Add meeting creator
-            creator = guild.get_member(meeting.created_by)
-            if creator:
-                embed.set_footer(
-                    text=f"Created by {creator.display_name}",
-                    icon_url=creator.display_avatar.url
-                )
-            
-            # Send embed with RSVP buttons
-            message = await channel.send(embed=embed)
-            
-            # Only add RSVP buttons if the meeting hasn't started yet
-            if time_until.total_seconds() > 0:
-                view = RSVPView(self, meeting.id)
-                self.bot.add_view(view)
-                await message.edit(view=view)
-
-    async def update_rsvp(self, meeting_id: int, user_id: int, response: str) -> None:
-        """Update a user's RSVP status for a meeting"""
-        meeting = self.storage.meetings.get(meeting_id)
-        if not meeting:
-            raise ValueError(f"Meeting {meeting_id} not found")
-            
-        if user_id not in meeting.participants:
+        if not meeting.is_participant(user_id, role_ids):
             raise ValueError("You are not invited to this meeting")
             
         if response not in ['yes', 'no', 'maybe']:
             raise ValueError("Invalid RSVP response")
             
-        meeting.rsvp_status[user_id] = response
-        self.storage._save()
-
-    def get_rsvp_summary(self, meeting) -> tuple:
-        """Get RSVP counts for a meeting"""
-        yes_count = sum(1 for status in meeting.rsvp_status.values() if status == 'yes')
-        no_count = sum(1 for status in meeting.rsvp_status.values() if status == 'no')
-        maybe_count = sum(1 for status in meeting.rsvp_status.values() if status == 'maybe')
-        pending_count = len(meeting.participants) - len(meeting.rsvp_status)
-        
-        return yes_count, no_count, maybe_count, pending_count
-    
-    @check_meetings.before_loop
-    async def before_check_meetings(self):
-        """Wait until the bot is ready before starting the meeting check loop"""
-        await self.bot.wait_until_ready()
\ No newline at end of file
+        storage.set_rsvp(meeting_id, user_id, response)
@@ -0,0 +1,243 @@
+import asyncio
+import heapq
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
+from core.models import Meeting
+from core.writer import BackgroundWriter, atomic_write_json
+
+class ScheduleEntry(NamedTuple):
+    """The fields of a meeting its scheduled events depend on"""
+    id: int
+    start_time: datetime
+    reminder_sent: bool
+    attendance_checked: bool
+
+Schedulable = Union[Meeting, ScheduleEntry]
+
+class ScheduleIndex:
+    """Schedule fields of every meeting with pending events, one small file per guild.
+
+    Restarting the scheduler only needs these, so reading them avoids
+    loading the meeting shard of every guild. ``directory_for`` gives the
+    data directory of a guild; changes are written there as JSON by a
+    background thread within ``flush_delay`` seconds. Meetings whose
+    reminder and attendance check are both done are dropped.
+    """
+    FILE_NAME = "meeting_schedule.json"
+
+    def __init__(self, directory_for: Callable[[int], str], flush_delay: float = 1.0):
+        self.directory_for = directory_for
+        self._entries: Dict[int, Dict[int, ScheduleEntry]] = {}
+        self._dirty: Set[int] = set()
+        self._lock = threading.Lock()
+        self._writer = BackgroundWriter("meeting-schedule", self._write, flush_delay)
+
+    def _path(self, guild_id: int) -> str:
+        return os.path.join(self.directory_for(guild_id), self.FILE_NAME)
+
+    def load(self, guild_id: int) -> Optional[List[ScheduleEntry]]:
+        """Schedule entries of a guild, or None if it has no schedule file yet"""
+        with self._lock:
+            entries = self._entries.get(guild_id)
+            if entries is None:
+                path = self._path(guild_id)
+                if not os.path.exists(path):
+                    return None
+                with open(path, 'r') as f:
+                    entries = {
+                        int(meeting_id): ScheduleEntry(
+                            int(meeting_id), datetime.fromisoformat(start_time), reminder_sent, attendance_checked
+                        )
+                        for meeting_id, (start_time, reminder_sent, attendance_checked) in json.load(f).items()
+                    }
+                self._entries[guild_id] = entries
+            return list(entries.values())
+
+    def put(self, guild_id: int, meeting: Meeting) -> None:
+        """Record the schedule fields of a new or changed meeting"""
+        with self._lock:
+            entries = self._entries.setdefault(guild_id, {})
+            if meeting.reminder_sent and meeting.attendance_checked:
+                entries.pop(meeting.id, None)
+            else:
+                entries[meeting.id] = ScheduleEntry(
+                    meeting.id, meeting.start_time, meeting.reminder_sent, meeting.attendance_checked
+                )
+            self._dirty.add(guild_id)
+        self._writer.mark_dirty()
+
+    def remove(self, guild_id: int, meeting_id: int) -> None:
+        """Forget a deleted or archived meeting"""
+        with self._lock:
+            self._entries.setdefault(guild_id, {}).pop(meeting_id, None)
+            self._dirty.add(guild_id)
+        self._writer.mark_dirty()
+
+    def replace(self, guild_id: int, meetings: Iterable[Meeting]) -> None:
+        """Replace the entries of a guild with the ones of ``meetings``"""
+        with self._lock:
+            self._entries[guild_id] = {
+                meeting.id: ScheduleEntry(
+                    meeting.id, meeting.start_time, meeting.reminder_sent, meeting.attendance_checked
+                )
+                for meeting in meetings
+                if not (meeting.reminder_sent and meeting.attendance_checked)
+            }
+            self._dirty.add(guild_id)
+        self._writer.mark_dirty()
+
+    def _write(self) -> None:
+        """Write the files of the guilds changed since the last write, runs on the writer thread"""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            snapshots = {
+                guild_id: {
+                    str(entry.id): [entry.start_time.isoformat(), entry.reminder_sent, entry.attendance_checked]
+                    for entry in self._entries.get(guild_id, {}).values()
+                }
+                for guild_id in dirty
+            }
+        try:
+            for guild_id, data in snapshots.items():
+                atomic_write_json(self._path(guild_id), data, indent=None)
+        except Exception:
+            with self._lock:
+                self._dirty |= dirty
+            raise
+
+    async def flush(self) -> None:
+        """Wait until every change made so far has been written"""
+        await asyncio.get_running_loop().run_in_executor(None, self._writer.flush)
+
+    def close(self) -> None:
+        """Write pending changes and stop the writer thread"""
+        self._writer.close()
+
+class MeetingScheduler:
+    """Min-heap of upcoming meeting events that sleeps until the next one is due.
+
+    Each meeting contributes a reminder event (``reminder_offset`` before
+    its start) and an attendance-check event (``attendance_offset`` after
+    it), unless the matching flag is already set. Rescheduling a meeting
+    gives it a new version, which lazily invalidates the entries already in
+    the heap; a meeting's version is forgotten once its last event ran or
+    it was unscheduled, so only meetings with pending events take memory. Events that come due more than ``grace`` late, for example after
+    downtime, are expired instead of dispatched. Meeting IDs are only unique
+    within a guild, so events are keyed by ``(guild_id, meeting_id)``.
+    """
+    REMINDER = "reminder"
+    ATTENDANCE = "attendance"
+
+    def __init__(
+        self,
+        dispatch: Callable[[str, int, int], Awaitable[None]],
+        expire: Callable[[str, int, int], Awaitable[None]],
+        now: Callable[[], datetime],
+        grace: timedelta = timedelta(minutes=10),
+        reminder_offset: timedelta = timedelta(minutes=30),
+        attendance_offset: timedelta = timedelta(minutes=10)
+    ):
+        self.dispatch = dispatch
+        self.expire = expire
+        self.now = now
+        self.grace = grace
+        self.reminder_offset = reminder_offset
+        self.attendance_offset = attendance_offset
+        self.metrics: Dict[str, int] = {'dispatched': 0, 'expired': 0, 'failed': 0}
+        # (due, sequence, kind, (guild_id, meeting_id), version)
+        self._heap: List[Tuple[datetime, int, str, Tuple[int, int], int]] = []
+        # Current version and number of its events still in the heap, per meeting
+        self._versions: Dict[Tuple[int, int], int] = {}
+        self._remaining: Dict[Tuple[int, int], int] = {}
+        self._sequence = 0
+        self._wakeup = asyncio.Event()
+
+    def schedule(self, guild_id: int, meeting: Schedulable) -> None:
+        """(Re)schedule every pending event of a meeting"""
+        key = (guild_id, meeting.id)
+        self._forget(key)
+        # Versions come from the heap's sequence, so a forgotten one is never handed out again
+        self._sequence += 1
+        version = self._sequence
+
+        events = []
+        if not meeting.reminder_sent:
+            events.append((meeting.start_time - self.reminder_offset, self.REMINDER))
+        if not meeting.attendance_checked:
+            events.append((meeting.start_time + self.attendance_offset, self.ATTENDANCE))
+        if not events:
+            return
+        self._versions[key] = version
+        self._remaining[key] = len(events)
+        for due, kind in events:
+            self._push(due, kind, key, version)
+        self._wakeup.set()
+
+    def unschedule(self, guild_id: int, meeting_id: int) -> None:
+        """Drop every pending event of a meeting"""
+        self._forget((guild_id, meeting_id))
+
+    def rebuild(self, guild_id: int, meetings: Iterable[Schedulable]) -> None:
+        """Replace the events of a guild with the events of ``meetings``"""
+        for key in [key for key in self._versions if key[0] == guild_id]:
+            self._forget(key)
+        for meeting in meetings:
+            self.schedule(guild_id, meeting)
+
+    def _forget(self, key: Tuple[int, int]) -> None:
+        """Invalidate the events of a meeting still in the heap"""
+        self._versions.pop(key, None)
+        self._remaining.pop(key, None)
+
+    def _push(self, due: datetime, kind: str, key: Tuple[int, int], version: int) -> None:
+        self._sequence += 1
+        heapq.heappush(self._heap, (due, self._sequence, kind, key, version))
+
+    def _drop_stale(self) -> None:
+        while self._heap and self._heap[0][4] != self._versions.get(self._heap[0][3]):
+            heapq.heappop(self._heap)
+
+    @property
+    def pending(self) -> int:
+        """Number of events in the heap, including invalidated ones"""
+        return len(self._heap)
+
+    async def run(self) -> None:
+        """Dispatch events as they come due, forever"""
+        while True:
+            self._drop_stale()
+            if not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            due = self._heap[0][0]
+            delay = (due - self.now()).total_seconds()
+            if delay > 0:
+                # Sleep until the next event, or until a new one may be earlier
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, _, kind, key, _ = heapq.heappop(self._heap)
+            self._remaining[key] -= 1
+            if not self._remaining[key]:
+                # That was the meeting's last event
+                self._forget(key)
+            guild_id, meeting_id = key
+            try:
+                if self.now() - due > self.grace:
+                    self.metrics['expired'] += 1
+                    await self.expire(kind, guild_id, meeting_id)
+                else:
+                    self.metrics['dispatched'] += 1
+                    await self.dispatch(kind, guild_id, meeting_id)
+            except Exception as e:
+                self.metrics['failed'] += 1
+                print(f"Error handling {kind} event for meeting {meeting_id}: {e}")
@@ -0,0 +1,158 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, Optional, Tuple
+import discord
+from discord.ext import commands
+
+class RouteLimiter:
+    """Token buckets keyed by API route, so fan-outs pace themselves.
+
+    discord.py already retries 429s, but letting hundreds of sends hit a
+    shared bucket at once just turns into a queue of retries. Each route
+    allows ``rate`` calls per ``per`` seconds here instead. Routes Discord
+    limits per resource, such as messages per channel, pass the resource
+    as ``key`` and get a bucket each; buckets are created on first use and
+    dropped once they refilled.
+    """
+    # Sweep refilled buckets whenever this many more were created
+    PRUNE_EVERY = 256
+
+    def __init__(self, limits: Dict[str, tuple]):
+        self.limits = limits
+        self._tokens: Dict[Tuple[str, Hashable], float] = {}
+        self._updated: Dict[Tuple[str, Hashable], float] = {}
+        self._locks: Dict[Tuple[str, Hashable], asyncio.Lock] = {}
+        self._created = 0
+
+    def _bucket(self, route: str, key: Optional[Hashable]) -> Tuple[str, Hashable]:
+        bucket = (route, key)
+        if bucket not in self._tokens:
+            self._created += 1
+            if self._created % self.PRUNE_EVERY == 0:
+                self._prune()
+            self._tokens[bucket] = float(self.limits[route][0])
+            self._updated[bucket] = time.monotonic()
+            self._locks[bucket] = asyncio.Lock()
+        return bucket
+
+    def _refill(self, bucket: Tuple[str, Hashable]) -> float:
+        rate, per = self.limits[bucket[0]]
+        now = time.monotonic()
+        self._tokens[bucket] = min(rate, self._tokens[bucket] + (now - self._updated[bucket]) * rate / per)
+        self._updated[bucket] = now
+        return self._tokens[bucket]
+
+    def _prune(self) -> None:
+        """Drop the buckets nobody waits on that are full again, a new one would be the same"""
+        for bucket in list(self._tokens):
+            if not self._locks[bucket].locked() and self._refill(bucket) >= self.limits[bucket[0]][0]:
+                del self._tokens[bucket], self._updated[bucket], self._locks[bucket]
+
+    async def acquire(self, route: str, key: Optional[Hashable] = None) -> None:
+        """Wait until a call on ``route`` (for resource ``key``) fits in its bucket"""
+        if route not in self.limits:
+            return
+        rate, per = self.limits[route]
+        bucket = self._bucket(route, key)
+        async with self._locks[bucket]:
+            while True:
+                if self._refill(bucket) >= 1:
+                    self._tokens[bucket] -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens[bucket]) * per / rate)
+
+    def back_off(self, route: str, retry_after: float, key: Optional[Hashable] = None) -> None:
+        """Empty a bucket after Discord reported a rate limit on it"""
+        if route in self.limits:
+            rate, per = self.limits[route]
+            bucket = self._bucket(route, key)
+            self._tokens[bucket] = -retry_after * rate / per
+            self._updated[bucket] = time.monotonic()
+
+class NotificationDispatcher:
+    """Send DMs to many users in the background with bounded concurrency.
+
+    ``send_dms`` returns right away. Deliveries run at most
+    ``max_concurrency`` at a time, paced per route, and the outcome for
+    every user is recorded under the batch key.
+    """
+    SENT = "sent"
+    FORBIDDEN = "forbidden"
+    NOT_FOUND = "not_found"
+    FAILED = "failed"
+
+    # Opening a DM channel shares one bucket; messages get one per DM channel
+    ROUTE_LIMITS = {
+        'dm_create': (5, 5.0),
+        'dm_message': (10, 5.0)
+    }
+
+    def __init__(self, bot: commands.Bot, max_concurrency: int = 5, max_attempts: int = 3, history: int = 100):
+        self.bot = bot
+        self.max_attempts = max_attempts
+        self.history = history
+        self.limiter = RouteLimiter(self.ROUTE_LIMITS)
+        self.results: "OrderedDict[str, Dict[int, str]]" = OrderedDict()
+        self.totals: Dict[str, int] = {self.SENT: 0, self.FORBIDDEN: 0, self.NOT_FOUND: 0, self.FAILED: 0}
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._batches: Dict[str, asyncio.Task] = {}
+
+    def send_dms(self, batch: str, user_ids: Iterable[int], content: str) -> asyncio.Task:
+        """Start delivering ``content`` to every user and return the background task"""
+        user_ids = list(dict.fromkeys(user_ids))
+        self.results[batch] = {}
+        while len(self.results) > self.history:
+            self.results.popitem(last=False)
+
+        task = asyncio.create_task(self._send_batch(batch, user_ids, content))
+        self._batches[batch] = task
+        task.add_done_callback(lambda _: self._batches.pop(batch, None))
+        return task
+
+    @property
+    def active_batches(self) -> int:
+        return len(self._batches)
+
+    async def _send_batch(self, batch: str, user_ids: list, content: str) -> None:
+        await asyncio.gather(*(self._deliver(batch, user_id, content) for user_id in user_ids))
+
+    async def _deliver(self, batch: str, user_id: int, content: str) -> None:
+        async with self._semaphore:
+            self._record(batch, user_id, await self._try_send(user_id, content))
+
+    async def _try_send(self, user_id: int, content: str) -> str:
+        for _ in range(self.max_attempts):
+            route, key = 'dm_create', None
+            try:
+                user = self.bot.get_user(user_id)
+                if user is None:
+                    user = await self.bot.fetch_user(user_id)
+
+                channel = user.dm_channel
+                if channel is None:
+                    await self.limiter.acquire(route)
+                    channel = await user.create_dm()
+
+                route, key = 'dm_message', channel.id
+                await self.limiter.acquire(route, key)
+                await channel.send(content)
+                return self.SENT
+            except discord.Forbidden:
+                # DMs closed or the user blocked the bot
+                return self.FORBIDDEN
+            except discord.NotFound:
+                return self.NOT_FOUND
+            except discord.RateLimited as e:
+                self.limiter.back_off(route, e.retry_after, key)
+            except discord.HTTPException as e:
+                if e.status != 429:
+                    print(f"Error sending DM to {user_id}: {e}")
+                    return self.FAILED
+                self.limiter.back_off(route, 1.0, key)
+        return self.FAILED
+
+    def _record(self, batch: str, user_id: int, status: str) -> None:
+        self.totals[status] += 1
+        if batch in self.results:
+            self.results[batch][user_id] = status
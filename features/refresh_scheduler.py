@@ -0,0 +1,71 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Set, Tuple
+import discord
+
+class RefreshScheduler:
+    """Coalesce board refresh requests per guild and board.
+
+    ``request`` marks a board dirty and returns immediately. A single worker
+    per (guild, board) waits ``delay`` seconds so bursts of requests merge
+    into one rebuild, and never runs two rebuilds of the same board at once;
+    requests that arrive mid-rebuild trigger exactly one more pass.
+    """
+    TASKS = "tasks"
+    MEETINGS = "meetings"
+    # Edits of single meeting messages, see MeetingManager.refresh_meetings
+    MEETING_MESSAGES = "meeting_messages"
+
+    def __init__(self, renderers: Dict[str, Callable[[discord.Guild], Awaitable[None]]], delay: float = 1.0):
+        self.renderers = renderers
+        self.delay = delay
+        self.metrics: Dict[str, int] = {
+            'requested': 0,
+            'coalesced': 0,
+            'executed': 0,
+            'failed': 0
+        }
+        self._guilds: Dict[int, discord.Guild] = {}
+        self._dirty: Set[Tuple[int, str]] = set()
+        self._workers: Dict[Tuple[int, str], asyncio.Task] = {}
+
+    def request(self, guild: discord.Guild, board: str) -> None:
+        """Mark a board dirty, a rebuild follows within ``delay`` seconds"""
+        if guild is None:
+            return
+        self.metrics['requested'] += 1
+        key = (guild.id, board)
+        self._guilds[guild.id] = guild
+
+        if key in self._dirty:
+            self.metrics['coalesced'] += 1
+            return
+        self._dirty.add(key)
+
+        if key not in self._workers:
+            self._workers[key] = asyncio.create_task(self._run(key))
+
+    def request_all(self, guild: discord.Guild) -> None:
+        """Mark every board of a guild dirty"""
+        for board in self.renderers:
+            self.request(guild, board)
+
+    async def _run(self, key: Tuple[int, str]) -> None:
+        guild_id, board = key
+        try:
+            while key in self._dirty:
+                await asyncio.sleep(self.delay)
+                self._dirty.discard(key)
+                try:
+                    await self.renderers[board](self._guilds[guild_id])
+                    self.metrics['executed'] += 1
+                except Exception as e:
+                    self.metrics['failed'] += 1
+                    print(f"Error refreshing {board} board in guild {guild_id}: {e}")
+        finally:
+            self._dirty.discard(key)
+            self._workers.pop(key, None)
+
+    @property
+    def pending(self) -> int:
+        """Number of boards waiting for a rebuild"""
+        return len(self._dirty)
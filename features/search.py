@@ -0,0 +1,161 @@
+import heapq
+from typing import Dict, FrozenSet, Hashable, List, NamedTuple, Optional, Sequence, Tuple
+from core.events import (
+    MeetingEvent, RecordCreated, RecordDeleted, RecordUpdated, StoreReplaced, StoreUnloaded, TaskEvent
+)
+from core.models import MeetingSummary, TaskSummary, member_targets
+from core.search import SearchIndex, tokenize
+
+class SearchHit(NamedTuple):
+    kind: str
+    id: int
+    title: str
+    score: float
+
+class SearchManager:
+    """Per-guild full-text search over task titles and descriptions and meeting titles.
+
+    A guild's index is built from the stores' record summaries on the first
+    search or autocomplete, so lazily loaded records stay unbuilt, then kept
+    current from the store events instead of being rebuilt. It is dropped
+    when either store of the guild is unloaded or replaced. Next to the
+    index it remembers when each record last changed and who it belongs to,
+    so id autocompletion can rank without going back to the store.
+    """
+    TASK = "task"
+    MEETING = "meeting"
+    # Field weights: a word in a title counts three times one in a description
+    TITLE_WEIGHT = 3.0
+    DESCRIPTION_WEIGHT = 1.0
+    # Fields whose changes need a document to be indexed again
+    TASK_FIELDS = frozenset({'title', 'description'})
+    MEETING_FIELDS = frozenset({'title'})
+    # Discord shows at most 25 autocomplete choices of up to 100 characters
+    MAX_CHOICES = 25
+    MAX_CHOICE_LENGTH = 100
+    # Best text matches reranked by ownership and recency for autocompletion
+    COMPLETION_POOL = 200
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._indexes: Dict[int, SearchIndex] = {}
+        # guild_id -> {(kind, id): (seq, user IDs)} of every indexed record
+        self._owners: Dict[int, Dict[Hashable, Tuple[int, FrozenSet[int]]]] = {}
+        bot.events.subscribe(TaskEvent, self.on_task_event)
+        bot.events.subscribe(MeetingEvent, self.on_meeting_event)
+
+    def index_for(self, guild_id: int) -> SearchIndex:
+        """Return the index of a guild, building it on first use"""
+        index = self._indexes.get(guild_id)
+        if index is None:
+            index = SearchIndex()
+            owners = self._owners[guild_id] = {}
+            for task in self.bot.task_manager.store_for(guild_id).get_task_summaries():
+                self._add_task(index, task)
+                self._own_task(owners, task)
+            for meeting in self.bot.meeting_manager.store_for(guild_id).get_meeting_summaries():
+                self._add_meeting(index, meeting)
+                self._own_meeting(owners, meeting)
+            self._indexes[guild_id] = index
+        return index
+
+    # The helpers below take model objects from events as well as summaries
+
+    def _own_task(self, owners: dict, task: TaskSummary) -> None:
+        owners[(self.TASK, task.id)] = (task.seq, frozenset(task.assigned_users or ()))
+
+    def _own_meeting(self, owners: dict, meeting: MeetingSummary) -> None:
+        users = frozenset(meeting.participants) | {meeting.created_by}
+        owners[(self.MEETING, meeting.id)] = (meeting.seq, users)
+
+    def _add_task(self, index: SearchIndex, task: TaskSummary) -> None:
+        index.add(
+            (self.TASK, task.id),
+            [(f"{task.id} {task.title}", self.TITLE_WEIGHT), (task.description, self.DESCRIPTION_WEIGHT)],
+            label=task.title
+        )
+
+    def _add_meeting(self, index: SearchIndex, meeting: MeetingSummary) -> None:
+        index.add(
+            (self.MEETING, meeting.id),
+            [(f"{meeting.id} {meeting.title}", self.TITLE_WEIGHT)],
+            label=meeting.title
+        )
+
+    def _apply(self, event, kind: str, fields: frozenset, add, own) -> None:
+        # Guilds nobody searched yet are indexed from the store when they are
+        index = self._indexes.get(event.guild_id)
+        if index is None:
+            return
+        owners = self._owners[event.guild_id]
+        if isinstance(event, (StoreReplaced, StoreUnloaded)):
+            del self._indexes[event.guild_id]
+            del self._owners[event.guild_id]
+        elif isinstance(event, RecordDeleted):
+            index.remove((kind, event.record.id))
+            owners.pop((kind, event.record.id), None)
+        elif isinstance(event, (RecordCreated, RecordUpdated)):
+            if isinstance(event, RecordCreated) or event.changed & fields:
+                add(index, event.record)
+            # Every change moves the record up the recent ones
+            own(owners, event.record)
+
+    def on_task_event(self, event: TaskEvent) -> None:
+        self._apply(event, self.TASK, self.TASK_FIELDS, self._add_task, self._own_task)
+
+    def on_meeting_event(self, event: MeetingEvent) -> None:
+        self._apply(event, self.MEETING, self.MEETING_FIELDS, self._add_meeting, self._own_meeting)
+
+    def search(
+        self,
+        guild_id: int,
+        query: str,
+        kinds: Optional[Sequence[str]] = None,
+        limit: int = 10
+    ) -> List[SearchHit]:
+        """Rank the tasks and meetings of a guild matching every word of ``query``.
+
+        The last word may be unfinished: each word also matches longer words it starts.
+        """
+        index = self.index_for(guild_id)
+        accept = None if kinds is None else (lambda key: key[0] in kinds)
+        return [
+            SearchHit(kind, record_id, index.labels[(kind, record_id)], score)
+            for (kind, record_id), score in index.search(query, limit, accept)
+        ]
+
+    def complete(
+        self,
+        guild_id: int,
+        kind: str,
+        current: str,
+        user_id: int,
+        role_ids: Sequence[int] = ()
+    ) -> List[Tuple[int, str]]:
+        """Autocomplete choices ``(id, "#id • title")`` of one kind for what the user typed.
+
+        Without any input the records of the user, directly or through one
+        of ``role_ids``, come first, the most recently changed first. Typed
+        words or id digits are matched like a search, with ownership and
+        recency breaking ties between matches that are equally good.
+        """
+        index = self.index_for(guild_id)
+        owners = self._owners[guild_id]
+        targets = member_targets(user_id, role_ids)
+
+        def rank(key) -> Tuple[bool, int]:
+            seq, users = owners.get(key, (0, frozenset()))
+            return not users.isdisjoint(targets), seq
+
+        if not tokenize(current):
+            keys = heapq.nlargest(
+                self.MAX_CHOICES, (key for key in owners if key[0] == kind), key=rank
+            )
+        else:
+            hits = index.search(current, self.COMPLETION_POOL, lambda key: key[0] == kind)
+            hits.sort(key=lambda hit: (hit[1], *rank(hit[0])), reverse=True)
+            keys = [key for key, _ in hits[:self.MAX_CHOICES]]
+        return [
+            (record_id, f"#{record_id} • {index.labels[(kind, record_id)]}"[:self.MAX_CHOICE_LENGTH])
+            for _, record_id in keys
+        ]
@@ -1,25 +1,42 @@
-from typing import List, Optional, Dict
-from datetime import datetime
+from typing import List, Optional, Dict, Set
+from datetime import datetime, timedelta
 import discord
 from discord.ext import commands
 from bot.constant import TaskStatus
-from core.models import Task
+from core.events import TaskEvent, TasksUnloaded, TaskUpdated
+from core.models import Task, TaskFilter
 from core.persistence import TaskStore
+from core.shards import ShardedStore
 from core.exceptions import TaskNotFoundError, InvalidTaskDataError
 from ui.embeds import TaskBoardEmbeds
 from ui.views import TaskStatusView, CreateTaskButton
+from features.board_sync import BoardItem, BoardSync
+from features.refresh_scheduler import RefreshScheduler
+from features.thread_cache import ThreadCache
+from config import THREAD_CHECK_CONCURRENCY
 from utils.validator import validate_date, validate_task_data
 
 class TaskManager:
-    def __init__(self, bot: commands.Bot, storage: TaskStore):
+    # Task fields shown on the board; updates touching none of them skip the refresh
+    BOARD_FIELDS = frozenset({'title', 'description', 'status', 'due_date', 'assigned_users', 'thread_id'})
+
+    def __init__(self, bot: commands.Bot, stores: ShardedStore):
         self.bot = bot
-        self.storage = storage
+        self.stores = stores
+        self.thread_cache = ThreadCache(THREAD_CHECK_CONCURRENCY)
+        bot.events.subscribe(TaskEvent, self.on_task_event)
+
+    def store_for(self, guild_id: int) -> TaskStore:
+        """Get the task store of a guild"""
+        return self.stores.store_for(guild_id)
         
     async def create_task(
         self, 
+        guild: discord.Guild,
         title: str, 
         description: str, 
-        due_date: Optional[str] = None
+        due_date: Optional[str] = None,
+        assigned_users: Optional[List[int]] = None
     ) -> Task:
         """Create a new task"""
         # Validate inputs
@@ -32,11 +49,12 @@ class TaskManager:
             description=description,
             status=TaskStatus.NOT_STARTED.value,
             created_at=datetime.now(),
-            due_date=validate_date(due_date) if due_date else None
+            due_date=validate_date(due_date) if due_date else None,
+            assigned_users=assigned_users
         )
         
         # Save task
-        self.storage.add_task(task)
+        self.store_for(guild.id).add_task(task)
         return task
     
     async def verify_thread_exists(self, guild: discord.Guild, task: Task) -> bool:
@@ -46,102 +64,144 @@ class TaskManager:
         """
         if not task.thread_id:
             return False
-            
-        try:
-            thread = await guild.fetch_channel(task.thread_id)
-            return bool(thread)
-        except (discord.NotFound, discord.Forbidden):
-            # Thread doesn't exist or can't be accessed, clean up the task data
-            self.storage.update_task(
-                task.id,
-                thread_id=None,
-                thread_creator_id=None
-            )
-            return False
-        except Exception as e:
-            print(f"Error verifying thread {task.thread_id}: {e}")
-            return False
+        return task.id in await self.verify_threads(guild, [task])
+
+    async def verify_threads(self, guild: discord.Guild, tasks: List[Task]) -> Set[int]:
+        """
+        Verify the threads of several tasks at once, clearing stale thread IDs
+        in a single store write. Returns the IDs of tasks whose thread exists
+        """
+        tasks = [task for task in tasks if task.thread_id]
+        alive = await self.thread_cache.check(guild, [task.thread_id for task in tasks])
+        
+        live = {task.id for task in tasks if alive[task.thread_id]}
+        stale = {
+            task.id: {'thread_id': None, 'thread_creator_id': None}
+            for task in tasks if task.id not in live
+        }
+        if stale:
+            self.store_for(guild.id).update_tasks(stale)
+        
+        return live
     
     async def update_task_thread(
         self, 
+        guild: discord.Guild,
         task_id: int, 
         thread_id: Optional[int], 
         thread_creator_id: Optional[int]
     ) -> Task:
         """Update task thread information"""
-        return self.storage.update_task(
+        return self.store_for(guild.id).update_task(
             task_id,
             thread_id=thread_id,
             thread_creator_id=thread_creator_id
         )
     
-    async def get_task_guild(self) -> Optional[discord.Guild]:
-        """Helper method to find the guild where the task board exists"""
-        for guild in self.bot.guilds:
-            channel = guild.get_channel(self.storage.task_channel_id)
-            if channel:
-                return guild
-        return None
-
-    async def update_task_status(self, task_id: int, status: TaskStatus) -> Task:
+    async def update_task_status(self, guild: discord.Guild, task_id: int, status: TaskStatus) -> Task:
         """Update task status and delete thread if task is completed"""
-        task = self.storage.get_task(task_id)
-        guild = await self.get_task_guild()
+        storage = self.store_for(guild.id)
+        task = storage.get_task(task_id)
         
-        if guild:
-            # Verify thread still exists
-            thread_exists = await self.verify_thread_exists(guild, task)
-            
-            # If task is being marked as completed and has a valid thread, delete it
-            if status == TaskStatus.COMPLETED and thread_exists:
-                await self.delete_task_thread(guild, task.thread_id)
-                task = self.storage.update_task(
-                    task_id,
-                    status=status.value,
-                    thread_id=None,
-                    thread_creator_id=None
-                )
-            else:
-                # Just update the status
-                task = self.storage.update_task(task_id, status=status.value)
+        # Verify thread still exists
+        thread_exists = await self.verify_thread_exists(guild, task)
+        
+        # Remember when the task was finished so it can be archived later
+        completed_at = datetime.now() if status == TaskStatus.COMPLETED else None
+        
+        # If task is being marked as completed and has a valid thread, delete it
+        if status == TaskStatus.COMPLETED and thread_exists:
+            await self.delete_task_thread(guild, task.thread_id)
+            task = storage.update_task(
+                task_id,
+                status=status.value,
+                completed_at=completed_at,
+                thread_id=None,
+                thread_creator_id=None
+            )
         else:
-            # No guild found, just update the status
-            task = self.storage.update_task(task_id, status=status.value)
+            # Just update the status
+            task = storage.update_task(task_id, status=status.value, completed_at=completed_at)
             
         return task
 
-    async def assign_users(self, task_id: int, user_ids: List[int]) -> Task:
+    async def assign_users(self, guild: discord.Guild, task_id: int, user_ids: List[int]) -> Task:
         """Assign users to a task"""
-        return self.storage.update_task(task_id, assigned_users=user_ids)
+        return self.store_for(guild.id).update_task(task_id, assigned_users=user_ids)
 
-    async def delete_task(self, task_id: int) -> Task:
+    async def delete_task(self, guild: discord.Guild, task_id: int) -> Task:
         """Delete a task and its associated thread"""
-        task = self.storage.get_task(task_id)
-        guild = await self.get_task_guild()
+        storage = self.store_for(guild.id)
+        task = storage.get_task(task_id)
         
-        if guild and task.thread_id:
+        if task.thread_id:
             # Verify and delete thread if it exists
             thread_exists = await self.verify_thread_exists(guild, task)
             if thread_exists:
                 await self.delete_task_thread(guild, task.thread_id)
             
         # Delete the task from storage
-        return self.storage.delete_task(task_id)
+        return storage.delete_task(task_id)
 
-    async def get_task(self, task_id: int) -> Task:
-        """Get a task by ID"""
-        return self.storage.get_task(task_id)
+    def find_tasks(self, guild: discord.Guild, task_filter: TaskFilter) -> List[Task]:
+        """Get the tasks a bulk operation with this filter would touch"""
+        return self.store_for(guild.id).find_tasks(task_filter)
+
+    async def bulk_update_status(
+        self,
+        guild: discord.Guild,
+        task_filter: TaskFilter,
+        status: TaskStatus
+    ) -> List[Task]:
+        """Set the status of every task matching a filter in a single store write"""
+        changes = {
+            'status': status.value,
+            'completed_at': datetime.now() if status == TaskStatus.COMPLETED else None
+        }
+        if status == TaskStatus.COMPLETED:
+            # Completed tasks lose their threads, like with a single update
+            await self.delete_threads(guild, self.find_tasks(guild, task_filter))
+            changes.update(thread_id=None, thread_creator_id=None)
+        return self.store_for(guild.id).update_many(task_filter, **changes)
+
+    async def bulk_delete(self, guild: discord.Guild, task_filter: TaskFilter) -> List[Task]:
+        """Delete every task matching a filter and their threads in a single store write"""
+        await self.delete_threads(guild, self.find_tasks(guild, task_filter))
+        return self.store_for(guild.id).delete_many(task_filter)
+
+    async def delete_threads(self, guild: discord.Guild, tasks: List[Task]) -> None:
+        """Delete the threads of several tasks, verifying them in one batch first"""
+        live = await self.verify_threads(guild, tasks)
+        for task in tasks:
+            if task.id in live:
+                await self.delete_task_thread(guild, task.thread_id)
+
+    async def get_task(self, guild: discord.Guild, task_id: int) -> Task:
+        """Get a task by ID, including archived ones"""
+        return self.store_for(guild.id).get_task(task_id)
+
+    async def archive_completed(self, guild: discord.Guild, max_age: timedelta) -> List[Task]:
+        """Move tasks completed more than ``max_age`` ago to the archive.
+
+        Only a loaded shard is archived, without counting as a use of it;
+        an unloaded one is caught up at the first archive run after it loads.
+        """
+        store = self.stores.peek(guild.id)
+        if store is None:
+            return []
+        return store.archive_tasks(TaskStatus.COMPLETED.value, datetime.now() - max_age)
     
     async def delete_task_thread(self, guild: discord.Guild, thread_id: int) -> None:
         """Helper method to delete a task's thread"""
         if thread_id:
             try:
-                thread = await guild.fetch_channel(thread_id)
+                thread = guild.get_thread(thread_id) or await guild.fetch_channel(thread_id)
                 if thread:
                     await thread.delete()
+                self.thread_cache.mark_deleted(thread_id)
             except discord.NotFound:
                 # Thread already deleted or not found
-                pass
+                self.thread_cache.mark_deleted(thread_id)
             except discord.Forbidden:
                 print(f"Missing permissions to delete thread {thread_id}")
             except Exception as e:
@@ -149,9 +209,11 @@ class TaskManager:
 
     async def setup_board_channel(self, guild: discord.Guild) -> discord.TextChannel:
         """Set up the task board channel"""
+        storage = self.store_for(guild.id)
+        
         # Delete existing channel if it exists
-        if self.storage.task_channel_id:
-            old_channel = guild.get_channel(self.storage.task_channel_id)
+        if storage.task_channel_id:
+            old_channel = guild.get_channel(storage.task_channel_id)
             if old_channel:
                 await old_channel.delete()
         
@@ -173,51 +235,61 @@ class TaskManager:
         }
         
         channel = await guild.create_text_channel('task-board', overwrites=overwrites)
-        self.storage.set_channel_id(channel.id)
+        storage.set_channel_id(channel.id)
         
         return channel
 
+    def on_task_event(self, event: TaskEvent) -> None:
+        """Refresh the board after changes it shows, and learn about new threads"""
+        if isinstance(event, TasksUnloaded):
+            # An idle store was closed, nothing on the board changed
+            return
+        if isinstance(event, TaskUpdated):
+            if 'thread_id' in event.changed and event.record.thread_id:
+                self.thread_cache.mark_alive(event.record.thread_id)
+            if not event.changed & self.BOARD_FIELDS:
+                return
+        guild = self.bot.get_guild(event.guild_id)
+        if guild:
+            self.schedule_board_update(guild)
+
+    def schedule_board_update(self, guild: discord.Guild) -> None:
+        """Queue a coalesced task board refresh without waiting for it"""
+        self.bot.refresh_scheduler.request(guild, RefreshScheduler.TASKS)
+
     async def update_board(self, guild: discord.Guild) -> None:
         """Update the task board display and verify all threads"""
-        if not self.storage.task_channel_id:
+        storage = self.store_for(guild.id)
+        if not storage.task_channel_id:
             return
             
-        channel = guild.get_channel(self.storage.task_channel_id)
+        channel = guild.get_channel(storage.task_channel_id)
         if not channel:
             return
         
         # Verify all task threads before updating the board
-        tasks = self.storage.get_all_tasks()
-        for task_id, task in tasks.items():
-            if task.thread_id:
-                await self.verify_thread_exists(guild, task)
-        
-        # Clear existing messages
-        try:
-            await channel.purge(limit=100)
-        except discord.errors.Forbidden:
-            print("Missing permissions to purge messages")
-            return
+        await self.verify_threads(guild, storage.get_tasks_with_threads())
         
-        # Create header
-        header_embed = TaskBoardEmbeds.create_header()
+        # Render the board: the header, then the status sections packed into
+        # as few messages as Discord's embed limits allow
         view = discord.ui.View(timeout=None)
         view.add_item(CreateTaskButton(self))
         self.bot.add_view(view)
-        await channel.send(embed=header_embed, view=view)
+        items = [BoardItem('header', [TaskBoardEmbeds.create_header()], view)]
         
-        # Group tasks by status
-        tasks_by_status = {
-            status: [] for status in TaskStatus
-        }
+        sections = [(status, storage.get_tasks_by_status(status.value)) for status in TaskStatus]
+        messages = TaskBoardEmbeds.create_status_sections(
+            [(status, tasks) for status, tasks in sections if tasks], guild, datetime.now()
+        )
+        for page, embeds in enumerate(messages):
+            items.append(BoardItem(f"page:{page}", embeds))
         
-        for task in self.storage.get_all_tasks().values():
-            status = TaskStatus(task.status)
-            tasks_by_status[status].append(task)
+        # Only edit, send or delete the messages that changed
+        try:
+            board_state = await BoardSync(channel).sync(items, storage.board_state)
+        except discord.errors.Forbidden:
+            print("Missing permissions to update the task board")
+            return
         
-        # Create status sections
-        for status, tasks in tasks_by_status.items():
-            if tasks:
-                embeds = TaskBoardEmbeds.create_status_section(status, tasks, guild)
-                for embed in embeds:
-                    await channel.send(embed=embed)
\ No newline at end of file
+        if board_state != storage.board_state:
+            storage.set_board_state(board_state)
@@ -0,0 +1,59 @@
+import asyncio
+from typing import Dict, Iterable
+import discord
+
+class ThreadCache:
+    """Track which task threads still exist without a REST call per check.
+
+    Entries come from the gateway (thread create/update/delete events and
+    each guild's cached active threads). Only thread IDs the gateway never
+    told us about are checked over REST, concurrently but capped at
+    ``max_concurrency`` requests in flight.
+    """
+
+    def __init__(self, max_concurrency: int = 5):
+        self.max_concurrency = max_concurrency
+        self._alive: Dict[int, bool] = {}
+        self.rest_checks: int = 0
+
+    def seed_guild(self, guild: discord.Guild) -> None:
+        """Mark every active thread the gateway cached for a guild as alive"""
+        for thread in guild.threads:
+            self._alive[thread.id] = True
+
+    def mark_alive(self, thread_id: int) -> None:
+        self._alive[thread_id] = True
+
+    def mark_deleted(self, thread_id: int) -> None:
+        self._alive[thread_id] = False
+
+    def get(self, thread_id: int):
+        """Return True/False for known threads and None for unknown ones"""
+        return self._alive.get(thread_id)
+
+    async def check(self, guild: discord.Guild, thread_ids: Iterable[int]) -> Dict[int, bool]:
+        """Resolve whether each thread exists, fetching only unknown ones"""
+        thread_ids = list(dict.fromkeys(thread_ids))
+        for thread_id in thread_ids:
+            if thread_id not in self._alive and guild.get_thread(thread_id):
+                self._alive[thread_id] = True
+
+        unknown = [thread_id for thread_id in thread_ids if thread_id not in self._alive]
+        if unknown:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+
+            async def fetch(thread_id: int) -> None:
+                async with semaphore:
+                    self.rest_checks += 1
+                    try:
+                        await guild.fetch_channel(thread_id)
+                        self._alive[thread_id] = True
+                    except (discord.NotFound, discord.Forbidden):
+                        self._alive[thread_id] = False
+                    except Exception as e:
+                        # Leave it unknown so a transient error never drops a thread
+                        print(f"Error verifying thread {thread_id}: {e}")
+
+            await asyncio.gather(*(fetch(thread_id) for thread_id in unknown))
+
+        return {thread_id: self._alive.get(thread_id, True) for thread_id in thread_ids}
@@ -0,0 +1,79 @@
+"""Journal replay and compaction, on their own and under a store"""
+import json
+import os
+from datetime import datetime
+
+from core.journal import Journal
+from core.models import Task
+from core.persistence import TaskStore
+
+def write_lines(path, lines):
+    with open(path, 'w') as f:
+        f.write(lines)
+
+def test_replay_stops_at_a_torn_line(tmp_path):
+    journal = Journal(str(tmp_path / "data.json"))
+    write_lines(journal.log_path, '{"op":"put","id":1}\n\n{"op":"del","id":1}\n{"op":"put",')
+
+    assert list(journal.replay()) == [{'op': 'put', 'id': 1}, {'op': 'del', 'id': 1}]
+    assert journal.pending_records == 2
+
+def test_append_then_compact(tmp_path):
+    snapshot_path = str(tmp_path / "data.json")
+    journal = Journal(snapshot_path)
+    journal.append([{'op': 'put', 'id': 1}, {'op': 'put', 'id': 2}])
+    journal.append([])
+    assert journal.pending_records == 2
+    assert list(Journal(snapshot_path).replay()) == [{'op': 'put', 'id': 1}, {'op': 'put', 'id': 2}]
+
+    journal.compact({'records': [1, 2]})
+    assert not os.path.exists(journal.log_path)
+    assert journal.pending_records == 0
+    with open(snapshot_path) as f:
+        assert json.load(f) == {'records': [1, 2]}
+
+    # Appending after a compaction starts a new log
+    journal.append([{'op': 'put', 'id': 3}])
+    journal.close()
+    assert list(Journal(snapshot_path).replay()) == [{'op': 'put', 'id': 3}]
+
+def new_task(title, status="Not Started"):
+    return Task(0, title, "", status, datetime(2025, 1, 1))
+
+def test_store_replays_its_journal(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    store = TaskStore(path, mode="journal", flush_delay=0)
+    for title in ("a", "b", "c"):
+        store.add_task(new_task(title))
+    store.update_task(2, status="Completed")
+    store.delete_task(3)
+    store.set_channel_id(55)
+    expected = {task_id: task.to_dict() for task_id, task in store.get_all_tasks().items()}
+    store.close()
+    assert os.path.exists(f"{path}.log")
+
+    store = TaskStore(path, mode="journal", flush_delay=0)
+    assert {task_id: task.to_dict() for task_id, task in store.get_all_tasks().items()} == expected
+    assert (store.counter, store.channel_id) == (3, 55)
+    assert store.journal.pending_records > 0
+    store.close()
+
+def test_store_compacts_at_the_threshold(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    store = TaskStore(path, mode="journal", compact_threshold=3, flush_delay=0)
+    store.add_task(new_task("a"))
+    store.close()
+    assert os.path.exists(f"{path}.log")
+
+    store = TaskStore(path, mode="journal", compact_threshold=3, flush_delay=0)
+    store.add_task(new_task("b"))
+    store.add_task(new_task("c"))
+    store.close()
+    # The third record reached the threshold and was folded into the snapshot
+    assert not os.path.exists(f"{path}.log")
+    with open(path) as f:
+        assert sorted(json.load(f)['tasks']) == ['1', '2', '3']
+
+    store = TaskStore(path, mode="journal", compact_threshold=3, flush_delay=0)
+    assert [task.title for task in store.get_all_tasks().values()] == ["a", "b", "c"]
+    store.close()
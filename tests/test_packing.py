@@ -0,0 +1,90 @@
+"""Board and list layouts stay within Discord's embed limits"""
+import pytest
+
+from utils.packing import (
+    ELLIPSIS, MAX_EMBEDS, MAX_FIELD_NAME, MAX_FIELD_VALUE, MAX_FIELDS, MAX_TITLE, MAX_TOTAL,
+    Field, Section, join_truncated, pack, paginate, truncate
+)
+
+SEPARATOR = Field("​", "​")
+
+def task_block(number, value_size=100):
+    return [
+        Field.make(f"Task {number}", "d" * value_size),
+        Field.make("Assigned To", "<@1>", inline=True),
+        Field.make("Due Date", "soon", inline=True)
+    ]
+
+def check_limits(messages, max_total=MAX_TOTAL, max_embeds=MAX_EMBEDS, max_fields=MAX_FIELDS):
+    for message in messages:
+        assert 1 <= len(message) <= max_embeds
+        assert sum(page.size for page in message) <= max_total
+        for page in message:
+            assert len(page.title) <= MAX_TITLE
+            assert len(page.fields) <= max_fields
+            for field in page.fields:
+                assert len(field.name) <= MAX_FIELD_NAME and len(field.value) <= MAX_FIELD_VALUE
+
+def test_truncate_marks_the_cut():
+    assert truncate("short", 10) == "short"
+    cut = truncate("x" * 20, 10)
+    assert len(cut) == 10 and cut.endswith(ELLIPSIS)
+
+def test_join_truncated_keeps_whole_items():
+    assert join_truncated(["a", "b"], 100) == "a, b"
+    joined = join_truncated([f"<@{n}>" for n in range(100, 400)], 60)
+    assert len(joined) <= 60
+    assert joined.endswith(" more")
+    # Every item kept is complete
+    assert all(item.startswith("<@") and item.endswith(">") for item in joined.split(", ")[:-1])
+
+def test_field_make_cuts_to_the_limits():
+    field = Field.make("n" * 300, "v" * 2000)
+    assert (len(field.name), len(field.value)) == (MAX_FIELD_NAME, MAX_FIELD_VALUE)
+
+@pytest.mark.parametrize("count, value_size", [(1, 10), (40, 100), (300, 900)])
+def test_pack_respects_every_limit(count, value_size):
+    sections = [
+        Section(f"Status {status}", status, [task_block(n, value_size) for n in range(count)], SEPARATOR)
+        for status in range(3)
+    ]
+    messages = pack(sections)
+    check_limits(messages)
+
+    # Every task is placed exactly once, in order and never split
+    titles = [
+        field.name for message in messages for page in message
+        for field in page.fields if field.name.startswith("Task")
+    ]
+    assert titles == [f"Task {n}" for _ in range(3) for n in range(count)]
+
+def test_pack_gives_empty_sections_a_description():
+    messages = pack([Section("Blocked (0)", "red", [], SEPARATOR, empty="*Nothing blocked*")])
+    assert len(messages) == 1 and len(messages[0]) == 1
+    page = messages[0][0]
+    assert (page.fields, page.description) == ([], "*Nothing blocked*")
+
+def test_pack_honours_custom_limits():
+    sections = [Section("Tasks", None, [task_block(n) for n in range(10)], SEPARATOR)]
+    messages = pack(sections, max_embeds=1, max_fields=14)
+    check_limits(messages, max_embeds=1, max_fields=14)
+    assert all(len(message) == 1 for message in messages)
+
+def test_paginate_limits_blocks_fields_and_size():
+    small = [task_block(n, 10) for n in range(12)]
+    assert paginate(small, 5, separator=SEPARATOR) == [range(0, 5), range(5, 10), range(10, 12)]
+
+    big = [task_block(n, MAX_FIELD_VALUE) for n in range(7)]
+    pages = paginate(big, 5, reserved=100, separator=SEPARATOR)
+    assert [len(page) for page in pages] == [5, 2]
+    for page in pages:
+        size = 100 + sum(field.size for n in page for field in big[n]) + SEPARATOR.size * (len(page) - 1)
+        assert size <= MAX_TOTAL
+
+    wide = [[Field("f", "v")] * 10 for _ in range(3)]
+    assert paginate(wide, 5, separator=SEPARATOR) == [range(0, 2), range(2, 3)]
+
+def test_paginate_gives_an_oversized_block_its_own_page():
+    huge = [Field.make(f"f{n}", "v" * MAX_FIELD_VALUE) for n in range(7)]
+    assert paginate([huge, task_block(1)], 5) == [range(0, 1), range(1, 2)]
+    assert paginate([], 5) == []
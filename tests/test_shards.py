@@ -0,0 +1,48 @@
+"""Shard eviction racing with lookups"""
+import asyncio
+
+from core.shards import ShardedStore
+
+class FakeStore:
+    def __init__(self, guild_id):
+        self.guild_id = guild_id
+        self.flushing = asyncio.Event()
+        self.release = asyncio.Event()
+        self.closed = False
+
+    async def flush(self):
+        self.flushing.set()
+        await self.release.wait()
+
+    def close(self):
+        self.closed = True
+
+def test_lookup_during_eviction_keeps_the_shard_open():
+    async def scenario():
+        shards = ShardedStore(FakeStore, idle_timeout=10)
+        store = shards.store_for(1)
+        eviction = asyncio.ensure_future(shards.evict_idle(now=shards._last_used[1] + 60))
+        await store.flushing.wait()
+
+        assert shards.store_for(1) is store
+        store.release.set()
+        assert await eviction == 0
+        assert not store.closed
+        assert shards.store_for(1) is store
+        assert shards.metrics == {'loads': 1, 'evictions': 0}
+
+    asyncio.run(scenario())
+
+def test_idle_shard_is_closed_then_reopened():
+    async def scenario():
+        shards = ShardedStore(FakeStore, idle_timeout=10)
+        store = shards.store_for(1)
+        store.release.set()
+        assert await shards.evict_idle(now=shards._last_used[1] + 60) == 1
+        assert store.closed and shards.loaded_ids() == []
+
+        reopened = shards.store_for(1)
+        assert reopened is not store
+        assert shards.metrics == {'loads': 2, 'evictions': 1}
+
+    asyncio.run(scenario())
@@ -0,0 +1,93 @@
+"""Binary snapshots decode to the same records as the JSON format"""
+from datetime import datetime, timedelta, timezone
+
+from core.models import Meeting, Task
+from core.persistence import MeetingStore, TaskStore
+from core.snapshot import decode_snapshot, encode_snapshot, freeze_records
+
+BRUSSELS = timezone(timedelta(hours=2))
+
+def make_tasks():
+    return {
+        1: Task(1, "Write docs", "All of them", "Not Started", datetime(2025, 3, 1, 9, 30),
+                assigned_users=[10, 11, -5], seq=7),
+        2: Task(2, "Ship", "", "Completed", datetime(2025, 3, 2, tzinfo=BRUSSELS),
+                due_date=datetime(2025, 3, 9), thread_id=99, thread_creator_id=10,
+                completed_at=datetime(2025, 3, 3, 12, 0, 0, 123456), seq=8)
+    }
+
+def make_meetings():
+    return {
+        3: Meeting(3, "Standup", "Daily", datetime(2025, 3, 4, 10, tzinfo=BRUSSELS), 15, 10,
+                   [10, 11, -5], channel_id=42, calendar_event_id="abc",
+                   rsvp_status={10: "yes", 11: "maybe"}, reminder_sent=True, seq=9),
+        4: Meeting(4, "Retro", "", datetime(2025, 3, 5, 16), 60, 11, [])
+    }
+
+def as_dicts(records):
+    return {record_id: record.to_dict() for record_id, record in records.items()}
+
+def test_task_snapshot_round_trip():
+    tasks = make_tasks()
+    board = [{'key': 'header', 'id': 1, 'fingerprint': 'x'}]
+    changes = {'seq': 8, 'pruned_seq': 2, 'removed': {'5': [6, True]}}
+    snapshot = decode_snapshot(Task, encode_snapshot(Task, tasks, 5, 1234, board, changes))
+
+    assert as_dicts(snapshot.records) == as_dicts(tasks)
+    assert (snapshot.counter, snapshot.channel_id, snapshot.board_state, snapshot.changes) == (5, 1234, board, changes)
+
+def test_meeting_snapshot_round_trip():
+    meetings = make_meetings()
+    snapshot = decode_snapshot(Meeting, encode_snapshot(Meeting, meetings, 4, None, []))
+
+    assert as_dicts(snapshot.records) == as_dicts(meetings)
+    assert snapshot.channel_id is None
+
+def test_unbuilt_rows_are_written_back_unchanged():
+    data = encode_snapshot(Task, make_tasks(), 2, None, [])
+    records = decode_snapshot(Task, data).records
+    # Re-encoding rows that were never built as Tasks gives the same bytes
+    assert encode_snapshot(Task, records, 2, None, []) == data
+    assert records.built == 0
+
+def test_frozen_rows_ignore_later_changes():
+    meetings = make_meetings()
+    expected = as_dicts(meetings)
+    rows = freeze_records(Meeting, meetings)
+    meetings[3].rsvp_status[12] = "no"
+    meetings[3].participants.append(12)
+    meetings[4].title = "Renamed"
+
+    snapshot = decode_snapshot(Meeting, encode_snapshot(Meeting, rows, 4, None, []))
+    assert as_dicts(snapshot.records) == expected
+
+def test_store_switches_between_formats(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    store = TaskStore(path, snapshot_format="binary", flush_delay=0)
+    for task in make_tasks().values():
+        store.add_task(task)
+    expected = as_dicts(store.get_all_tasks())
+    store.close()
+    assert (tmp_path / "tasks.snap").exists()
+
+    # The newest snapshot wins, and is rewritten in the configured format
+    store = TaskStore(path, snapshot_format="json", flush_delay=0)
+    assert as_dicts(store.get_all_tasks()) == expected
+    store.close()
+
+    store = TaskStore(path, snapshot_format="binary", flush_delay=0)
+    assert as_dicts(store.get_all_tasks()) == expected
+    store.close()
+
+def test_meeting_store_binary_round_trip(tmp_path):
+    path = str(tmp_path / "meetings.json")
+    store = MeetingStore(path, mode="journal", snapshot_format="binary", flush_delay=0)
+    for meeting in make_meetings().values():
+        store.add_meeting(meeting)
+    store.set_rsvp(1, 12, "no")
+    expected = as_dicts(store.get_all_meetings())
+    store.close()
+
+    store = MeetingStore(path, mode="journal", snapshot_format="binary", flush_delay=0)
+    assert as_dicts(store.get_all_meetings()) == expected
+    store.close()
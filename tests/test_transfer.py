@@ -0,0 +1,126 @@
+"""Full and delta exports restore to the state of the last one"""
+import asyncio
+import io
+from datetime import datetime, timedelta
+
+import pytest
+
+from core.exceptions import InvalidTaskDataError, StorageError
+from core.models import Meeting, Task
+from core.persistence import MeetingStore, TaskStore
+from core.sqlite_store import SqliteMeetingStore, SqliteTaskStore
+from core.transfer import read_ndjson, restore_chain, write_export
+
+def open_json(directory):
+    return (
+        TaskStore(str(directory / "tasks.json"), flush_delay=0),
+        MeetingStore(str(directory / "meetings.json"), flush_delay=0)
+    )
+
+def open_sqlite(directory):
+    path = str(directory / "data.db")
+    return SqliteTaskStore(path, flush_delay=0), SqliteMeetingStore(path, flush_delay=0)
+
+@pytest.fixture(params=[open_json, open_sqlite], ids=["json", "sqlite"])
+def open_stores(request):
+    opened = []
+
+    def open_stores(directory):
+        directory.mkdir(exist_ok=True)
+        stores = request.param(directory)
+        opened.extend(stores)
+        return stores
+
+    yield open_stores
+    for store in opened:
+        store.close()
+
+def export(task_store, meeting_store, since=None):
+    buffer = io.BytesIO()
+    result = asyncio.run(write_export(buffer, task_store, meeting_store, since=since))
+    buffer.seek(0)
+    return buffer, result
+
+def restore(files, task_store, meeting_store):
+    return asyncio.run(restore_chain(files, task_store, meeting_store))
+
+def state(task_store, meeting_store):
+    return (
+        {task.id: task.to_dict() for task in task_store.get_all_tasks().values()},
+        {meeting.id: meeting.to_dict() for meeting in meeting_store.get_all_meetings().values()},
+        sorted(task_store.archive.ids()),
+        task_store.counter
+    )
+
+def new_task(title, status="Not Started", completed_at=None):
+    return Task(0, title, "", status, datetime(2025, 1, 1), completed_at=completed_at)
+
+def test_delta_restore_applies_updates_and_tombstones(tmp_path, open_stores):
+    tasks, meetings = open_stores(tmp_path / "source")
+    old = datetime.now() - timedelta(days=30)
+    for title in ("keep", "edit", "delete"):
+        tasks.add_task(new_task(title))
+    tasks.add_task(new_task("archive", "Completed", completed_at=old))
+    meetings.add_meeting(Meeting(0, "Sync", "", datetime(2025, 1, 2, 10), 30, 1, [1, 2]))
+    full, full_result = export(tasks, meetings)
+
+    tasks.update_task(2, title="edited")
+    tasks.delete_task(3)
+    tasks.archive_tasks("Completed", datetime.now())
+    tasks.add_task(new_task("added"))
+    meetings.set_rsvp(1, 2, "yes")
+    delta, delta_result = export(tasks, meetings, since=full_result.seq)
+    # The archived task travels as a record, the deleted one as a tombstone
+    assert (delta_result.tasks, delta_result.removed) == (3, 1)
+
+    restored_tasks, restored_meetings = open_stores(tmp_path / "restored")
+    result = restore([read_ndjson(full), read_ndjson(delta)], restored_tasks, restored_meetings)
+
+    assert (result.tasks, result.meetings, result.archived) == (3, 1, 1)
+    assert state(restored_tasks, restored_meetings) == state(tasks, meetings)
+    assert restored_tasks.is_archived(4)
+
+def test_pruned_tombstones_force_a_full_export(tmp_path, open_stores):
+    tasks, meetings = open_stores(tmp_path / "source")
+    tasks.add_task(new_task("a"))
+    tasks.add_task(new_task("b"))
+    _, full_result = export(tasks, meetings)
+    tasks.delete_task(1)
+
+    assert tasks.export_removed(full_result.seq) == [(1, tasks.seq, False)]
+    tasks.prune_removed(tasks.seq)
+    with pytest.raises(StorageError):
+        tasks.check_since(full_result.seq)
+    with pytest.raises(StorageError):
+        export(tasks, meetings, since=full_result.seq)
+
+    # A delta from after the pruned range still works
+    tasks.add_task(new_task("c"))
+    delta, delta_result = export(tasks, meetings, since=tasks.pruned_seq)
+    assert (delta_result.tasks, delta_result.removed) == (1, 0)
+
+def test_chain_must_continue_the_previous_file(tmp_path, open_stores):
+    tasks, meetings = open_stores(tmp_path / "source")
+    tasks.add_task(new_task("a"))
+    full, full_result = export(tasks, meetings)
+    tasks.add_task(new_task("b"))
+    first, first_result = export(tasks, meetings, since=full_result.seq)
+    tasks.add_task(new_task("c"))
+    second, _ = export(tasks, meetings, since=first_result.seq)
+
+    restored_tasks, restored_meetings = open_stores(tmp_path / "restored")
+    restored_tasks.add_task(new_task("untouched"))
+    with pytest.raises(InvalidTaskDataError):
+        restore([read_ndjson(full), read_ndjson(second)], restored_tasks, restored_meetings)
+    with pytest.raises(InvalidTaskDataError):
+        restore([read_ndjson(first)], restored_tasks, restored_meetings)
+    # A rejected chain leaves the stores as they were
+    assert [task.title for task in restored_tasks.get_all_tasks().values()] == ["untouched"]
+
+def test_one_import_per_store_at_a_time(tmp_path, open_stores):
+    tasks, meetings = open_stores(tmp_path / "source")
+    stage = tasks.stage_import()
+    with pytest.raises(StorageError):
+        tasks.stage_import()
+    stage.abort()
+    tasks.stage_import().abort()
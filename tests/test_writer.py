@@ -0,0 +1,30 @@
+"""Background writer retries and failures on close"""
+import pytest
+
+from core.exceptions import StorageError
+from core.writer import BackgroundWriter
+
+class FlakyWrite:
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise OSError("disk full")
+
+def test_failed_write_on_close_is_retried_once():
+    write = FlakyWrite(failures=1)
+    writer = BackgroundWriter("test", write, flush_delay=60)
+    writer.mark_dirty()
+    writer.close()
+    assert (write.calls, writer.writes) == (2, 1)
+
+def test_close_raises_when_the_retry_fails_too():
+    write = FlakyWrite(failures=5)
+    writer = BackgroundWriter("test", write, flush_delay=60)
+    writer.mark_dirty()
+    with pytest.raises(StorageError):
+        writer.close()
+    assert write.calls == 2
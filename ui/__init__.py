@@ -1,5 +1,5 @@
-from .views import TaskStatusView, CreateTaskButton, StatusButton
-from .modals import CreateTaskModal
+from .views import TaskStatusView, CreateTaskButton, StatusButton, BulkConfirmView, TaskListView
+from .modals import CreateTaskModal, PageJumpModal
 from .embeds import TaskBoardEmbeds
 from .meeting_views import RSVPView
 
@@ -7,7 +7,10 @@ __all__ = [
     'TaskStatusView', 
     'CreateTaskButton', 
     'StatusButton',
+    'BulkConfirmView',
+    'TaskListView',
     'CreateTaskModal',
+    'PageJumpModal',
     'TaskBoardEmbeds',
     'RSVPView'
 ]
\ No newline at end of file
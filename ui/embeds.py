@@ -1,9 +1,13 @@
-from typing import List
+from typing import List, Optional, Tuple
 import discord
 from bot.constant import STATUS_EMOJIS, STATUS_COLORS
-from core.models import Task
+from core.models import Task, target_mention
 from bot.constant import TaskStatus
 from datetime import datetime
+from utils.packing import MAX_FIELD_VALUE, MAX_TITLE, Field, Page, Section, join_truncated, pack, truncate
+
+# Blank full-width field between tasks sharing an embed
+SEPARATOR = Field("\u200b", "\u200b")
 
 class TaskBoardEmbeds:
     @staticmethod
@@ -22,87 +26,128 @@ class TaskBoardEmbeds:
         return embed
     
     @staticmethod
-    def create_status_section(status: TaskStatus, tasks: List[Task], guild: discord.Guild) -> List[discord.Embed]:
-        """Create status section embeds, splitting into multiple embeds if needed"""
-        embeds = []
-        # Reduced to 3 tasks per embed since each task uses 7 fields max (4 main + 3 for thread)
-        tasks_per_embed = 3  
-        
-        for i in range(0, len(tasks), tasks_per_embed):
-            chunk = tasks[i:i + tasks_per_embed]
-            
-            emoji = STATUS_EMOJIS[status]
-            embed = discord.Embed(
-                title=f"{emoji} {status.value} ({len(tasks)})",
-                color=STATUS_COLORS[status]
+    def task_fields(
+        task: Task,
+        now: datetime,
+        guild: discord.Guild,
+        name: Optional[str] = None
+    ) -> List[Field]:
+        """The title and description, assignee, due date and thread fields of a task"""
+        # Format due date
+        if task.due_date:
+            days_until_due = (task.due_date - now).days
+            if days_until_due < 0:
+                due_date_str = f"⚠️ **OVERDUE** ({abs(days_until_due)} days)"
+            elif days_until_due == 0:
+                due_date_str = "⚠️ **DUE TODAY**"
+            elif days_until_due <= 2:
+                due_date_str = f"⚠️ Due in {days_until_due} days"
+            else:
+                due_date_str = f"📅 Due {task.due_date.strftime('%Y-%m-%d')}"
+        else:
+            due_date_str = "📅 No due date"
+
+        # Backticks in the description would close the code block early
+        description = task.description.replace("```", "`\u200b``")
+        prefix, suffix = "**Task description** :\n```", "```\n"
+        description = truncate(description, MAX_FIELD_VALUE - len(prefix) - len(suffix))
+
+        fields = [
+            Field.make(name or f"**__#{task.id} • {task.title}__**", f"{prefix}{description}{suffix}"),
+            Field.make(
+                "**Assigned To**",
+                join_truncated(
+                    (target_mention(target, guild.id) for target in task.assigned_users), MAX_FIELD_VALUE
+                ) or "Unassigned",
+                inline=True
+            ),
+            Field.make("**Due Date**", due_date_str, inline=True)
+        ]
+
+        # Link the discussion thread, if it still exists
+        if task.thread_id:
+            thread = guild.get_thread(task.thread_id)
+            if thread:
+                fields.append(Field.make("💬 Discussion", f"[Go to thread]({thread.jump_url})", inline=True))
+        return fields
+
+    @staticmethod
+    def to_embed(page: Page) -> discord.Embed:
+        """Build the embed for a packed page"""
+        embed = discord.Embed(title=page.title, description=page.description, color=page.color)
+        for name, value, inline in page.fields:
+            embed.add_field(name=name, value=value, inline=inline)
+        return embed
+
+    @staticmethod
+    def create_status_sections(
+        sections: List[Tuple[TaskStatus, List[Task]]],
+        guild: discord.Guild,
+        now: Optional[datetime] = None
+    ) -> List[List[discord.Embed]]:
+        """Lay the status sections out as the embeds of as few board messages as possible.
+
+        Embeds are filled up to Discord's field and size limits and each
+        message carries up to ten of them; a task is never split between
+        embeds.
+        """
+        now = now or datetime.now()
+        packed = pack(
+            Section(
+                title=f"{STATUS_EMOJIS[status]} {status.value} ({len(tasks)})",
+                color=STATUS_COLORS[status],
+                blocks=[TaskBoardEmbeds.task_fields(task, now, guild) for task in tasks],
+                separator=SEPARATOR,
+                empty=f"*No tasks are currently {status.value.lower()}*"
             )
-            
-            if not chunk:
-                embed.description = f"*No tasks are currently {status.value.lower()}*"
-                embeds.append(embed)
-                continue
-            
-            for task in chunk:
-                # Format due date
-                if task.due_date:
-                    days_until_due = (task.due_date - datetime.now()).days
-                    if days_until_due < 0:
-                        due_date_str = f"⚠️ **OVERDUE** ({abs(days_until_due)} days)"
-                    elif days_until_due == 0:
-                        due_date_str = "⚠️ **DUE TODAY**"
-                    elif days_until_due <= 2:
-                        due_date_str = f"⚠️ Due in {days_until_due} days"
-                    else:
-                        due_date_str = f"📅 Due {task.due_date.strftime('%Y-%m-%d')}"
-                else:
-                    due_date_str = "📅 No due date"
-
-                # Add task fields
-                embed.add_field(
-                    name=f"**__#{task.id} • {task.title}__**",
-                    value=f"**Task description** :\n```{task.description}```\n",
-                    inline=False
-                )
-                embed.add_field(
-                    name="**Assigned To**",
-                    value= ", ".join([f"<@{user_id}>" for user_id in task.assigned_users]) if len(task.assigned_users) > 1 else f"<@{task.assigned_users[0]}>" if len(task.assigned_users) > 0 else "Unassigned",
-                    inline=True
-                )
-                embed.add_field(
-                    name="**Due Date**",
-                    value=due_date_str,
-                    inline=True
-                )
-
-                embed.set_thumbnail(url=f"https://placehold.co/400x400/2C2D31/FFFFFF/png?text=%23{len(embeds) + 1}")
-
-                # Add thread information if exists
-                if task.thread_id:
-                    thread = guild.get_thread(task.thread_id)
-                    if thread:  
-                        embed.add_field(
-                            name="💬 Discussion",
-                            value=f"[Go to thread]({thread.jump_url})",
-                            inline=True
-                        )
-
-                # Add separator only between tasks, not after the last one
-                if task != chunk[-1]:
-                    embed.add_field(name="\u200b", value="\u200b", inline=False)
-
-            # Set footer for each embed
-            if len(tasks) > tasks_per_embed:
-                embed.set_footer(
-                    text=f"Use reactions to navigate between pages • Use !task_help for more commands",
-                    icon_url="https://cdn.discordapp.com/app-icons/1336810436984836226/ce2f15ca0258cffeecfe1fc6276ee28d.png?size=512"
-                )
-            
-            embeds.append(embed)
-        
-        return embeds
+            for status, tasks in sections
+        )
+        return [[TaskBoardEmbeds.to_embed(page) for page in message] for message in packed]
+
+    @staticmethod
+    def list_fields(task: Task, now: datetime, guild: discord.Guild) -> List[Field]:
+        """The fields of a task in a task list, labelled with its status"""
+        status = TaskStatus(task.status)
+        return TaskBoardEmbeds.task_fields(
+            task, now, guild, name=f"{STATUS_EMOJIS[status]} **__#{task.id} • {task.title}__**"
+        )
+
+    @staticmethod
+    def task_page_title(title: str, total: int) -> str:
+        return truncate(f"{title} ({total})", MAX_TITLE)
+
+    @staticmethod
+    def task_page_footer(page: int, page_count: int) -> str:
+        return f"Page {page + 1}/{page_count}"
+
+    @staticmethod
+    def create_task_page(
+        title: str,
+        blocks: List[List[Field]],
+        page: int,
+        page_count: int,
+        total: int,
+        color: discord.Color
+    ) -> discord.Embed:
+        """Render one page of a paginated task list from the ``list_fields`` of its tasks.
+
+        The caller sizes pages with ``utils.packing.paginate`` so the embed
+        stays within Discord's limits.
+        """
+        embed = discord.Embed(title=TaskBoardEmbeds.task_page_title(title, total), color=color)
+        if not blocks:
+            embed.description = "*No tasks match this filter*"
+        for position, block in enumerate(blocks):
+            fields = list(block)
+            if position < len(blocks) - 1:
+                fields.append(SEPARATOR)
+            for name, value, inline in fields:
+                embed.add_field(name=name, value=value, inline=inline)
+        embed.set_footer(text=TaskBoardEmbeds.task_page_footer(page, page_count))
+        return embed
 
     @staticmethod
-    def create_task_info(task: Task) -> discord.Embed:
+    def create_task_info(task: Task, guild_id: Optional[int] = None) -> discord.Embed:
         """Create an embed for displaying detailed task information"""
         status = TaskStatus(task.status)
         embed = discord.Embed(
@@ -131,7 +176,7 @@ class TaskBoardEmbeds:
         
         # Assigned Users
         assigned_users = (
-            ", ".join([f"<@{user_id}>" for user_id in task.assigned_users])
+            ", ".join(target_mention(target, guild_id) for target in task.assigned_users)
             if task.assigned_users
             else "*No users assigned*"
         )
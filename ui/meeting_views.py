@@ -6,25 +6,31 @@ class RSVPView(View):
         super().__init__(timeout=None)
         self.meeting_manager = meeting_manager
         self.meeting_id = meeting_id
+        # Persistent views are routed by custom_id, so every meeting needs its own
+        self.yes_button.custom_id = f"rsvp_{meeting_id}_yes"
+        self.maybe_button.custom_id = f"rsvp_{meeting_id}_maybe"
+        self.no_button.custom_id = f"rsvp_{meeting_id}_no"
         
-    @button(label="Yes", style=discord.ButtonStyle.green, emoji="✅", custom_id=f"rsvp_yes")
+    @button(label="Yes", style=discord.ButtonStyle.green, emoji="✅")
     async def yes_button(self, interaction: discord.Interaction, button: Button):
         await self.handle_rsvp(interaction, "yes")
         
-    @button(label="Maybe", style=discord.ButtonStyle.gray, emoji="❔", custom_id=f"rsvp_maybe")
+    @button(label="Maybe", style=discord.ButtonStyle.gray, emoji="❔")
     async def maybe_button(self, interaction: discord.Interaction, button: Button):
         await self.handle_rsvp(interaction, "maybe")
         
-    @button(label="No", style=discord.ButtonStyle.red, emoji="❌", custom_id=f"rsvp_no")
+    @button(label="No", style=discord.ButtonStyle.red, emoji="❌")
     async def no_button(self, interaction: discord.Interaction, button: Button):
         await self.handle_rsvp(interaction, "no")
         
     async def handle_rsvp(self, interaction: discord.Interaction, response: str):
         try:
             await self.meeting_manager.update_rsvp(
+                interaction.guild.id,
                 self.meeting_id,
                 interaction.user.id,
-                response
+                response,
+                [role.id for role in interaction.user.roles]
             )
             
             await interaction.response.send_message(
@@ -32,9 +38,6 @@ class RSVPView(View):
                 ephemeral=True
             )
             
-            # Update the meeting board to reflect the new RSVP
-            await self.meeting_manager.update_board(interaction.guild)
-            
         except Exception as e:
             await interaction.response.send_message(
                 f"Failed to record your response: {str(e)}",
@@ -2,6 +2,9 @@ import discord
 from discord import TextStyle
 from discord.ui import Modal, TextInput
 from core.exceptions import InvalidTaskDataError
+from core.models import target_mention
+from utils.mentions import parse_mentions
+from utils.packing import MAX_FIELD_VALUE, join_truncated
 from utils.validator import validate_task_data
 
 class CreateTaskModal(Modal):
@@ -31,9 +34,17 @@ class CreateTaskModal(Modal):
             max_length=10
         )
         
+        self.assignees_input = TextInput(
+            label="Assign To (Optional)",
+            placeholder="@username @role or @everyone",
+            required=False,
+            max_length=1000
+        )
+        
         self.add_item(self.title_input)
         self.add_item(self.description_input)
         self.add_item(self.date_input)
+        self.add_item(self.assignees_input)
 
     async def on_submit(self, interaction: discord.Interaction):
         try:
@@ -43,12 +54,26 @@ class CreateTaskModal(Modal):
             due_date = self.date_input.value if self.date_input.value else None
             
             validate_task_data(title, description, due_date)
+        except InvalidTaskDataError as e:
+            await interaction.response.send_message(
+                f"❌ {str(e)}", 
+                ephemeral=True
+            )
+            return
+
+        # Resolving mentions may query the gateway, so answer the interaction first
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        try:
+            # Resolve typed names as well as pasted mentions
+            mentions = await parse_mentions(interaction.guild, self.assignees_input.value or "")
             
             # Create task
             task = await self.task_manager.create_task(
+                guild=interaction.guild,
                 title=title,
                 description=description,
-                due_date=due_date
+                due_date=due_date,
+                assigned_users=mentions.targets
             )
             
             # Create response embed
@@ -61,21 +86,55 @@ class CreateTaskModal(Modal):
             embed.add_field(name="Description", value=task.description, inline=False)
             if task.due_date:
                 embed.add_field(name="Due Date", value=task.due_date.strftime("%d-%m-%Y"), inline=False)
+            if task.assigned_users:
+                embed.add_field(
+                    name="Assigned To",
+                    value=join_truncated(
+                        (target_mention(target, interaction.guild.id) for target in task.assigned_users),
+                        MAX_FIELD_VALUE
+                    ),
+                    inline=False
+                )
+            if mentions.skipped:
+                embed.add_field(name="⚠️ Not Found", value=join_truncated(mentions.skipped, MAX_FIELD_VALUE), inline=False)
             
             # Send response to interaction
-            await interaction.response.send_message(embed=embed, ephemeral=True)
-            
-            # Update task board
-            await self.task_manager.update_board(interaction.guild)
+            await interaction.followup.send(embed=embed, ephemeral=True)
             
         except InvalidTaskDataError as e:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 f"❌ {str(e)}", 
                 ephemeral=True
             )
         except Exception as e:
-            if not interaction.response.is_done():
-                await interaction.response.send_message(
-                    "❌ An error occurred while creating the task.", 
-                    ephemeral=True
-                )
\ No newline at end of file
+            await interaction.followup.send(
+                "❌ An error occurred while creating the task.", 
+                ephemeral=True
+            )
+
+class PageJumpModal(Modal):
+    """Ask for a page number of a paginated view to jump to"""
+
+    def __init__(self, view):
+        super().__init__(title="Jump to Page")
+        self.list_view = view
+        
+        self.page_input = TextInput(
+            label=f"Page (1-{view.page_count})",
+            placeholder=str(view.page + 1),
+            max_length=6,
+            required=True
+        )
+        
+        self.add_item(self.page_input)
+
+    async def on_submit(self, interaction: discord.Interaction):
+        value = self.page_input.value.strip()
+        if not value.isdigit():
+            await interaction.response.send_message(
+                "❌ Please enter a page number.",
+                ephemeral=True
+            )
+            return
+        self.list_view.page = min(max(int(value), 1), self.list_view.page_count) - 1
+        await interaction.response.edit_message(embed=self.list_view.render(), view=self.list_view)
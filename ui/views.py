@@ -1,8 +1,12 @@
-from typing import Optional
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 import discord
-from discord.ui import View, Button
+from discord.ui import View, Button, Select, button, select
 from bot.constant import TaskStatus, STATUS_COLORS, STATUS_EMOJIS
-from ui.modals import CreateTaskModal
+from core.models import Task
+from ui.embeds import SEPARATOR, TaskBoardEmbeds
+from ui.modals import CreateTaskModal, PageJumpModal
+from utils.packing import Field, paginate
 
 class CreateTaskButton(Button):
     def __init__(self, task_manager):
@@ -32,7 +36,9 @@ class StatusButton(Button):
 
     async def callback(self, interaction: discord.Interaction):
         try:
-            task = await self.task_manager.update_task_status(self.task_id, self.status)
+            task = await self.task_manager.update_task_status(
+                interaction.guild, self.task_id, self.status
+            )
             
             embed = discord.Embed(
                 title="🔄 Task Updated",
@@ -41,7 +47,6 @@ class StatusButton(Button):
             )
             
             await interaction.response.edit_message(embed=embed, view=None)
-            await self.task_manager.update_board(interaction.guild)
             
         except Exception as e:
             await interaction.response.send_message(
@@ -53,4 +58,189 @@ class TaskStatusView(View):
     def __init__(self, task_id: int, task_manager):
         super().__init__(timeout=None)
         for status in TaskStatus:
-            self.add_item(StatusButton(status, task_id, task_manager))
\ No newline at end of file
+            self.add_item(StatusButton(status, task_id, task_manager))
+
+class BulkConfirmView(View):
+    """Confirm or cancel a bulk operation previewed by /bulk"""
+
+    def __init__(self, task_manager, user_id: int, task_filter, new_status: Optional[TaskStatus] = None):
+        super().__init__(timeout=180)
+        self.task_manager = task_manager
+        self.user_id = user_id
+        self.task_filter = task_filter
+        # None deletes the matching tasks
+        self.new_status = new_status
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.user_id:
+            await interaction.response.send_message(
+                "❌ Only the member who ran /bulk can confirm it.",
+                ephemeral=True
+            )
+            return False
+        return True
+
+    @button(label="Confirm", style=discord.ButtonStyle.danger, emoji="✔️")
+    async def confirm_button(self, interaction: discord.Interaction, button: Button):
+        self.stop()
+        await interaction.response.defer()
+        try:
+            # The filter is applied again, so tasks changed since the preview are handled as they are now
+            if self.new_status is None:
+                tasks = await self.task_manager.bulk_delete(interaction.guild, self.task_filter)
+                embed = discord.Embed(
+                    title="🗑️ Bulk Delete Complete",
+                    description=f"Deleted {len(tasks)} task(s)",
+                    color=discord.Color.red()
+                )
+            else:
+                tasks = await self.task_manager.bulk_update_status(
+                    interaction.guild, self.task_filter, self.new_status
+                )
+                embed = discord.Embed(
+                    title="🔄 Bulk Update Complete",
+                    description=f"Moved {len(tasks)} task(s) to {STATUS_EMOJIS[self.new_status]} {self.new_status.value}",
+                    color=STATUS_COLORS[self.new_status]
+                )
+            await interaction.edit_original_response(embed=embed, view=None)
+            
+        except Exception as e:
+            await interaction.edit_original_response(
+                content=f"❌ Bulk operation failed: {str(e)}",
+                embed=None,
+                view=None
+            )
+
+    @button(label="Cancel", style=discord.ButtonStyle.secondary, emoji="✖️")
+    async def cancel_button(self, interaction: discord.Interaction, button: Button):
+        self.stop()
+        await interaction.response.edit_message(content="Bulk operation cancelled, nothing was changed.", embed=None, view=None)
+
+
+class TaskListView(View):
+    """Paginated task list with a status filter, behind a single ephemeral message.
+
+    The tasks are sorted and grouped by status once; filtering and paging
+    only slice that cached result, and a page is rendered when it is shown.
+    A page holds up to ``PAGE_SIZE`` tasks, fewer when their fields would
+    exceed Discord's embed limits; the page breaks of each filter are
+    worked out once, from the fields of its tasks.
+    """
+    PAGE_SIZE = 5
+    ALL = "all"
+
+    def __init__(self, tasks: List[Task], guild: discord.Guild, title: str = "Your Task List"):
+        super().__init__(timeout=600)
+        self.guild = guild
+        self.title = title
+        order = {status.value: position for position, status in enumerate(TaskStatus)}
+        self.tasks = sorted(tasks, key=lambda task: (order.get(task.status, len(order)), task.id))
+        self.by_status: Dict[str, List[Task]] = {}
+        for task in self.tasks:
+            self.by_status.setdefault(task.status, []).append(task)
+        self.status: Optional[TaskStatus] = None
+        self.page = 0
+        self.now = datetime.now()
+        # Fields by task ID, and the pages of each filter as ranges of ``shown``
+        self._blocks: Dict[int, List[Field]] = {}
+        self._pages: Dict[Optional[TaskStatus], List[range]] = {}
+
+        self.filter_select.options = [
+            discord.SelectOption(label=f"All statuses ({len(self.tasks)})", value=self.ALL, emoji="📋", default=True)
+        ] + [
+            discord.SelectOption(
+                label=f"{status.value} ({len(self.by_status[status.value])})",
+                value=status.value,
+                emoji=STATUS_EMOJIS[status]
+            )
+            for status in TaskStatus if status.value in self.by_status
+        ]
+        self._update_buttons()
+
+    @property
+    def shown(self) -> List[Task]:
+        """Tasks passing the status filter"""
+        return self.tasks if self.status is None else self.by_status.get(self.status.value, [])
+
+    def _heading(self) -> Tuple[str, discord.Color]:
+        if self.status is None:
+            return f"📋 {self.title}", discord.Color.blue()
+        return f"{STATUS_EMOJIS[self.status]} {self.title}: {self.status.value}", STATUS_COLORS[self.status]
+
+    def _fields(self, task: Task) -> List[Field]:
+        fields = self._blocks.get(task.id)
+        if fields is None:
+            fields = self._blocks[task.id] = TaskBoardEmbeds.list_fields(task, self.now, self.guild)
+        return fields
+
+    @property
+    def pages(self) -> List[range]:
+        """Pages of the current filter"""
+        pages = self._pages.get(self.status)
+        if pages is None:
+            shown = self.shown
+            title, _ = self._heading()
+            # Page numbers never exceed the task count, so this footer is the longest
+            reserved = (
+                len(TaskBoardEmbeds.task_page_title(title, len(shown)))
+                + len(TaskBoardEmbeds.task_page_footer(len(shown), len(shown)))
+            )
+            pages = paginate(
+                [self._fields(task) for task in shown], self.PAGE_SIZE, reserved, SEPARATOR
+            )
+            self._pages[self.status] = pages
+        return pages
+
+    @property
+    def page_count(self) -> int:
+        return max(1, len(self.pages))
+
+    def render(self) -> discord.Embed:
+        """Build the embed of the current page"""
+        self._update_buttons()
+        title, color = self._heading()
+        pages = self.pages
+        tasks = [self.shown[position] for position in pages[self.page]] if pages else []
+        return TaskBoardEmbeds.create_task_page(
+            title, [self._fields(task) for task in tasks],
+            self.page, self.page_count, len(self.shown), color
+        )
+
+    def _update_buttons(self) -> None:
+        last = self.page_count - 1
+        self.first_button.disabled = self.previous_button.disabled = self.page == 0
+        self.next_button.disabled = self.last_button.disabled = self.page >= last
+        self.jump_button.disabled = last == 0
+        self.jump_button.label = f"{self.page + 1}/{self.page_count}"
+
+    async def _show(self, interaction: discord.Interaction, page: int) -> None:
+        self.page = min(max(page, 0), self.page_count - 1)
+        await interaction.response.edit_message(embed=self.render(), view=self)
+
+    @select(placeholder="Filter by status", row=0)
+    async def filter_select(self, interaction: discord.Interaction, select: Select):
+        value = select.values[0]
+        self.status = None if value == self.ALL else TaskStatus(value)
+        for option in select.options:
+            option.default = option.value == value
+        await self._show(interaction, 0)
+
+    @button(emoji="⏮️", style=discord.ButtonStyle.secondary, row=1)
+    async def first_button(self, interaction: discord.Interaction, button: Button):
+        await self._show(interaction, 0)
+
+    @button(emoji="◀️", style=discord.ButtonStyle.secondary, row=1)
+    async def previous_button(self, interaction: discord.Interaction, button: Button):
+        await self._show(interaction, self.page - 1)
+
+    @button(label="1/1", style=discord.ButtonStyle.primary, row=1)
+    async def jump_button(self, interaction: discord.Interaction, button: Button):
+        await interaction.response.send_modal(PageJumpModal(self))
+
+    @button(emoji="▶️", style=discord.ButtonStyle.secondary, row=1)
+    async def next_button(self, interaction: discord.Interaction, button: Button):
+        await self._show(interaction, self.page + 1)
+
+    @button(emoji="⏭️", style=discord.ButtonStyle.secondary, row=1)
+    async def last_button(self, interaction: discord.Interaction, button: Button):
+        await self._show(interaction, self.page_count - 1)
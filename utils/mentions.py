@@ -0,0 +1,137 @@
+import asyncio
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List
+import discord
+from core.models import role_target
+from config import MEMBER_QUERY_CONCURRENCY
+
+# <@id> and <@!id> users, <@&id> roles, <#id> channels, @everyone and @here,
+# and plain @name as typed where Discord doesn't offer mentions (modals)
+MENTION_PATTERN = re.compile(
+    r"<@!?(?P<user>\d+)>"
+    r"|<@&(?P<role>\d+)>"
+    r"|<#(?P<channel>\d+)>"
+    r"|@(?P<everyone>everyone|here)\b"
+    r"|@(?P<name>[^\s@#<>]+)"
+)
+# query_members takes at most 100 user IDs per request
+QUERY_BATCH = 100
+# Beyond this many uncached members one full member download beats batched queries
+CHUNK_THRESHOLD = 1000
+
+@dataclass
+class Mentions:
+    """What the mentions in a piece of text resolved to within a guild"""
+    guild_id: int
+    members: List[discord.Member] = field(default_factory=list)
+    roles: List[discord.Role] = field(default_factory=list)
+    channels: List[discord.abc.GuildChannel] = field(default_factory=list)
+    everyone: bool = False
+    # Mentioned bots, which can't be assigned or invited
+    bots: List[discord.Member] = field(default_factory=list)
+    # Mentions that matched nothing in the guild, as they were typed
+    unresolved: List[str] = field(default_factory=list)
+
+    @property
+    def targets(self) -> List[int]:
+        """Assignee or participant entries: @everyone alone, or the members and roles"""
+        if self.everyone:
+            return [role_target(self.guild_id)]
+        return [member.id for member in self.members] + [role_target(role.id) for role in self.roles]
+
+    @property
+    def skipped(self) -> List[str]:
+        """Mentions left out of the targets: unknown ones as typed, then bots"""
+        return self.unresolved + [member.mention for member in self.bots]
+
+async def parse_mentions(
+    guild: discord.Guild,
+    text: str,
+    concurrency: int = MEMBER_QUERY_CONCURRENCY
+) -> Mentions:
+    """Resolve every mention in ``text`` against ``guild``.
+
+    Members come from the cache when possible; the ones it is missing are
+    fetched in batches of up to ``QUERY_BATCH`` IDs, with at most
+    ``concurrency`` gateway queries in flight, instead of being dropped.
+    """
+    result = Mentions(guild.id)
+    # Mentioned user IDs and names, in order, with the token that named them
+    user_tokens: Dict[int, str] = {}
+    name_tokens: Dict[str, str] = {}
+    for match in MENTION_PATTERN.finditer(text):
+        token = match.group(0)
+        if match['user']:
+            user_tokens.setdefault(int(match['user']), token)
+        elif match['role']:
+            role = guild.get_role(int(match['role']))
+            if role is None:
+                result.unresolved.append(token)
+            elif role not in result.roles:
+                result.roles.append(role)
+        elif match['channel']:
+            channel = guild.get_channel(int(match['channel']))
+            if channel is None:
+                result.unresolved.append(token)
+            elif channel not in result.channels:
+                result.channels.append(channel)
+        elif match['everyone']:
+            result.everyone = True
+        else:
+            name_tokens.setdefault(match['name'].casefold(), token)
+
+    members: Dict[int, discord.Member] = {}
+    missing = []
+    for user_id in user_tokens:
+        member = guild.get_member(user_id)
+        if member:
+            members[user_id] = member
+        else:
+            missing.append(user_id)
+
+    if len(missing) > CHUNK_THRESHOLD and not guild.chunked:
+        await guild.chunk()
+        members.update((user_id, guild.get_member(user_id)) for user_id in missing)
+        missing = [user_id for user_id in missing if members[user_id] is None]
+
+    if missing or name_tokens:
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def query(**kwargs) -> List[discord.Member]:
+            async with semaphore:
+                try:
+                    return await guild.query_members(**kwargs)
+                except (asyncio.TimeoutError, discord.ClientException):
+                    return []
+
+        batches = [
+            query(user_ids=missing[i:i + QUERY_BATCH], limit=QUERY_BATCH)
+            for i in range(0, len(missing), QUERY_BATCH)
+        ]
+        lookups = [query(query=name, limit=5) for name in name_tokens]
+        found = await asyncio.gather(*batches, *lookups)
+
+        for batch in found[:len(batches)]:
+            members.update((member.id, member) for member in batch)
+        # Names are prefix searches, only an exact name or nickname counts
+        for (name, token), candidates in zip(name_tokens.items(), found[len(batches):]):
+            member = next(
+                (m for m in candidates if name in (m.name.casefold(), m.display_name.casefold())),
+                None
+            )
+            if member is None:
+                result.unresolved.append(token)
+            elif member.id not in user_tokens:
+                user_tokens[member.id] = token
+                members[member.id] = member
+
+    for user_id, token in user_tokens.items():
+        member = members.get(user_id)
+        if member is None:
+            result.unresolved.append(token)
+        elif member.bot:
+            result.bots.append(member)
+        else:
+            result.members.append(member)
+    return result
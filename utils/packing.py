@@ -0,0 +1,158 @@
+from dataclasses import dataclass, field
+from typing import Any, Iterable, List, NamedTuple, Optional, Sequence
+
+# Discord's limits: embeds per message, characters across all embeds of a
+# message, fields per embed and the length of each part
+MAX_EMBEDS = 10
+MAX_TOTAL = 6000
+MAX_FIELDS = 25
+MAX_TITLE = 256
+MAX_DESCRIPTION = 4096
+MAX_FIELD_NAME = 256
+MAX_FIELD_VALUE = 1024
+
+ELLIPSIS = "…"
+
+def truncate(text: str, limit: int) -> str:
+    """Cut ``text`` to at most ``limit`` characters, marking the cut"""
+    return text if len(text) <= limit else text[:limit - len(ELLIPSIS)] + ELLIPSIS
+
+def join_truncated(items: Iterable[str], limit: int, separator: str = ", ") -> str:
+    """Join whole items only, ending with a count of the ones that didn't fit"""
+    items = list(items)
+    text = ""
+    for position, item in enumerate(items):
+        candidate = item if not text else f"{text}{separator}{item}"
+        rest = len(items) - position - 1
+        # Leave room to say how many are left out, should later ones not fit
+        suffix = f"{separator}+{rest} more" if rest else ""
+        if len(candidate) + len(suffix) > limit:
+            return f"{text}{separator}+{len(items) - position} more" if text else truncate(item, limit)
+        text = candidate
+    return text
+
+class Field(NamedTuple):
+    name: str
+    value: str
+    inline: bool = False
+
+    @classmethod
+    def make(cls, name: str, value: str, inline: bool = False) -> 'Field':
+        """A field cut down to Discord's name and value limits"""
+        return cls(truncate(name, MAX_FIELD_NAME), truncate(value, MAX_FIELD_VALUE), inline)
+
+    @property
+    def size(self) -> int:
+        return len(self.name) + len(self.value)
+
+class Section(NamedTuple):
+    """Embeds sharing a title and colour, filled with blocks of fields.
+
+    A block (e.g. one task) is never split across embeds; ``separator`` goes
+    between blocks that share one, and ``empty`` is the description of the
+    single embed of a section without blocks.
+    """
+    title: str
+    color: Any
+    blocks: Sequence[Sequence[Field]]
+    separator: Optional[Field] = None
+    empty: Optional[str] = None
+
+@dataclass
+class Page:
+    """The content of one embed"""
+    title: str
+    color: Any
+    fields: List[Field] = field(default_factory=list)
+    description: Optional[str] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.title) + len(self.description or "") + sum(f.size for f in self.fields)
+
+def pack(
+    sections: Iterable[Section],
+    max_total: int = MAX_TOTAL,
+    max_embeds: int = MAX_EMBEDS,
+    max_fields: int = MAX_FIELDS
+) -> List[List[Page]]:
+    """Lay sections out over as few messages as the limits allow.
+
+    Each block goes into the section's current embed while that stays under
+    ``max_fields`` fields and its message under ``max_total`` characters,
+    otherwise into a new embed, which starts a new message once the current
+    one has ``max_embeds`` embeds or no room left.
+    """
+    messages: List[List[Page]] = []
+    message: List[Page] = []
+    used = 0
+
+    def place(page: Page) -> None:
+        nonlocal message, used
+        if message and (len(message) >= max_embeds or used + page.size > max_total):
+            messages.append(message)
+            message, used = [], 0
+        message.append(page)
+        used += page.size
+
+    for section in sections:
+        title = truncate(section.title, MAX_TITLE)
+        if not section.blocks:
+            place(Page(title, section.color, description=truncate(section.empty or "", MAX_DESCRIPTION)))
+            continue
+
+        page = None
+        for block in section.blocks:
+            block = list(block)
+            if page is not None:
+                extra = ([section.separator] if section.separator else []) + block
+                size = sum(f.size for f in extra)
+                if len(page.fields) + len(extra) <= max_fields and used + size <= max_total:
+                    page.fields.extend(extra)
+                    used += size
+                    continue
+            page = Page(title, section.color, block)
+            place(page)
+
+    if message:
+        messages.append(message)
+    return messages
+
+def paginate(
+    blocks: Sequence[Sequence[Field]],
+    max_blocks: int,
+    reserved: int = 0,
+    separator: Optional[Field] = None,
+    max_total: int = MAX_TOTAL,
+    max_fields: int = MAX_FIELDS
+) -> List[range]:
+    """Split blocks into consecutive pages of a single embed each.
+
+    A page takes up to ``max_blocks`` blocks, joined by ``separator``, while
+    it stays within ``max_fields`` fields and ``max_total`` characters once
+    ``reserved`` characters (title, footer) are set aside. A block that
+    can't fit even alone still gets a page of its own.
+    """
+    pages: List[range] = []
+    start = 0
+    fields = used = 0
+    extra_fields = 1 if separator else 0
+    extra_size = separator.size if separator else 0
+    for position, block in enumerate(blocks):
+        size = sum(f.size for f in block)
+        if position > start:
+            if (
+                position - start >= max_blocks
+                or fields + extra_fields + len(block) > max_fields
+                or reserved + used + extra_size + size > max_total
+            ):
+                pages.append(range(start, position))
+                start, fields, used = position, 0, 0
+            else:
+                fields += extra_fields
+                used += extra_size
+        fields += len(block)
+        used += size
+    if start < len(blocks):
+        pages.append(range(start, len(blocks)))
+    return pages